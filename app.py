@@ -7,10 +7,17 @@ import matplotlib.colors as mcolors
 import matplotlib.image as mpimg
 import altair as alt
 import os
-import random
 import warnings
 import io
 
+from sismiq import (ULUSAL_IZGARA_ENLEM, ULUSAL_IZGARA_BOYLAM, EnginePool, ScoreCache,
+                    LiveCatalog, MergedCatalog, parse_source_spec, catalog_cache_dir, TURKEY_DISTRICTS, province_centres,
+                    RAPOR_ETIKETLERI, snapshot_dates, heat_values, score_sites, timeline_frame, is_reportable,
+                    get_risk_label_and_color, get_snapshot_status, report_text, nearby_quakes, GECMIS_SAYFA_BOYUTU,
+                    ADAPTIF_MIN_HUCRE, HUCRE_SUTUNU, adaptive_scan, IL_OZET_SUTUNLARI, district_scan, province_summary,
+                    RECALL_GECIKMELERI, BACKTEST_TOHUM, BACKTEST_TARIH_SAYISI,
+                    run_recall_backtest, run_precision_backtest, metrics_table, instrument)
+
 # -----------------------------------------------------------------------------
 # 1. SAYFA VE SİSTEM AYARLARI
 # -----------------------------------------------------------------------------
@@ -53,613 +60,43 @@ if not st.session_state.disclaimer_accepted:
 # -----------------------------------------------------------------------------
 VERSION = "SİSMİQ v2.1 (District Precision)"
 DOSYA_ADI = 'deprem.txt'
+# Birden çok kaynak (Kandilli, AFAD, arşivler): os.pathsep ile ayrılmış "yol[=saat farkı]" listesi.
+# Verilirse katalog bu dosyaların tekrarsız birleşimidir; DOSYA_ADI yalnızca önbellek anahtarıdır.
+KATALOG_KAYNAKLARI = [parse_source_spec(s) for s in os.environ.get("SISMIQ_KATALOG_KAYNAKLARI", "").split(os.pathsep) if s.strip()]
 HARITA_DOSYASI = 'harita.png'
 
-# Analiz Parametreleri
-ANALIZ_YARICAP_KM = 150
-POST_SISMIK_YARICAP_KM = 50
-TETIKLENME_YARICAP_KM = 150
-BUYUKLUK_FILTRESI = 3.5
-FAY_TAMPON_BOLGESI_KM = 35
-MIN_DEPREM_SAYISI = 20
-RAPOR_ALT_LIMIT = 126
-
-# Fay Hatları
-ACTIVE_FAULTS = {
-    "KAF - Doğu": ((39.1, 40.9), (39.7, 39.5)), "KAF - Orta": ((39.7, 39.5), (40.7, 31.6)),
-    "KAF - Batı": ((40.7, 31.6), (40.7, 29.9)), "KAF - Marmara": ((40.7, 29.9), (40.8, 27.0)),
-    "KAF - Bursa": ((40.5, 30.2), (40.2, 28.0)), "DAF - Bingöl": ((39.0, 40.8), (38.3, 39.0)),
-    "DAF - Maraş": ((38.3, 39.0), (37.5, 37.0)), "DAF - Hatay": ((37.5, 37.0), (36.0, 36.0)),
-    "Ölüdeniz": ((36.0, 36.0), (34.0, 36.1)), "Ege Grabenleri": ((38.5, 28.5), (37.5, 27.0)),
-    "Tuz Gölü": ((39.0, 33.5), (37.5, 33.8)), "Ecemiş": ((38.5, 35.0), (37.0, 34.8)),
-    "Van Gölü": ((38.3, 42.8), (38.7, 44.0)), "Eskişehir": ((39.8, 30.5), (39.5, 32.5)),
-    "Malatya-Ovacık": ((39.5, 39.0), (38.3, 38.0))
-}
-
-# --- İL VE İLÇE VERİTABANI ---
-# Buraya 81 ilin merkezini ve önemli ilçelerini ekledim. 
-# Bu yapıyı koruyarak istediğin kadar ilçe ekleyebilirsin.
-# --- TÜRKİYE İL VE İLÇE VERİTABANI (ALFABETİK SIRALI) ---
-TURKEY_DISTRICTS = {
-    "Adana": {
-        "Aladağ": (37.54, 35.39), "Ceyhan": (37.02, 35.81), "Çukurova": (37.05, 35.28),
-        "Feke": (37.81, 35.92), "İmamoğlu": (37.26, 35.66), "Karaisalı": (37.26, 35.05),
-        "Karataş": (36.57, 35.38), "Kozan": (37.45, 35.81), "Pozantı": (37.43, 34.88),
-        "Saimbeyli": (37.99, 36.09), "Sarıçam": (37.07, 35.38), "Seyhan (Merkez)": (37.00, 35.32),
-        "Tufanbeyli": (38.26, 36.22), "Yumurtalık": (36.77, 35.79), "Yüreğir": (36.98, 35.34)
-    },
-    "Adıyaman": {
-        "Besni": (37.69, 37.86), "Çelikhan": (38.03, 38.23), "Gerger": (38.03, 39.03),
-        "Gölbaşı": (37.78, 37.64), "Kahta": (37.78, 38.62), "Merkez": (37.76, 38.28),
-        "Samsat": (37.58, 38.47), "Sincik": (38.04, 38.62), "Tut": (37.79, 37.92)
-    },
-    "Afyonkarahisar": {
-        "Başmakçı": (37.90, 30.01), "Bayat": (38.98, 30.93), "Bolvadin": (38.71, 31.05),
-        "Çay": (38.59, 31.03), "Çobanlar": (38.70, 30.78), "Dazkırı": (37.92, 29.86),
-        "Dinar": (38.06, 30.16), "Emirdağ": (39.02, 31.15), "Evciler": (38.04, 29.88),
-        "Hocalar": (38.58, 29.97), "İhsaniye": (39.03, 30.41), "İscehisar": (38.86, 30.75),
-        "Kızılören": (38.25, 30.15), "Merkez": (38.75, 30.54), "Sandıklı": (38.46, 30.27),
-        "Sinanpaşa": (38.74, 30.24), "Sultandağı": (38.53, 31.23), "Şuhut": (38.53, 30.54)
-    },
-    "Ağrı": {
-        "Diyadin": (39.54, 43.67), "Doğubayazıt": (39.55, 44.08), "Eleşkirt": (39.80, 42.67),
-        "Hamur": (39.61, 42.99), "Merkez": (39.72, 43.05), "Patnos": (39.23, 42.86),
-        "Taşlıçay": (39.63, 43.37), "Tutak": (39.54, 42.78)
-    },
-    "Aksaray": {
-        "Ağaçören": (38.87, 33.92), "Eskil": (38.40, 33.41), "Gülağaç": (38.39, 34.35),
-        "Güzelyurt": (38.27, 34.36), "Merkez": (38.37, 34.03), "Ortaköy": (38.74, 34.04),
-        "Sarıyahşi": (38.98, 33.84)
-    },
-    "Amasya": {
-        "Göynücek": (40.39, 35.53), "Gümüşhacıköy": (40.87, 35.22), "Hamamözü": (40.78, 35.03),
-        "Merkez": (40.65, 35.83), "Merzifon": (40.87, 35.46), "Suluova": (40.83, 35.64),
-        "Taşova": (40.76, 36.32)
-    },
-    "Ankara": {
-        "Altındağ": (39.95, 32.86), "Ayaş": (40.02, 32.33), "Bala": (39.55, 33.12),
-        "Beypazarı": (40.17, 31.92), "Çamlıdere": (40.49, 32.47), "Çankaya (Merkez)": (39.92, 32.85),
-        "Çubuk": (40.24, 33.03), "Elmadağ": (39.92, 33.23), "Etimesgut": (39.94, 32.66),
-        "Evren": (39.02, 33.81), "Gölbaşı": (39.78, 32.80), "Güdül": (40.21, 32.25),
-        "Haymana": (39.43, 32.50), "Kahramankazan": (40.21, 32.68), "Kalecik": (40.10, 33.41),
-        "Keçiören": (39.97, 32.86), "Kızılcahamam": (40.47, 32.65), "Mamak": (39.93, 32.92),
-        "Nallıhan": (40.19, 31.35), "Polatlı": (39.57, 32.14), "Pursaklar": (40.04, 32.90),
-        "Sincan": (39.96, 32.57), "Şereflikoçhisar": (38.94, 33.54), "Yenimahalle": (39.96, 32.80)
-    },
-    "Antalya": {
-        "Akseki": (37.05, 31.79), "Aksu": (36.96, 30.85), "Alanya": (36.54, 31.99),
-        "Demre": (36.24, 29.98), "Döşemealtı": (37.03, 30.60), "Elmalı": (36.74, 29.92),
-        "Finike": (36.30, 30.15), "Gazipaşa": (36.27, 32.32), "Gündoğmuş": (36.81, 31.99),
-        "İbradı": (37.10, 31.60), "Kaş": (36.20, 29.63), "Kemer": (36.60, 30.56),
-        "Kepez": (36.91, 30.69), "Konyaaltı": (36.86, 30.64), "Korkuteli": (37.07, 30.20),
-        "Kumluca": (36.37, 30.29), "Manavgat": (36.78, 31.44), "Muratpaşa (Merkez)": (36.88, 30.70),
-        "Serik": (36.92, 31.10)
-    },
-    "Ardahan": {
-        "Çıldır": (41.13, 43.13), "Damal": (41.34, 42.83), "Göle": (40.79, 42.61),
-        "Hanak": (41.23, 42.84), "Merkez": (41.11, 42.70), "Posof": (41.51, 42.73)
-    },
-    "Artvin": {
-        "Ardanuç": (41.13, 42.07), "Arhavi": (41.35, 41.30), "Borçka": (41.36, 41.67),
-        "Hopa": (41.39, 41.43), "Kemalpaşa": (41.48, 41.52), "Merkez": (41.18, 41.82),
-        "Murgul": (41.28, 41.56), "Şavşat": (41.25, 42.35), "Yusufeli": (40.82, 41.54)
-    },
-    "Aydın": {
-        "Bozdoğan": (37.67, 28.31), "Buharkent": (37.97, 28.74), "Çine": (37.61, 28.06),
-        "Didim": (37.38, 27.27), "Efeler (Merkez)": (37.84, 27.84), "Germencik": (37.87, 27.60),
-        "İncirliova": (37.85, 27.72), "Karacasu": (37.73, 28.60), "Karpuzlu": (37.55, 27.83),
-        "Koçarlı": (37.76, 27.71), "Köşk": (37.86, 28.05), "Kuşadası": (37.86, 27.26),
-        "Nazilli": (37.91, 28.32), "Söke": (37.75, 27.40), "Sultanhisar": (37.89, 28.15),
-        "Yenipazar": (37.83, 28.20)
-    },
-    "Balıkesir": {
-        "Altıeylül (Merkez)": (39.65, 27.88), "Ayvalık": (39.31, 26.69), "Balya": (39.75, 27.58),
-        "Bandırma": (40.35, 27.97), "Bigadiç": (39.40, 28.13), "Burhaniye": (39.50, 26.97),
-        "Dursunbey": (39.58, 28.63), "Edremit": (39.59, 27.02), "Erdek": (40.39, 27.79),
-        "Gömeç": (39.39, 26.84), "Gönen": (40.11, 27.65), "Havran": (39.56, 27.10),
-        "İvrindi": (39.58, 27.49), "Karesi": (39.64, 27.89), "Kepsut": (39.69, 28.15),
-        "Manyas": (40.05, 27.97), "Marmara": (40.59, 27.56), "Savaştepe": (39.38, 27.66),
-        "Sındırgı": (39.24, 28.18), "Susurluk": (39.92, 28.15)
-    },
-    "Bartın": {
-        "Amasra": (41.75, 32.38), "Kurucaşile": (41.83, 32.72), "Merkez": (41.63, 32.33),
-        "Ulus": (41.59, 32.65)
-    },
-    "Batman": {
-        "Beşiri": (37.92, 41.29), "Gercüş": (37.56, 41.37), "Hasankeyf": (37.71, 41.42),
-        "Kozluk": (38.19, 41.48), "Merkez": (37.88, 41.13), "Sason": (38.33, 41.41)
-    },
-    "Bayburt": {
-        "Merkez": (40.26, 40.23)
-    },
-    "Bilecik": {
-        "Bozüyük": (39.90, 30.05), "Merkez": (40.14, 29.98)
-    },
-    "Bingöl": {
-        "Adaklı": (39.23, 40.48), "Genç": (38.75, 40.55), "Karlıova": (39.29, 41.01),
-        "Kiğı": (39.31, 40.35), "Merkez": (38.89, 40.50), "Solhan": (38.96, 41.05),
-        "Yayladere": (39.23, 40.06), "Yedisu": (39.43, 40.53)
-    },
-    "Bitlis": {
-        "Adilcevaz": (38.80, 42.73), "Ahlat": (38.75, 42.48), "Güroymak": (38.57, 42.02),
-        "Hizan": (38.22, 42.42), "Merkez": (38.40, 42.11), "Mutki": (38.41, 41.92),
-        "Tatvan": (38.49, 42.28)
-    },
-    "Bolu": {
-        "Dörtdivan": (40.72, 32.06), "Gerede": (40.80, 32.20), "Göynük": (40.40, 30.79),
-        "Kıbrıscık": (40.41, 31.86), "Mengen": (40.94, 32.08), "Merkez": (40.73, 31.61),
-        "Mudurnu": (40.47, 31.21), "Seben": (40.41, 31.58), "Yeniçağa": (40.78, 32.03)
-    },
-    "Burdur": {
-        "Ağlasun": (37.65, 30.54), "Altınyayla": (37.07, 29.80), "Bucak": (37.46, 30.59),
-        "Çavdır": (37.16, 29.70), "Çeltikçi": (37.53, 30.48), "Gölhisar": (37.15, 29.51),
-        "Karamanlı": (37.38, 29.82), "Kemer": (37.35, 30.06), "Merkez": (37.72, 30.28),
-        "Tefenni": (37.31, 29.78), "Yeşilova": (37.50, 29.75)
-    },
-    "Bursa": {
-        "Büyükorhan": (39.78, 28.89), "Gemlik": (40.43, 29.15), "Gürsu": (40.22, 29.19),
-        "Harmancık": (39.68, 29.15), "İnegöl": (40.07, 29.51), "İznik": (40.43, 29.72),
-        "Karacabey": (40.21, 28.36), "Keles": (39.91, 29.23), "Mudanya": (40.37, 28.88),
-        "Mustafakemalpaşa": (40.04, 28.41), "Nilüfer": (40.21, 28.98), "Orhaneli": (39.90, 28.99),
-        "Orhangazi": (40.49, 29.31), "Osmangazi (Merkez)": (40.18, 29.06), "Yenişehir": (40.26, 29.65),
-        "Yıldırım": (40.18, 29.08)
-    },
-    "Çanakkale": {
-        "Ayvacık": (39.60, 26.40), "Bayramiç": (39.81, 26.61), "Biga": (40.22, 27.24),
-        "Bozcaada": (39.84, 26.07), "Çan": (40.03, 27.05), "Eceabat": (40.19, 26.36),
-        "Ezine": (39.79, 26.34), "Gelibolu": (40.41, 26.67), "Gökçeada": (40.20, 25.90),
-        "Lapseki": (40.34, 26.69), "Merkez": (40.15, 26.41), "Yenice": (39.93, 27.26)
-    },
-    "Çankırı": {
-        "Atkaracalar": (40.81, 33.08), "Bayramören": (40.94, 33.20), "Çerkeş": (40.81, 32.89),
-        "Eldivan": (40.53, 33.49), "Ilgaz": (41.05, 33.63), "Kızılırmak": (40.35, 33.98),
-        "Korgun": (40.73, 33.51), "Kurşunlu": (40.84, 33.25), "Merkez": (40.60, 33.61),
-        "Orta": (40.63, 33.11), "Şabanözü": (40.48, 33.29), "Yapraklı": (40.76, 33.78)
-    },
-    "Çorum": {
-        "Merkez": (40.55, 34.95), "Sungurlu": (40.16, 34.37)
-    },
-    "Denizli": {
-        "Acıpayam": (37.43, 29.35), "Babadağ": (37.81, 28.86), "Baklan": (37.98, 29.61),
-        "Bekilli": (38.24, 29.23), "Beyağaç": (37.23, 28.90), "Bozkurt": (37.82, 29.61),
-        "Buldan": (38.05, 28.83), "Çal": (38.08, 29.40), "Çameli": (37.07, 29.35),
-        "Çardak": (37.83, 29.70), "Çivril": (38.30, 29.74), "Güney": (38.16, 29.06),
-        "Honaz": (37.76, 29.27), "Kale": (37.43, 28.85), "Merkezefendi (Merkez)": (37.78, 29.05),
-        "Pamukkale": (37.83, 29.11), "Sarayköy": (37.92, 28.92), "Serinhisar": (37.58, 29.27),
-        "Tavas": (37.57, 29.07)
-    },
-    "Diyarbakır": {
-        "Bağlar": (37.91, 40.22), "Bismil": (37.85, 40.67), "Çermik": (38.14, 39.45),
-        "Çınar": (37.72, 40.42), "Çüngüş": (38.21, 39.29), "Dicle": (38.37, 40.07),
-        "Eğil": (38.26, 40.09), "Ergani": (38.26, 39.75), "Hani": (38.40, 40.40),
-        "Hazro": (38.25, 40.77), "Kayapınar": (37.93, 40.19), "Kocaköy": (38.29, 40.50),
-        "Kulp": (38.50, 41.01), "Lice": (38.46, 40.65), "Silvan": (38.14, 41.01),
-        "Sur (Merkez)": (37.91, 40.24), "Yenişehir": (37.93, 40.22)
-    },
-    "Düzce": {
-        "Akçakoca": (41.09, 31.12), "Cumayeri": (40.87, 30.95), "Çilimli": (40.89, 31.05),
-        "Gölyaka": (40.78, 30.99), "Gümüşova": (40.86, 30.95), "Kaynaşlı": (40.77, 31.31),
-        "Merkez": (40.84, 31.16), "Yığılca": (40.95, 31.45)
-    },
-    "Edirne": {
-        "Enez": (40.72, 26.08), "Havsa": (41.55, 26.82), "İpsala": (40.92, 26.38),
-        "Keşan": (40.85, 26.63), "Lalapaşa": (41.84, 26.73), "Meriç": (41.19, 26.42),
-        "Merkez": (41.68, 26.56), "Süloğlu": (41.73, 26.90), "Uzunköprü": (41.27, 26.69)
-    },
-    "Elazığ": {
-        "Ağın": (38.94, 38.71), "Alacakaya": (38.47, 39.86), "Arıcak": (38.56, 40.14),
-        "Baskil": (38.56, 38.81), "Karakoçan": (38.96, 40.03), "Keban": (38.80, 38.74),
-        "Kovancılar": (38.72, 39.86), "Maden": (38.39, 39.67), "Merkez": (38.68, 39.22),
-        "Palu": (38.69, 39.94), "Sivrice": (38.44, 39.31)
-    },
-    "Erzincan": {
-        "Çayırlı": (39.80, 40.03), "İliç": (39.45, 38.56), "Kemah": (39.60, 39.03),
-        "Kemaliye": (39.26, 38.49), "Merkez": (39.75, 39.49), "Otlukbeli": (39.97, 40.02),
-        "Refahiye": (39.90, 38.77), "Tercan": (39.78, 40.38), "Üzümlü": (39.71, 39.70)
-    },
-    "Erzurum": {
-        "Aşkale": (39.92, 40.69), "Aziziye": (39.95, 41.11), "Çat": (39.62, 40.98),
-        "Hınıs": (39.36, 41.70), "Horasan": (40.04, 42.17), "İspir": (40.48, 40.99),
-        "Karaçoban": (39.34, 42.10), "Karayazı": (39.70, 42.14), "Köprüköy": (39.97, 41.87),
-        "Narman": (40.35, 41.87), "Oltu": (40.55, 41.99), "Olur": (40.82, 42.13),
-        "Palandöken": (39.90, 41.27), "Pasinler": (39.98, 41.67), "Pazaryolu": (40.41, 40.77),
-        "Şenkaya": (40.57, 42.34), "Tekman": (39.64, 41.50), "Tortum": (40.29, 41.55),
-        "Uzundere": (40.53, 41.54), "Yakutiye (Merkez)": (39.91, 41.27)
-    },
-    "Eskişehir": {
-        "Alpu": (39.77, 30.96), "Beylikova": (39.69, 31.20), "Çifteler": (39.38, 31.03),
-        "Günyüzü": (39.38, 31.81), "Han": (39.15, 30.86), "İnönü": (39.82, 30.14),
-        "Mahmudiye": (39.50, 30.97), "Mihalgazi": (40.03, 30.58), "Mihalıççık": (39.86, 31.50),
-        "Odunpazarı (Merkez)": (39.76, 30.52), "Sarıcakaya": (40.04, 30.62),
-        "Seyitgazi": (39.44, 30.69), "Sivrihisar": (39.45, 31.53), "Tepebaşı": (39.79, 30.50)
-    },
-    "Gaziantep": {
-        "Araban": (37.42, 37.69), "İslahiye": (37.03, 36.63), "Karkamış": (36.83, 37.99),
-        "Nizip": (37.01, 37.79), "Nurdağı": (37.17, 36.74), "Oğuzeli": (36.96, 37.51),
-        "Şahinbey (Merkez)": (37.06, 37.38), "Şehitkamil": (37.07, 37.37), "Yavuzeli": (37.32, 37.57)
-    },
-    "Giresun": {
-        "Alucra": (40.32, 38.76), "Bulancak": (40.94, 38.23), "Çamoluk": (40.14, 38.73),
-        "Çanakçı": (40.91, 38.47), "Dereli": (40.74, 38.45), "Doğankent": (40.80, 38.92),
-        "Espiye": (40.95, 38.71), "Eynesil": (41.05, 39.05), "Görele": (41.03, 38.99),
-        "Güce": (40.88, 38.46), "Keşap": (40.92, 38.52), "Merkez": (40.92, 38.39),
-        "Piraziz": (40.95, 38.12), "Şebinkarahisar": (40.29, 38.42), "Tirebolu": (41.00, 38.82),
-        "Yağlıdere": (40.86, 38.63)
-    },
-    "Gümüşhane": {
-        "Merkez": (40.46, 39.48)
-    },
-    "Hakkari": {
-        "Merkez": (37.58, 43.74), "Yüksekova": (37.57, 44.28)
-    },
-    "Hatay": {
-        "Altınözü": (36.11, 36.25), "Antakya (Merkez)": (36.20, 36.16), "Arsuz": (36.41, 35.88),
-        "Belen": (36.48, 36.19), "Defne": (36.19, 36.12), "Dörtyol": (36.84, 36.23),
-        "Erzin": (36.95, 36.20), "Hassa": (36.80, 36.52), "İskenderun": (36.58, 36.17),
-        "Kırıkhan": (36.50, 36.36), "Kumlu": (36.37, 36.46), "Payas": (36.76, 36.20),
-        "Reyhanlı": (36.27, 36.57), "Samandağ": (36.08, 35.97), "Yayladağı": (35.90, 36.06)
-    },
-    "Iğdır": {
-        "Aralık": (39.88, 44.52), "Karakoyunlu": (39.87, 43.63), "Merkez": (39.92, 44.04),
-        "Tuzluca": (40.04, 43.66)
-    },
-    "Isparta": {
-        "Aksu": (37.80, 31.06), "Atabey": (37.95, 30.64), "Eğirdir": (37.87, 30.85),
-        "Gelendost": (38.12, 30.98), "Gönen": (37.96, 30.51), "Keçiborlu": (37.94, 30.30),
-        "Merkez": (37.76, 30.55), "Senirkent": (38.10, 30.55), "Sütçüler": (37.50, 30.98),
-        "Şarkikaraağaç": (38.08, 31.36), "Uluborlu": (38.08, 30.45), "Yalvaç": (38.30, 31.18)
-    },
-    "İstanbul": {
-        "Adalar": (40.87, 29.13), "Arnavutköy": (41.18, 28.74), "Ataşehir": (40.99, 29.12),
-        "Avcılar": (40.98, 28.72), "Bağcılar": (41.04, 28.86), "Bahçelievler": (40.99, 28.86),
-        "Bakırköy": (40.97, 28.87), "Başakşehir": (41.10, 28.80), "Bayrampaşa": (41.04, 28.90),
-        "Beşiktaş": (41.04, 29.00), "Beykoz": (41.13, 29.09), "Beylikdüzü": (41.00, 28.64),
-        "Beyoğlu": (41.04, 28.97), "Büyükçekmece": (41.02, 28.59), "Çatalca": (41.14, 28.46),
-        "Çekmeköy": (41.03, 29.18), "Esenler": (41.05, 28.88), "Esenyurt": (41.03, 28.68),
-        "Eyüpsultan": (41.05, 28.93), "Fatih (Merkez)": (41.01, 28.94), "Gaziosmanpaşa": (41.06, 28.91),
-        "Güngören": (41.02, 28.88), "Kadıköy": (40.99, 29.02), "Kağıthane": (41.08, 28.98),
-        "Kartal": (40.89, 29.18), "Küçükçekmece": (40.99, 28.77), "Maltepe": (40.93, 29.13),
-        "Pendik": (40.87, 29.23), "Sancaktepe": (41.00, 29.23), "Sarıyer": (41.17, 29.05),
-        "Silivri": (41.07, 28.24), "Sultanbeyli": (40.97, 29.27), "Sultangazi": (41.11, 28.87),
-        "Şile": (41.18, 29.61), "Şişli": (41.05, 28.98), "Tuzla": (40.82, 29.31),
-        "Ümraniye": (41.02, 29.10), "Üsküdar": (41.02, 29.01), "Zeytinburnu": (40.99, 28.90)
-    },
-    "İzmir": {
-        "Aliağa": (38.80, 26.97), "Balçova": (38.39, 27.05), "Bayındır": (38.22, 27.65),
-        "Bayraklı": (38.46, 27.16), "Bergama": (39.12, 27.18), "Beydağ": (38.08, 28.22),
-        "Bornova": (38.46, 27.22), "Buca": (38.38, 27.17), "Çeşme": (38.32, 26.30),
-        "Çiğli": (38.49, 27.04), "Dikili": (39.07, 26.89), "Foça": (38.67, 26.75),
-        "Gaziemir": (38.32, 27.13), "Güzelbahçe": (38.36, 26.88), "Karabağlar": (38.37, 27.13),
-        "Karaburun": (38.64, 26.51), "Karşıyaka": (38.46, 27.11), "Kemalpaşa": (38.43, 27.42),
-        "Kınık": (39.09, 27.38), "Kiraz": (38.23, 28.20), "Konak (Merkez)": (38.41, 27.12),
-        "Menderes": (38.25, 27.13), "Menemen": (38.60, 27.07), "Narlıdere": (38.39, 27.00),
-        "Ödemiş": (38.23, 27.97), "Seferihisar": (38.20, 26.83), "Selçuk": (37.95, 27.37),
-        "Tire": (38.09, 27.73), "Torbalı": (38.16, 27.36), "Urla": (38.32, 26.76)
-    },
-    "Kahramanmaraş": {
-        "Afşin": (38.25, 36.91), "Andırın": (37.58, 36.35), "Çağlayancerit": (37.75, 37.29),
-        "Dulkadiroğlu (Merkez)": (37.56, 36.95), "Ekinözü": (38.06, 37.18), "Elbistan": (38.20, 37.19),
-        "Göksun": (38.02, 36.50), "Nurhak": (37.97, 37.43), "Onikişubat": (37.58, 36.90),
-        "Pazarcık": (37.49, 37.29), "Türkoğlu": (37.39, 36.85)
-    },
-    "Karabük": {
-        "Eflani": (41.42, 32.95), "Eskipazar": (40.94, 32.54), "Merkez": (41.20, 32.63),
-        "Ovacık": (41.08, 32.92), "Safranbolu": (41.25, 32.69), "Yenice": (41.20, 32.33)
-    },
-    "Karaman": {
-        "Ayrancı": (37.35, 33.69), "Başyayla": (36.75, 32.68), "Ermenek": (36.64, 32.89),
-        "Kazımkarabekir": (37.23, 33.59), "Merkez": (37.18, 33.22), "Sarıveliler": (36.70, 32.62)
-    },
-    "Kars": {
-        "Akyaka": (40.75, 43.62), "Arpaçay": (40.84, 43.33), "Digor": (40.37, 43.41),
-        "Kağızman": (40.16, 43.13), "Merkez": (40.61, 43.10), "Sarıkamış": (40.33, 42.58),
-        "Selim": (40.46, 42.78), "Susuz": (40.78, 42.78)
-    },
-    "Kastamonu": {
-        "Abana": (41.98, 34.01), "Ağlı": (41.74, 33.55), "Araç": (41.24, 33.32),
-        "Azdavay": (41.64, 33.29), "Bozkurt": (41.96, 34.01), "Cide": (41.89, 33.01),
-        "Çatalzeytin": (41.95, 34.22), "Daday": (41.47, 33.47), "Devrekani": (41.60, 33.84),
-        "Doğanyurt": (41.97, 33.46), "Hanönü": (41.63, 34.47), "İhsangazi": (41.18, 33.55),
-        "İnebolu": (41.97, 33.76), "Küre": (41.81, 33.71), "Merkez": (41.39, 33.78),
-        "Pınarbaşı": (41.60, 33.11), "Seydiler": (41.62, 33.73), "Şenpazar": (41.81, 33.24),
-        "Taşköprü": (41.51, 34.22), "Tosya": (41.02, 34.04)
-    },
-    "Kayseri": {
-        "Akkışla": (39.00, 36.17), "Bünyan": (38.85, 35.86), "Develi": (38.39, 35.49),
-        "Felahiye": (39.09, 35.57), "Hacılar": (38.65, 35.44), "İncesu": (38.63, 35.19),
-        "Kocasinan (Merkez)": (38.73, 35.49), "Melikgazi": (38.71, 35.53), "Özvatan": (39.12, 36.05),
-        "Pınarbaşı": (38.72, 36.39), "Sarıoğlan": (39.08, 35.97), "Sarız": (38.48, 36.49),
-        "Talas": (38.69, 35.55), "Tomarza": (38.44, 35.80), "Yahyalı": (38.10, 35.36),
-        "Yeşilhisar": (38.35, 35.09)
-    },
-    "Kırıkkale": {
-        "Bahşılı": (39.82, 33.47), "Balışeyh": (39.91, 33.72), "Çelebi": (39.47, 33.53),
-        "Delice": (39.95, 34.03), "Karakeçili": (39.59, 33.38), "Keskin": (39.68, 33.61),
-        "Merkez": (39.84, 33.51), "Sulakyurt": (40.16, 33.72), "Yahşihan": (39.85, 33.46)
-    },
-    "Kırklareli": {
-        "Babaeski": (41.43, 27.10), "Demirköy": (41.83, 27.77), "Kofçaz": (41.95, 27.16),
-        "Lüleburgaz": (41.40, 27.35), "Merkez": (41.73, 27.22), "Pehlivanköy": (41.35, 26.93),
-        "Pınarhisar": (41.62, 27.52), "Vize": (41.57, 27.77)
-    },
-    "Kırşehir": {
-        "Akçakent": (39.67, 34.09), "Akpınar": (39.45, 34.37), "Boztepe": (39.27, 34.26),
-        "Çiçekdağı": (39.60, 34.41), "Kaman": (39.36, 33.72), "Merkez": (39.15, 34.17),
-        "Mucur": (39.06, 34.38)
-    },
-    "Kilis": {
-        "Elbeyli": (36.67, 37.46), "Merkez": (36.71, 37.11), "Musabeyli": (36.89, 36.92),
-        "Polateli": (36.84, 37.14)
-    },
-    "Kocaeli": {
-        "Başiskele": (40.72, 29.95), "Çayırova": (40.82, 29.38), "Darıca": (40.76, 29.39),
-        "Derince": (40.76, 29.83), "Dilovası": (40.78, 29.54), "Gebze": (40.80, 29.43),
-        "Gölcük": (40.71, 29.81), "İzmit (Merkez)": (40.76, 29.92), "Kandıra": (41.07, 30.15),
-        "Karamürsel": (40.69, 29.61), "Kartepe": (40.75, 30.03), "Körfez": (40.77, 29.74)
-    },
-    "Konya": {
-        "Ahırlı": (37.24, 32.12), "Akören": (37.45, 32.37), "Akşehir": (38.35, 31.41),
-        "Altınekin": (38.30, 32.87), "Beyşehir": (37.68, 31.73), "Bozkır": (37.19, 32.25),
-        "Cihanbeyli": (38.66, 32.92), "Çeltik": (39.02, 31.79), "Çumra": (37.57, 32.77),
-        "Derbent": (38.01, 32.02), "Derebucak": (37.39, 31.51), "Doğanhisar": (38.15, 31.68),
-        "Emirgazi": (37.90, 33.83), "Ereğli": (37.51, 34.05), "Güneysınır": (37.26, 32.72),
-        "Hadim": (36.99, 32.46), "Halkapınar": (37.43, 34.19), "Hüyük": (37.95, 31.59),
-        "Ilgın": (38.28, 31.91), "Kadınhanı": (38.24, 32.21), "Karapınar": (37.71, 33.55),
-        "Karatay": (37.87, 32.51), "Kulu": (39.10, 33.08), "Meram": (37.86, 32.42),
-        "Sarayönü": (38.26, 32.40), "Selçuklu (Merkez)": (37.89, 32.48), "Seydişehir": (37.42, 31.85),
-        "Taşkent": (36.92, 32.49), "Tuzlukçu": (38.48, 31.63), "Yalıhüyük": (37.30, 32.08),
-        "Yunak": (38.81, 31.73)
-    },
-    "Kütahya": {
-        "Altıntaş": (39.06, 30.10), "Aslanapa": (39.22, 29.87), "Çavdarhisar": (39.18, 29.62),
-        "Domaniç": (39.80, 29.60), "Dumlupınar": (38.85, 30.00), "Emet": (39.34, 29.26),
-        "Gediz": (38.99, 29.40), "Hisarcık": (39.25, 29.23), "Merkez": (39.42, 29.98),
-        "Pazarlar": (39.12, 29.13), "Simav": (39.09, 28.98), "Şaphane": (39.02, 29.20),
-        "Tavşanlı": (39.54, 29.49)
-    },
-    "Malatya": {
-        "Akçadağ": (38.34, 37.97), "Arapgir": (39.04, 38.50), "Arguvan": (38.77, 38.26),
-        "Battalgazi": (38.43, 38.36), "Darende": (38.55, 37.49), "Doğanşehir": (38.09, 37.88),
-        "Doğanyol": (38.31, 39.06), "Hekimhan": (38.82, 37.93), "Kale": (38.38, 38.74),
-        "Kuluncak": (38.88, 37.66), "Pütürge": (38.20, 38.87), "Yazıhan": (38.59, 38.17),
-        "Yeşilyurt (Merkez)": (38.32, 38.25)
-    },
-    "Manisa": {
-        "Ahmetli": (38.52, 27.94), "Akhisar": (38.92, 27.83), "Alaşehir": (38.35, 28.52),
-        "Demirci": (39.05, 28.66), "Gölmarmara": (38.71, 27.92), "Gördes": (38.93, 28.29),
-        "Kırkağaç": (39.11, 27.67), "Köprübaşı": (38.75, 28.40), "Kula": (38.55, 28.65),
-        "Salihli": (38.48, 28.14), "Sarıgöl": (38.24, 28.70), "Saruhanlı": (38.73, 27.56),
-        "Soma": (39.18, 27.61), "Şehzadeler (Merkez)": (38.61, 27.42), "Turgutlu": (38.49, 27.69),
-        "Yunusemre": (38.62, 27.40)
-    },
-    "Mardin": {
-        "Artuklu (Merkez)": (37.32, 40.74), "Dargeçit": (37.55, 41.71), "Derik": (37.36, 40.27),
-        "Kızıltepe": (37.19, 40.58), "Mazıdağı": (37.48, 40.49), "Midyat": (37.42, 41.33),
-        "Nusaybin": (37.07, 41.21), "Ömerli": (37.40, 40.96), "Savur": (37.54, 40.89),
-        "Yeşilli": (37.34, 40.82)
-    },
-    "Mersin": {
-        "Akdeniz (Merkez)": (36.80, 34.63), "Anamur": (36.08, 32.84), "Aydıncık": (36.14, 33.32),
-        "Bozyazı": (36.11, 32.96), "Çamlıyayla": (37.17, 34.60), "Erdemli": (36.60, 34.30),
-        "Gülnar": (36.34, 33.40), "Mezitli": (36.76, 34.52), "Mut": (36.64, 33.43),
-        "Silifke": (36.37, 33.93), "Tarsus": (36.91, 34.89), "Toroslar": (36.82, 34.57),
-        "Yenişehir": (36.78, 34.58)
-    },
-    "Muğla": {
-        "Bodrum": (37.03, 27.43), "Dalaman": (36.77, 28.80), "Datça": (36.73, 27.68),
-        "Fethiye": (36.62, 29.11), "Kavaklıdere": (37.44, 28.36), "Köyceğiz": (36.95, 28.69),
-        "Marmaris": (36.85, 28.27), "Menteşe (Merkez)": (37.21, 28.36), "Milas": (37.31, 27.78),
-        "Ortaca": (36.84, 28.76), "Seydikemer": (36.65, 29.36), "Ula": (37.10, 28.42),
-        "Yatağan": (37.34, 28.14)
-    },
-    "Muş": {
-        "Bulanık": (38.86, 42.27), "Hasköy": (38.68, 41.69), "Korkut": (38.73, 41.78),
-        "Malazgirt": (39.15, 42.53), "Merkez": (38.95, 41.75), "Varto": (39.18, 41.46)
-    },
-    "Nevşehir": {
-        "Acıgöl": (38.55, 34.51), "Avanos": (38.72, 34.85), "Derinkuyu": (38.38, 34.74),
-        "Gülşehir": (38.74, 34.62), "Hacıbektaş": (38.94, 34.56), "Kozaklı": (39.22, 34.85),
-        "Merkez": (38.62, 34.71), "Ürgüp": (38.63, 34.91)
-    },
-    "Niğde": {
-        "Altunhisar": (37.99, 34.36), "Bor": (37.89, 34.56), "Çamardı": (37.82, 34.99),
-        "Çiftlik": (38.17, 34.48), "Merkez": (37.97, 34.68), "Ulukışla": (37.55, 34.48)
-    },
-    "Ordu": {
-        "Akkuş": (40.80, 36.96), "Altınordu (Merkez)": (40.98, 37.88), "Aybastı": (40.68, 37.40),
-        "Çamaş": (40.90, 37.53), "Çatalpınar": (40.87, 37.45), "Çaybaşı": (41.02, 37.08),
-        "Fatsa": (41.03, 37.50), "Gölköy": (40.68, 37.62), "Gülyalı": (40.96, 38.06),
-        "Gürgentepe": (40.79, 37.59), "İkizce": (41.04, 37.08), "Kabadüz": (40.86, 37.90),
-        "Kabataş": (40.75, 37.45), "Korgan": (40.83, 37.35), "Kumru": (40.87, 37.26),
-        "Mesudiye": (40.46, 37.77), "Perşembe": (41.06, 37.77), "Ulubey": (40.87, 37.76),
-        "Ünye": (41.13, 37.29)
-    },
-    "Osmaniye": {
-        "Bahçe": (37.20, 36.57), "Düziçi": (37.25, 36.46), "Hasanbeyli": (37.13, 36.56),
-        "Kadirli": (37.37, 36.10), "Merkez": (37.07, 36.25), "Sumbas": (37.45, 36.03),
-        "Toprakkale": (37.07, 36.15)
-    },
-    "Rize": {
-        "Ardeşen": (41.19, 40.98), "Çamlıhemşin": (41.05, 41.01), "Çayeli": (41.09, 40.73),
-        "Derepazarı": (41.02, 40.42), "Fındıklı": (41.27, 41.14), "Güneysu": (40.99, 40.61),
-        "Hemşin": (41.05, 40.92), "İkizdere": (40.78, 40.55), "İyidere": (41.01, 40.36),
-        "Kalkandere": (40.93, 40.43), "Merkez": (41.02, 40.52), "Pazar": (41.18, 40.88)
-    },
-    "Sakarya": {
-        "Adapazarı (Merkez)": (40.77, 30.40), "Akyazı": (40.68, 30.62), "Arifiye": (40.71, 30.36),
-        "Erenler": (40.76, 30.41), "Ferizli": (40.94, 30.48), "Geyve": (40.50, 30.29),
-        "Hendek": (40.80, 30.74), "Karapürçek": (40.64, 30.54), "Karasu": (41.09, 30.68),
-        "Kaynarca": (41.03, 30.31), "Kocaali": (41.05, 30.85), "Pamukova": (40.51, 30.16),
-        "Sapanca": (40.69, 30.27), "Serdivan": (40.76, 30.36), "Söğütlü": (40.91, 30.48),
-        "Taraklı": (40.39, 30.49)
-    },
-    "Samsun": {
-        "Alaçam": (41.61, 35.60), "Asarcık": (41.04, 36.23), "Atakum": (41.33, 36.30),
-        "Ayvacık": (40.98, 36.63), "Bafra": (41.56, 35.91), "Canik": (41.27, 36.33),
-        "Çarşamba": (41.20, 36.72), "Havza": (40.97, 35.66), "İlkadım (Merkez)": (41.29, 36.33),
-        "Kavak": (41.08, 36.05), "Ladik": (40.91, 35.89), "Salıpazarı": (41.09, 36.83),
-        "Tekkeköy": (41.21, 36.46), "Terme": (41.20, 36.97), "Vezirköprü": (41.14, 35.46),
-        "Yakakent": (41.63, 35.53)
-    },
-    "Siirt": {
-        "Baykan": (38.16, 41.78), "Eruh": (37.74, 42.18), "Kurtalan": (37.92, 41.70),
-        "Merkez": (37.93, 41.94), "Pervari": (37.94, 42.55), "Şirvan": (38.06, 42.03),
-        "Tillo": (37.95, 42.01)
-    },
-    "Sinop": {
-        "Ayancık": (41.94, 34.59), "Boyabat": (41.47, 34.77), "Dikmen": (41.66, 35.27),
-        "Durağan": (41.42, 35.05), "Erfelek": (41.88, 34.91), "Gerze": (41.80, 35.20),
-        "Merkez": (42.03, 35.15), "Saraydüzü": (41.32, 34.86), "Türkeli": (41.95, 34.34)
-    },
-    "Sivas": {
-        "Akıncılar": (40.07, 38.34), "Altınyayla": (39.27, 36.75), "Divriği": (39.37, 38.12),
-        "Doğanşar": (40.21, 37.53), "Gemerek": (39.18, 36.08), "Gölova": (40.06, 38.60),
-        "Gürün": (38.72, 37.27), "Hafik": (39.85, 37.38), "İmranlı": (39.88, 38.11),
-        "Kangal": (39.23, 37.39), "Koyulhisar": (40.30, 37.82), "Merkez": (39.75, 37.01),
-        "Suşehri": (40.16, 38.08), "Şarkışla": (39.35, 36.40), "Ulaş": (39.44, 37.03),
-        "Yıldızeli": (39.87, 36.60), "Zara": (39.90, 37.75)
-    },
-    "Şanlıurfa": {
-        "Akçakale": (36.71, 38.95), "Birecik": (37.03, 37.99), "Bozova": (37.36, 38.53),
-        "Ceylanpınar": (36.85, 40.05), "Eyyübiye (Merkez)": (37.14, 38.79), "Halfeti": (37.25, 37.87),
-        "Haliliye": (37.16, 38.81), "Harran": (36.86, 39.03), "Hilvan": (37.58, 38.95),
-        "Karaköprü": (37.19, 38.79), "Siverek": (37.75, 39.32), "Suruç": (36.98, 38.42),
-        "Viranşehir": (37.23, 39.76)
-    },
-    "Şırnak": {
-        "Beytüşşebap": (37.57, 43.17), "Cizre": (37.33, 42.19), "Güçlükonak": (37.47, 41.91),
-        "İdil": (37.34, 41.89), "Merkez": (37.52, 42.46), "Silopi": (37.25, 42.46),
-        "Uludere": (37.44, 42.85)
-    },
-    "Tekirdağ": {
-        "Çerkezköy": (41.28, 28.00), "Çorlu": (41.16, 27.80), "Ergene": (41.19, 27.71),
-        "Hayrabolu": (41.21, 27.11), "Kapaklı": (41.33, 27.98), "Malkara": (40.89, 26.90),
-        "Marmaraereğlisi": (40.97, 27.96), "Muratlı": (41.18, 27.50), "Saray": (41.44, 27.92),
-        "Süleymanpaşa (Merkez)": (40.98, 27.51), "Şarköy": (40.61, 27.12)
-    },
-    "Tokat": {
-        "Almus": (40.37, 36.91), "Artova": (40.12, 36.30), "Başçiftlik": (40.53, 37.17),
-        "Erbaa": (40.67, 36.57), "Merkez": (40.31, 36.55), "Niksar": (40.59, 36.95),
-        "Pazar": (40.27, 36.29), "Reşadiye": (40.42, 37.34), "Sulusaray": (39.99, 36.08),
-        "Turhal": (40.39, 36.08), "Yeşilyurt": (40.30, 36.24), "Zile": (40.30, 35.89)
-    },
-    "Trabzon": {
-        "Akçaabat": (41.02, 39.57), "Araklı": (40.94, 39.97), "Arsin": (40.95, 39.93),
-        "Beşikdüzü": (41.05, 39.23), "Çarşıbaşı": (41.08, 39.38), "Çaykara": (40.75, 40.23),
-        "Dernekpazarı": (40.79, 40.04), "Düzköy": (40.87, 39.42), "Hayrat": (40.89, 40.36),
-        "Köprübaşı": (40.81, 40.12), "Maçka": (40.82, 39.62), "Of": (40.95, 40.27),
-        "Ortahisar (Merkez)": (41.00, 39.72), "Sürmene": (40.91, 40.12), "Şalpazarı": (40.94, 39.19),
-        "Tonya": (40.88, 39.28), "Vakfıkebir": (41.05, 39.28), "Yomra": (40.95, 39.85)
-    },
-    "Tunceli": {
-        "Çemişgezek": (39.06, 38.91), "Hozat": (39.10, 39.22), "Mazgirt": (39.02, 39.60),
-        "Merkez": (39.11, 39.54), "Nazımiye": (39.18, 39.83), "Ovacık": (39.36, 39.21),
-        "Pertek": (38.87, 39.32), "Pülümür": (39.49, 39.90)
-    },
-    "Uşak": {
-        "Banaz": (38.74, 29.75), "Eşme": (38.40, 28.97), "Karahallı": (38.32, 29.52),
-        "Merkez": (38.68, 29.41), "Sivaslı": (38.50, 29.68), "Ulubey": (38.42, 29.29)
-    },
-    "Van": {
-        "Bahçesaray": (38.12, 42.81), "Başkale": (38.05, 44.02), "Çaldıran": (39.14, 43.91),
-        "Çatak": (38.00, 43.06), "Edremit": (38.42, 43.27), "Erciş": (39.02, 43.36),
-        "Gevaş": (38.29, 43.10), "Gürpınar": (38.32, 43.41), "İpekyolu (Merkez)": (38.50, 43.38),
-        "Muradiye": (38.99, 43.77), "Özalp": (38.65, 43.99), "Saray": (38.64, 44.16),
-        "Tuşba": (38.55, 43.30)
-    },
-    "Yalova": {
-        "Altınova": (40.69, 29.50), "Armutlu": (40.52, 28.83), "Çınarcık": (40.65, 29.12),
-        "Çiftlikköy": (40.66, 29.33), "Merkez": (40.65, 29.27), "Termal": (40.61, 29.17)
-    },
-    "Yozgat": {
-        "Akdağmadeni": (39.66, 35.88), "Aydıncık": (40.13, 35.28), "Boğazlıyan": (39.19, 35.25),
-        "Çandır": (39.23, 35.52), "Çayıralan": (39.30, 35.63), "Çekerek": (40.07, 35.49),
-        "Kadışehri": (39.99, 35.79), "Merkez": (39.82, 34.81), "Saraykent": (39.69, 35.51),
-        "Sarıkaya": (39.49, 35.38), "Sorgun": (39.81, 35.18), "Şefaatli": (39.50, 34.76),
-        "Yenifakılı": (39.21, 35.00), "Yerköy": (39.64, 34.47)
-    },
-    "Zonguldak": {
-        "Alaplı": (41.17, 31.39), "Çaycuma": (41.43, 32.07), "Devrek": (41.22, 31.96),
-        "Ereğli": (41.28, 31.42), "Gökçebey": (41.31, 32.14), "Kilimli": (41.49, 31.84),
-        "Kozlu": (41.45, 31.75), "Merkez": (41.45, 31.79)
-    }
-}
+# Paralel Tarama (İşçi Süreç Sayısı)
+PARALEL_ISCI_SAYISI = int(os.environ.get("SISMIQ_ISCI_SAYISI", os.cpu_count() or 1))
+
+# Skor Önbelleği (0: yalnızca bellek, yeniden başlatmada silinir)
+SKOR_ONBELLEGI_DISKTE = os.environ.get("SISMIQ_SKOR_DISK_ONBELLEGI", "1") != "0"
+
 
 # -----------------------------------------------------------------------------
 # 4. YARDIMCI FONKSİYONLAR
 # -----------------------------------------------------------------------------
-@st.cache_data
-def load_data(filepath):
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f: lines = f.readlines()
-    except:
-        try:
-            with open(filepath, 'r', encoding='cp1254') as f: lines = f.readlines()
-        except:
-            return pd.DataFrame()
-            
-    start_line = 0
-    for i, line in enumerate(lines):
-        if "Olus tarihi" in line or "Enlem" in line: start_line = i + 1; break
-    parsed_data = []
-    for line in lines[start_line:]:
-        parts = line.split()
-        if len(parts) < 10: continue
+@st.cache_resource
+def load_live_catalog(filepath):
+    return MergedCatalog(KATALOG_KAYNAKLARI) if KATALOG_KAYNAKLARI else LiveCatalog(filepath)
+
+# Dosyanın sonuna yeni depremler eklendiyse yalnızca eklenen satırlar okunur ve
+# katalog sürümü artar; sürüme bağlı önbellekler yeni sürümde yeniden kurulur.
+def load_compiled_catalog(filepath):
+    return load_live_catalog(filepath).current()
+
+@st.cache_resource(max_entries=1)
+def load_engine_pool(filepath, version):
+    return EnginePool(load_compiled_catalog(filepath).index, PARALEL_ISCI_SAYISI)
+
+@st.cache_resource
+def load_score_cache(filepath):
+    db_path = None
+    if SKOR_ONBELLEGI_DISKTE:
         try:
-            date_str, time_str = parts[2], parts[3]
-            lat, lon, mag = float(parts[4]), float(parts[5]), float(parts[7])
-            if mag == 0.0: mag = float(parts[9])
-            parsed_data.append([f"{date_str} {time_str[:8]}", lat, lon, mag])
-        except: continue
-    df = pd.DataFrame(parsed_data, columns=['TarihStr', 'Enlem', 'Boylam', 'Mag'])
-    df['Tarih'] = pd.to_datetime(df['TarihStr'], format="%Y.%m.%d %H:%M:%S", errors='coerce')
-    df.drop(columns=['TarihStr'], inplace=True)
-    df.dropna(subset=['Tarih'], inplace=True)
-    
-    ref_new_moon = pd.Timestamp("1988-12-09 01:39:00")
-    days = (df['Tarih'] - ref_new_moon).dt.total_seconds() / 86400.0
-    current_phase_day = days % 29.53059
-    df['Dolunay'] = ((current_phase_day >= 13.5) & (current_phase_day <= 16.5)).astype(int)
-    return df
-
-def haversine_vectorized(lat1, lon1, lat2_array, lon2_array):
-    R = 6371
-    phi1, phi2 = np.radians(lat1), np.radians(lat2_array)
-    dphi = np.radians(lat2_array - lat1)
-    dlambda = np.radians(lon2_array - lon1)
-    a = np.sin(dphi/2)**2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda/2)**2
-    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
-    return R * c
-
-def distance_point_to_segment_scalar(px, py, x1, y1, x2, y2):
-    dx, dy = x2 - x1, y2 - y1
-    if dx == 0 and dy == 0: return math.sqrt((px-x1)**2 + (py-y1)**2) * 111 
-    t = ((px - x1) * dx + (py - y1) * dy) / (dx*dx + dy*dy)
-    if t < 0: closest_x, closest_y = x1, y1
-    elif t > 1: closest_x, closest_y = x2, y2
-    else: closest_x, closest_y = x1 + t * dx, y1 + t * dy
-    return haversine_vectorized(py, px, np.array([closest_y]), np.array([closest_x]))[0]
-
-def check_fault_proximity(user_lat, user_lon):
-    closest_dist = 9999
-    closest_fault_name = None
-    for name, coords in ACTIVE_FAULTS.items():
-        (lat1, lon1), (lat2, lon2) = coords
-        if abs(user_lat - (lat1+lat2)/2) > 2.5: continue
-        dist = distance_point_to_segment_scalar(user_lon, user_lat, lon1, lat1, lon2, lat2)
-        if dist < closest_dist:
-            closest_dist = dist
-            closest_fault_name = name
-    if closest_dist <= FAY_TAMPON_BOLGESI_KM: return True, closest_fault_name
-    return False, "Ana Faylara Uzak"
-
-def calculate_b_value(magnitudes):
-    if len(magnitudes) < 15: return None
-    mags_above = magnitudes[magnitudes >= BUYUKLUK_FILTRESI]
-    if len(mags_above) < 15: return None
-    mean_mag = np.mean(mags_above)
-    if mean_mag == BUYUKLUK_FILTRESI: return 1.0
-    return 0.4343 / (mean_mag - BUYUKLUK_FILTRESI)
+            os.makedirs(catalog_cache_dir(filepath), exist_ok=True)
+            db_path = os.path.join(catalog_cache_dir(filepath), 'skorlar.sqlite')
+        except OSError: pass
+    return ScoreCache(db_path=db_path)
 
 def get_visual_icon(score):
     if score == 9999: return ICON_POST
@@ -667,24 +104,6 @@ def get_visual_icon(score):
     if score >= 50: return ICON_MED
     return ICON_LOW
 
-def get_risk_label_and_color(score):
-    if score >= 326: return "KRİTİK RİSK", "#FF0000"
-    if score >= 226: return "YÜKSEK RİSK", "#FFA500"
-    if score >= 126: return "ORTA RİSK", "#FFFF00"
-    return "DÜŞÜK RİSK", "#00FF00"
-
-def get_risk_label_text(score):
-    if score >= 326: return "KRİTİK RİSK"
-    if score >= 226: return "YÜKSEK RİSK"
-    if score >= 126: return "ORTA RİSK"
-    return "DÜŞÜK RİSK"
-
-def get_snapshot_status(score):
-    if score == 9999: return "POST-SİSMİK", "#808080", 20 
-    if score >= 75: return "YÜKSEK STRES", "#FF0000", score 
-    if score >= 50: return "HAREKETLİ", "#FFA500", score 
-    return "NORMAL", "#00FF00", 20 
-
 def print_risk_legend_web():
     st.markdown("---")
     st.info("""
@@ -696,91 +115,47 @@ def print_risk_legend_web():
     * **X POST-SİSMİK:** Enerji Boşalmış. Artçılar olabilir ama ana şok riski düşük.
     """)
 
-# --- RİSK MOTORU (CORE) ---
-def calculate_risk_engine(df, lat, lon, simdi):
-    is_on_fault, fault_name = check_fault_proximity(lat, lon)
-    
-    lat_min, lat_max = lat - 2.0, lat + 2.0
-    lon_min, lon_max = lon - 2.0, lon + 2.0
-    subset = df[(df['Enlem'] >= lat_min) & (df['Enlem'] <= lat_max) &
-                (df['Boylam'] >= lon_min) & (df['Boylam'] <= lon_max) &
-                (df['Tarih'] <= simdi)]
-    
-    if len(subset) == 0: return 0, [], "Veri Yok"
-
-    dists = haversine_vectorized(lat, lon, subset['Enlem'].values, subset['Boylam'].values)
-    subset = subset.assign(Mesafe=dists)
+# TÜRKİYE RİSK HARİTASI (MATPLOTLIB)
+@instrument.traced('render.map')
+def draw_risk_map(md, post_risks):
+    fig, ax = plt.subplots(figsize=(12, 7))
+    if os.path.exists(HARITA_DOSYASI):
+        try: ax.imshow(mpimg.imread(HARITA_DOSYASI), extent=[26, 45.1, 36, 42.1], zorder=0, aspect='auto')
+        except: ax.set_facecolor('black')
+    else: ax.set_facecolor('black')
     
-    final_df = subset[(subset['Mesafe'] <= ANALIZ_YARICAP_KM) & (subset['Mag'] >= BUYUKLUK_FILTRESI)]
+    mx = [d['lon'] for d in md]; my = [d['lat'] for d in md]; mz = [d['val'] for d in md]
+    cmap = mcolors.ListedColormap(['#00FF00', '#FFFF00', '#FFA500', '#FF0000'])
+    norm = mcolors.BoundaryNorm([0, 125, 225, 325, 1000], cmap.N)
+    contour = ax.tricontourf(mx, my, mz, levels=[0, 125, 225, 325, 1000], cmap=cmap, norm=norm, alpha=0.6, zorder=1)
     
-    if len(final_df) < MIN_DEPREM_SAYISI:
-        if is_on_fault: return 35, ["Yetersiz Veri / Sismik Boşluk (+35)"], fault_name
-        else: return 0, [], "Yetersiz Veri"
-
-    date_1y_ago = simdi - datetime.timedelta(days=365)
-    dead_zone = subset[(subset['Mesafe'] <= POST_SISMIK_YARICAP_KM) & (subset['Tarih'] >= date_1y_ago) & (subset['Mag'] >= 5.5)]
-    if not dead_zone.empty: return 9999, ["POST-SİSMİK"], fault_name
-
-    risk_score = 0; reasons = []
+    if post_risks:
+        px = [p[1] for p in post_risks]; py = [p[0] for p in post_risks]
+        ax.scatter(px, py, c='cyan', s=15, marker='x', zorder=2)
     
-    date_3y_ago = simdi - datetime.timedelta(days=365*3)
-    trigger_zone = subset[(subset['Mesafe'] > POST_SISMIK_YARICAP_KM) & (subset['Mesafe'] <= TETIKLENME_YARICAP_KM) & (subset['Tarih'] >= date_3y_ago) & (subset['Mag'] >= 5.5)]
-    if not trigger_zone.empty:
-        pts = 35 if is_on_fault else 30
-        risk_score += pts; reasons.append(f"Stres Transferi (+{pts})")
-
-    b_val = calculate_b_value(final_df['Mag'].values)
-    if b_val and b_val < 0.85:
-        pts = 35 if is_on_fault else 25
-        risk_score += pts; reasons.append(f"Fiziksel Gerilme (b={b_val:.2f}) (+{pts})")
-
-    df_last_1y = final_df[final_df['Tarih'] >= date_1y_ago]
-    df_prev_2y = final_df[(final_df['Tarih'] < date_1y_ago) & (final_df['Tarih'] >= date_3y_ago)]
+    # HARİTADA SADECE İL MERKEZLERİNİ GÖSTER (KARIŞIKLIĞI ÖNLEMEK İÇİN)
+    for city, (clat, clon) in province_centres().items():
+        if 36<=clat<=42.1 and 26<=clon<=45.1:
+            ax.scatter(clon, clat, c='white', s=10, edgecolors='black', zorder=5)
+            ax.text(clon, clat+0.15, city, fontsize=7, color='white', ha='center', fontweight='bold', zorder=6, bbox=dict(facecolor='black', alpha=0.5, edgecolor='none', boxstyle='round,pad=0.1'))
     
-    ratio_last_1y = (df_last_1y['Dolunay'].sum() / len(df_last_1y) * 100) if len(df_last_1y) > 0 else 0
-    ratio_prev_2y = (df_prev_2y['Dolunay'].sum() / len(df_prev_2y) * 100) if len(df_prev_2y) > 0 else 0
-    
-    is_catirdama = (len(df_last_1y) >= 5 and ratio_last_1y > 15.0)
-    is_prev_silence = (len(df_prev_2y) >= 5 and ratio_prev_2y < 9.0)
-    is_current_silence = (len(df_last_1y) >= 5 and ratio_last_1y < 9.0)
-    is_ani_kilit = (len(df_prev_2y) >= 5 and ratio_prev_2y > 15.0 and len(df_last_1y) >= 5 and ratio_last_1y < 9.0)
-
-    moon_score = 0; moon_reason = ""
-    if is_catirdama:
-        base = 35; 
-        if is_on_fault: base += 15; 
-        if is_prev_silence: base += 25
-        moon_score = base; moon_reason = f"Çatırdama (+{base})"
-    elif is_ani_kilit:
-        pts = 75 if is_on_fault else 50
-        moon_score = pts; moon_reason = f"Ani Kilitlenme (+{pts})"
-    elif is_current_silence:
-        pts = 25 if is_on_fault else 10
-        moon_score = pts; moon_reason = f"Baskılanma/Sessizlik (+{pts})"
-
-    if moon_score > 0: risk_score += moon_score; reasons.append(moon_reason)
-    if risk_score > 150: risk_score = 150
-    return risk_score, reasons, fault_name
+    ax.set_xlim(25.5, 45.5); ax.set_ylim(35.5, 42.5); ax.axis('off')
+    fig.patch.set_facecolor('#0E1117')
+    return fig
 
 # ORTAK SONUÇ GÖSTERİCİ (HEM KOORDİNAT HEM İL İÇİN)
+@instrument.traced('render.analysis')
 def render_analysis_results(lat, lon, date, location_name="Seçilen Konum"):
-    curr, reas, f = calculate_risk_engine(df, lat, lon, date)
-    
-    past_scores_raw = []
-    intervals = [365, 180, 90, 30, 0] # 1 Yıl'dan Şimdi'ye
-    labels_chrono = ["1 Yıl Önce", "6 Ay Önce", "3 Ay Önce", "1 Ay Önce", "Şimdi"]
+    score_cache = load_score_cache(DOSYA_ADI)
+    snapshots = score_cache.timeline(catalog, lat, lon, snapshot_dates(date)) # Şimdi'den 1 Yıl'a
+    cache_stats = score_cache.stats()
+    st.sidebar.caption(f"Skor önbelleği: {cache_stats['hits']} bellek / {cache_stats['disk_hits']} disk isabeti, {cache_stats['misses']} hesaplama")
+    snap_scores = [p_s for p_s, _, _ in snapshots]
+    curr, reas, f = snapshots[0]
     
-    for d in intervals:
-        if d == 0: p_s = curr
-        else: p_s, _, _ = calculate_risk_engine(df, lat, lon, date - datetime.timedelta(days=d))
-        past_scores_raw.append(p_s)
-    
-    calc_scores = past_scores_raw[::-1] 
-    s_vals = [s if s >= 50 else 0 for s in calc_scores]
-    heat_val = int((s_vals[0]*1.5) + (s_vals[1]*0.8) + (s_vals[2]*0.6) + (s_vals[3]*0.4) + (s_vals[4]*0.2))
+    heat_val = int(heat_values([snap_scores], count_post_history=True)[0])
     risk_text, risk_color = get_risk_label_and_color(heat_val)
-    
-    report_txt = f"""SİSMİQ ANALİZ RAPORU\nTarih: {date.strftime('%Y-%m-%d')}\nKonum: {location_name} ({lat}N, {lon}E)\nRisk Puanı: {heat_val}\nDurum: {risk_text}\nDetay: {', '.join(reas) if reas else 'Temiz'}"""
+    report_txt = report_text(date, location_name, lat, lon, heat_val, reas)
     
     st.write("---")
     if curr == 9999:
@@ -795,16 +170,24 @@ def render_analysis_results(lat, lon, date, location_name="Seçilen Konum"):
         
         # Grafik
         st.subheader("📈 Zaman Tüneli (Stres Geçmişi)")
-        chart_data = []
-        for label, score in zip(labels_chrono, past_scores_raw):
-            status_text, color_hex, plot_val = get_snapshot_status(score)
-            chart_data.append({"Dönem": label, "Değer": plot_val, "Renk": color_hex, "Durum": status_text})
+        timeline = timeline_frame(spatial_index, lat, lon, date) # Son 1 yıl, günlük
+        snap_marks = pd.DataFrame({"Tarih": pd.to_datetime(snapshot_dates(date)), "Dönem": RAPOR_ETIKETLERI})
         
-        c = alt.Chart(pd.DataFrame(chart_data)).mark_bar().encode(
-            x=alt.X('Dönem', sort=None), y=alt.Y('Değer', axis=None), color=alt.Color('Renk', scale=None), tooltip=['Dönem', 'Durum']
-        ).properties(height=300)
-        text = c.mark_text(align='center', baseline='bottom', dy=-5, color='white').encode(text='Durum')
-        st.altair_chart(c + text, use_container_width=True)
+        base = alt.Chart(timeline).encode(x=alt.X('Tarih:T', title=None))
+        line = base.mark_line(color='#888888').encode(y=alt.Y('Değer:Q', axis=None))
+        points = base.mark_circle(size=18).encode(
+            y='Değer:Q', color=alt.Color('Renk:N', scale=None),
+            tooltip=[alt.Tooltip('Tarih:T', format='%Y-%m-%d'), 'Durum', 'Puan', alt.Tooltip('b-Değeri:Q', format='.2f'),
+                     alt.Tooltip('Dolunay Oranı 1Y (%):Q', format='.1f')]
+        )
+        rules = alt.Chart(snap_marks).mark_rule(strokeDash=[4, 4], color='white', opacity=0.4).encode(x='Tarih:T', tooltip=['Dönem'])
+        labels = rules.mark_text(align='left', baseline='top', dx=3, y=5, color='white').encode(text='Dönem')
+        with instrument.stage('render.timeline_chart'): st.altair_chart((line + points + rules + labels).properties(height=300), use_container_width=True)
+        
+        with st.expander("📉 Göstergeler (b-Değeri ve Dolunay Oranları)"):
+            indicators = timeline.set_index('Tarih')
+            st.line_chart(indicators[['b-Değeri']], height=200)
+            st.line_chart(indicators[['Dolunay Oranı 1Y (%)', 'Dolunay Oranı Önceki 2Y (%)']], height=200)
         
         with st.expander("ℹ️ Grafiği Nasıl Okumalıyım?"):
             st.markdown("""
@@ -812,7 +195,7 @@ def render_analysis_results(lat, lon, date, location_name="Seçilen Konum"):
             * **Turuncu (HAREKETLİ):** Bölgede stres transferi veya fiziksel gerilme var.
             * **Kırmızı (YÜKSEK STRES):** Ani kilitlenme veya yoğun stres (Deprem öncesi olası sinyal).
             * **Gri (POST-SİSMİK):** Deprem sonrası enerji boşalımı.
-            * *Not: Barların yüksekliği stresin şiddetini temsil eder.*
+            * *Not: Eğrinin yüksekliği stresin şiddetini temsil eder; kesikli çizgiler ısı puanına giren anlardır.*
             """)
         print_risk_legend_web()
 
@@ -820,14 +203,13 @@ def render_analysis_results(lat, lon, date, location_name="Seçilen Konum"):
 # GEÇMİŞ LİSTESİ (HER İKİ DURUMDA DA ÇALIŞIR)
     st.write("---")
     st.subheader(f"📜 {location_name} Çevresindeki Deprem Geçmişi (100 KM)") 
-    dists = haversine_vectorized(lat, lon, df['Enlem'].values, df['Boylam'].values)
-    display_df = df.copy()
-    display_df['Mesafe (km)'] = dists
-    nearby_quakes = display_df[(display_df['Mesafe (km)'] <= 100) & (display_df['Tarih'] <= date)].sort_values(by='Tarih', ascending=False)
-    nearby_quakes['Tarih'] = nearby_quakes['Tarih'].dt.strftime('%Y-%m-%d %H:%M')
+    nearby = nearby_quakes(spatial_index, lat, lon, date) # Yalnızca gösterilen sayfa tabloya dönüşür
     
-    with st.expander(f"📋 Toplam {len(nearby_quakes)} Kayıt Bulundu (Listeyi Aç)"):
-        st.dataframe(nearby_quakes[['Tarih', 'Enlem', 'Boylam', 'Mag', 'Mesafe (km)']], use_container_width=True)
+    with st.expander(f"📋 Toplam {len(nearby)} Kayıt Bulundu (Listeyi Aç)"):
+        c1, c2 = st.columns(2)
+        page_size = c1.selectbox("Sayfa Boyutu", [25, GECMIS_SAYFA_BOYUTU, 100, 250], index=1, key="gecmis_sayfa_boyutu")
+        page_no = c2.number_input(f"Sayfa (1–{nearby.n_pages(page_size)})", min_value=1, max_value=nearby.n_pages(page_size), value=1, step=1, key="gecmis_sayfa")
+        with instrument.stage('render.dataframe'): st.dataframe(nearby.page(page_no - 1, page_size), use_container_width=True, hide_index=True)
         
 # -----------------------------------------------------------------------------
 # 5. ARAYÜZ (UI)
@@ -838,11 +220,23 @@ page = st.sidebar.radio("Menü:", ["🏠 Ana Sayfa & Başarılar", "📍 Tek Nok
 st.sidebar.markdown("---")
 st.sidebar.write("📫 **Geri Bildirim:**")
 st.sidebar.markdown("[Hata Bildir / Öneri Yap](mailto:sismiq.contact@gmail.com?subject=SİSMİQ%20Geri%20Bildirim)")
-
-df = load_data(DOSYA_ADI)
+# Ölçüm bayrağı bu çalıştırmanın bağlamına özeldir; diğer oturumlar kendi panellerine göre ölçülür.
+# Aşama tablosu süreç genelidir: paneli açık olan oturumların ölçümlerini birlikte toplar.
+perf_panel = st.sidebar.checkbox("🔧 Performans Paneli", value=instrument.enabled(), help="Motor, tarama ve ekran aşamalarının sürelerini toplar.")
+instrument.enable(perf_panel)
+
+catalog = load_compiled_catalog(DOSYA_ADI)
+# Katalog tablosu süreç başına bir kez tutulur (salt okunur, önbellekten mmap ile); oturumlara kopyası verilmez.
+df = catalog.df
 if df.empty:
     st.error(f"'{DOSYA_ADI}' dosyası bulunamadı!")
     st.stop()
+spatial_index = catalog.index
+st.sidebar.caption(f"Katalog sürümü: {catalog.version} ({len(df)} deprem)")
+if KATALOG_KAYNAKLARI:
+    merge_stats = load_live_catalog(DOSYA_ADI).stats
+    st.sidebar.caption(f"Kaynaklar: {len(merge_stats)} dosya, {sum(s['tekrar'] for s in merge_stats)} tekrar olay ayıklandı.")
+if df.attrs.get('reddedilen_satir'): st.sidebar.caption(f"⚠️ Katalogda okunamayan {df.attrs['reddedilen_satir']} satır atlandı.")
 
 if page == "🏠 Ana Sayfa & Başarılar":
     st.title("🎯 SİSMİQ: Sismik Risk Analiz Sistemi")
@@ -868,8 +262,10 @@ elif page == "📍 Tek Nokta Analizi":
         lat_in = c1.number_input("Enlem", 38.0, format="%.2f")
         lon_in = c2.number_input("Boylam", 35.0, format="%.2f")
         date_in = c3.date_input("Tarih", datetime.datetime.now(), key="d1")
+        # Sorgu oturumda tutulur: sonuç ekranındaki sayfalama gibi etkileşimler analizi kaybettirmez.
         if st.button("KOORDİNAT ANALİZİ YAP", type="primary"):
-            render_analysis_results(lat_in, lon_in, datetime.datetime.combine(date_in, datetime.datetime.min.time()))
+            st.session_state['point_query'] = ('coord', lat_in, lon_in, datetime.datetime.combine(date_in, datetime.datetime.min.time()), "Seçilen Konum")
+        if st.session_state.get('point_query', ('',))[0] == 'coord': render_analysis_results(*st.session_state['point_query'][1:])
             
     # 2. ŞEHİR SEKRESİ (YENİLENMİŞ)
     with tab_city:
@@ -888,78 +284,45 @@ elif page == "📍 Tek Nokta Analizi":
         if st.button("ŞEHİR ANALİZİ YAP", type="primary"):
             # Seçilen ilçenin koordinatlarını al
             city_lat, city_lon = TURKEY_DISTRICTS[selected_city][selected_district]
-            render_analysis_results(city_lat, city_lon, datetime.datetime.combine(date_in_city, datetime.datetime.min.time()), f"{selected_city} - {selected_district}")
+            st.session_state['point_query'] = ('city', city_lat, city_lon, datetime.datetime.combine(date_in_city, datetime.datetime.min.time()), f"{selected_city} - {selected_district}")
+        if st.session_state.get('point_query', ('',))[0] == 'city': render_analysis_results(*st.session_state['point_query'][1:])
 
 elif page == "🗺️ Tüm Türkiye Analizi":
     st.title("🗺️ Tüm Türkiye Sismik Analizi")
-    tab1, tab2 = st.tabs(["🗺️ Görsel Harita", "📑 Detaylı Rapor"])
+    tab1, tab2, tab3 = st.tabs(["🗺️ Görsel Harita", "📑 Detaylı Rapor", "🏙️ İlçe Sıralaması"])
     date_map = st.date_input("Analiz Tarihi", datetime.datetime.now())
+    c1, c2 = st.columns(2)
+    adaptive = c1.toggle("Uyarlamalı Çözünürlük", help="0.5° ızgarada riskli çıkan hücreler ve komşuları dörde bölünerek inceltilir.")
+    min_cell = c2.select_slider("En Küçük Hücre (°)", [0.25, 0.125, 0.0625, 0.03125], value=ADAPTIF_MIN_HUCRE, disabled=not adaptive)
     
     if st.button("ANALİZİ BAŞLAT", type="primary"):
         with st.spinner('Tüm Türkiye taranıyor...'):
             scan_date = datetime.datetime.combine(date_map, datetime.datetime.min.time())
-            lats = np.arange(36.0, 42.1, 0.5); lons = np.arange(26.0, 45.1, 0.5)
-            map_data = []; post_risks = []; report_data = []
-            intervals = [0, 30, 90, 180, 365]; weights = [1.5, 0.8, 0.6, 0.4, 0.2]
-            progress_bar = st.progress(0); total = len(lats)*len(lons); count=0
+            lats = ULUSAL_IZGARA_ENLEM; lons = ULUSAL_IZGARA_BOYLAM
+            progress_bar = st.progress(0)
+            pool = load_engine_pool(DOSYA_ADI, catalog.version)
             
-            for lat in lats:
-                for lon in lons:
-                    count+=1; 
-                    if count%50==0: progress_bar.progress(count/total)
-                    curr, reasons, fault = calculate_risk_engine(df, lat, lon, scan_date)
-                    if curr == 9999:
-                        post_risks.append([lat, lon]); map_data.append({"lat": lat, "lon": lon, "val": 0}); continue
-                    
-                    scores = [curr if curr>=50 else 0]
-                    for i in range(1, 5):
-                        p_s, _, _ = calculate_risk_engine(df, lat, lon, scan_date - datetime.timedelta(days=intervals[i]))
-                        scores.append(p_s if p_s>=50 and p_s!=9999 else 0)
-                    
-                    heat_val = int(sum([s*w for s, w in zip(scores, weights)]))
-                    map_data.append({"lat": lat, "lon": lon, "val": heat_val})
-                    if curr>=50 or heat_val>=RAPOR_ALT_LIMIT:
-                        report_data.append({"Enlem": lat, "Boylam": lon, "Bölge": fault, "Puan": heat_val, "Seviye": get_risk_label_text(heat_val), "Detay": ", ".join(reasons)})
+            if adaptive: scored = adaptive_scan(pool, scan_date, min_cell, on_progress=progress_bar.progress)
+            else:
+                # Her enlem satırı bir işçide tek bir vektörel motor çağrısıyla taranır.
+                with instrument.stage('scan.national'):
+                    row_results = pool.map(score_sites, [(np.full(len(lons), lat), lons, [scan_date] * len(lons)) for lat in lats], progress_bar.progress)
+                scored = pd.concat(row_results, ignore_index=True).assign(**{HUCRE_SUTUNU: lats[1] - lats[0]})
+            post = scored['Anlık Puan'] == 9999
+            map_data = [{"lat": lat, "lon": lon, "val": val} for lat, lon, val in zip(scored['Enlem'], scored['Boylam'], scored['Puan'].tolist())]
+            post_risks = scored.loc[post, ['Enlem', 'Boylam']].values.tolist()
+            report_data = scored.loc[is_reportable(scored['Anlık Puan'], scored['Puan']), ['Enlem', 'Boylam', HUCRE_SUTUNU, 'Bölge', 'Puan', 'Seviye', 'Detay']].to_dict('records')
             
             progress_bar.empty()
             st.session_state['map_data'] = map_data
             st.session_state['post_risks'] = post_risks
             st.session_state['report_data'] = report_data
-            st.success("Analiz Bitti!")
+            st.success(f"Analiz Bitti! ({len(scored)} nokta)")
 
     with tab1:
         if 'map_data' in st.session_state:
-            fig, ax = plt.subplots(figsize=(12, 7))
-            if os.path.exists(HARITA_DOSYASI):
-                try: ax.imshow(mpimg.imread(HARITA_DOSYASI), extent=[26, 45.1, 36, 42.1], zorder=0, aspect='auto')
-                except: ax.set_facecolor('black')
-            else: ax.set_facecolor('black')
-            
-            md = st.session_state['map_data']
-            mx = [d['lon'] for d in md]; my = [d['lat'] for d in md]; mz = [d['val'] for d in md]
-            cmap = mcolors.ListedColormap(['#00FF00', '#FFFF00', '#FFA500', '#FF0000'])
-            norm = mcolors.BoundaryNorm([0, 125, 225, 325, 1000], cmap.N)
-            contour = ax.tricontourf(mx, my, mz, levels=[0, 125, 225, 325, 1000], cmap=cmap, norm=norm, alpha=0.6, zorder=1)
-            
-            if st.session_state['post_risks']:
-                px = [p[1] for p in st.session_state['post_risks']]; py = [p[0] for p in st.session_state['post_risks']]
-                ax.scatter(px, py, c='cyan', s=15, marker='x', zorder=2)
-            
-            # HARİTADA SADECE İL MERKEZLERİNİ GÖSTER (KARIŞIKLIĞI ÖNLEMEK İÇİN)
-            for city in TURKEY_DISTRICTS:
-                if "Merkez" in TURKEY_DISTRICTS[city]:
-                    clat, clon = TURKEY_DISTRICTS[city]["Merkez"]
-                else:
-                    # Merkez yoksa ilk ilçeyi al
-                    first_district = list(TURKEY_DISTRICTS[city].keys())[0]
-                    clat, clon = TURKEY_DISTRICTS[city][first_district]
-                    
-                if 36<=clat<=42.1 and 26<=clon<=45.1:
-                    ax.scatter(clon, clat, c='white', s=10, edgecolors='black', zorder=5)
-                    ax.text(clon, clat+0.15, city, fontsize=7, color='white', ha='center', fontweight='bold', zorder=6, bbox=dict(facecolor='black', alpha=0.5, edgecolor='none', boxstyle='round,pad=0.1'))
-            
-            ax.set_xlim(25.5, 45.5); ax.set_ylim(35.5, 42.5); ax.axis('off')
-            fig.patch.set_facecolor('#0E1117'); st.pyplot(fig)
+            fig = draw_risk_map(st.session_state['map_data'], st.session_state['post_risks'])
+            with instrument.stage('render.pyplot'): st.pyplot(fig)
             img_buf = io.BytesIO(); fig.savefig(img_buf, format='png', bbox_inches='tight', facecolor='#0E1117')
             st.download_button("🖼️ Haritayı İndir", img_buf.getvalue(), "Sismiq_Harita.png", "image/png")
         else: st.info("Lütfen analizi başlatın.")
@@ -967,43 +330,77 @@ elif page == "🗺️ Tüm Türkiye Analizi":
     with tab2:
         if 'report_data' in st.session_state and st.session_state['report_data']:
             df_r = pd.DataFrame(st.session_state['report_data']).sort_values(by="Puan", ascending=False)
-            st.dataframe(df_r, use_container_width=True)
+            with instrument.stage('render.dataframe'): st.dataframe(df_r, use_container_width=True)
             st.download_button("📑 Raporu İndir (.csv)", df_r.to_csv(index=False).encode('utf-8'), "Sismiq_Rapor.csv", "text/csv")
         else: st.info("Riskli bölge bulunamadı.")
 
+    with tab3:
+        # Tüm ilçe merkezleri seçilen tarih için tek toplu çağrıyla puanlanır (ulusal tarama puanı).
+        if st.button("TÜM İLÇELERİ TARA"):
+            with st.spinner('İlçeler puanlanıyor...'):
+                district_date = datetime.datetime.combine(date_map, datetime.datetime.min.time())
+                progress_bar = st.progress(0)
+                st.session_state['district_ranking'] = district_scan(load_engine_pool(DOSYA_ADI, catalog.version), district_date, progress_bar.progress)
+                st.session_state['district_date'] = district_date
+                progress_bar.empty()
+        
+        if 'district_ranking' in st.session_state:
+            ranking = st.session_state['district_ranking']
+            c1, c2, c3 = st.columns(3)
+            sel_cities = c1.multiselect("İl", sorted(ranking['İl'].unique()))
+            sel_levels = c2.multiselect("Seviye", ["KRİTİK RİSK", "YÜKSEK RİSK", "ORTA RİSK", "DÜŞÜK RİSK", "POST-SİSMİK"])
+            min_score = c3.number_input("En Düşük Puan", min_value=0, value=0, step=25)
+            shown = ranking[ranking['Puan'] >= min_score]
+            if sel_cities: shown = shown[shown['İl'].isin(sel_cities)]
+            if sel_levels: shown = shown[shown['Seviye'].isin(sel_levels)]
+            
+            st.caption(f"{st.session_state['district_date']:%Y-%m-%d} · {len(shown)} / {len(ranking)} ilçe")
+            st.subheader("İl Özeti")
+            st.dataframe(province_summary(shown) if len(shown) else pd.DataFrame(columns=IL_OZET_SUTUNLARI), use_container_width=True, hide_index=True)
+            st.subheader("İlçe Sıralaması")
+            with instrument.stage('render.dataframe'): st.dataframe(shown, use_container_width=True, hide_index=True)
+            
+            file_stem = f"Sismiq_Ilceler_{st.session_state['district_date']:%Y%m%d}"
+            c1, c2 = st.columns(2)
+            c1.download_button("📑 İndir (.csv)", shown.to_csv(index=False).encode('utf-8'), f"{file_stem}.csv", "text/csv")
+            try:
+                parquet_buf = io.BytesIO(); shown.to_parquet(parquet_buf, index=False)
+                c2.download_button("📦 İndir (.parquet)", parquet_buf.getvalue(), f"{file_stem}.parquet", "application/octet-stream")
+            except ImportError: c2.caption("Parquet için pyarrow kurulu değil.")
+        else: st.info("İlçe sıralaması için taramayı başlatın.")
+
 elif page == "🧪 Bilimsel Doğrulama":
     st.title("🧪 Bilimsel Doğrulama")
     c1, c2 = st.columns(2)
     run_rec = c1.button("FAZ 1: Recall (Yakalama) Testi")
     run_pre = c2.button("FAZ 2: Precision (Netlik) Testi")
+    c3, c4 = st.columns(2)
+    bt_seed = c3.number_input("Tohum (Seed)", min_value=0, value=BACKTEST_TOHUM, step=1)
+    bt_dates = c4.number_input("Netlik Tarih Sayısı", min_value=1, max_value=2000, value=BACKTEST_TARIH_SAYISI, step=50)
     
     if run_rec:
         with st.status("Recall Testi Çalışıyor..."):
-            d_start = df['Tarih'].min(); d_safe = d_start + datetime.timedelta(days=365*3)
-            quakes = df[(df['Mag']>=6.0) & (df['Tarih']>d_safe)].sort_values('Tarih')
-            hits=0; log="TARİH | BÖLGE | MAG | SONUÇ\n"
-            for _, q in quakes.iterrows():
-                hit=False
-                for d in [7, 30, 90, 180, 365, 540]:
-                    s, _, _ = calculate_risk_engine(df, q['Enlem'], q['Boylam'], q['Tarih']-datetime.timedelta(days=d))
-                    if s>=50 and s!=9999: hit=True
-                if hit: hits+=1
-                log += f"{q['Tarih'].date()} | {q['Enlem']}N {q['Boylam']}E | M{q['Mag']} | {'✅' if hit else '❌'}\n"
-            st.success(f"Recall: %{(hits/len(quakes)*100):.2f}"); st.text(log)
+            progress_bar = st.progress(0)
+            rec = run_recall_backtest(load_engine_pool(DOSYA_ADI, catalog.version), df, PARALEL_ISCI_SAYISI * 4, progress_bar.progress)
+            m = rec.metrics['Recall']
+            log = pd.DataFrame({"Tarih": rec.quakes['Tarih'].dt.date, "Bölge": rec.quakes['Enlem'].astype(str) + "N " + rec.quakes['Boylam'].astype(str) + "E",
+                                "Mag": rec.quakes['Mag'], "Sonuç": np.where(rec.hits, '✅', '❌')})
+            for j, lag in enumerate(RECALL_GECIKMELERI): log[f"-{lag}g"] = np.where(rec.lag_flags[:, j], '●', '')
+        st.success(f"Recall: %{m['oran']*100:.2f} (%95 GA: %{m['alt']*100:.1f} – %{m['ust']*100:.1f}, {m['k']}/{m['n']})")
+        st.dataframe(metrics_table(rec.metrics), use_container_width=True, hide_index=True)
+        st.dataframe(log, use_container_width=True, hide_index=True)
 
     if run_pre:
-        with st.status("Netlik Testi (3 Tarih)..."):
-            d_start = df['Tarih'].min(); days = (df['Tarih'].max() - d_start).days - 1000
-            lats=np.arange(36,42,0.5); lons=np.arange(26,45,0.5); total=0; confirmed=0
-            for _ in range(3):
-                t = d_start + datetime.timedelta(days=random.randint(1000, days)); st.write(f"Taranıyor: {t.date()}")
-                for lat in lats:
-                    for lon in lons:
-                        curr, _, _ = calculate_risk_engine(df, lat, lon, t)
-                        if curr>=50 and curr!=9999:
-                            total+=1
-                            if not df[(np.abs(df['Enlem']-lat)<=1.5) & (np.abs(df['Boylam']-lon)<=1.5) & (df['Tarih']>t) & (df['Tarih']<t+datetime.timedelta(days=730)) & (df['Mag']>=5.5)].empty: confirmed+=1
-            st.success(f"Netlik: %{(confirmed/total*100) if total>0 else 0:.2f}")
+        with st.status(f"Netlik Testi ({bt_dates} Tarih, Tohum {bt_seed})..."):
+            progress_bar = st.progress(0)
+            pre = run_precision_backtest(load_engine_pool(DOSYA_ADI, catalog.version), df, int(bt_dates), int(bt_seed), PARALEL_ISCI_SAYISI * 4, progress_bar.progress)
+            if pre.dates: st.write(f"Tarandı: {pre.dates[0].date()} – {pre.dates[-1].date()} ({len(pre.dates)} tarih)")
+        m = pre.metrics['Netlik (Precision)']
+        st.success(f"Netlik: %{(m['oran']*100) if m['n']>0 else 0:.2f} (%95 GA: %{m['alt']*100:.1f} – %{m['ust']*100:.1f}, {m['k']}/{m['n']})")
+        c5, c6 = st.columns([1, 2])
+        c5.dataframe(pre.confusion, use_container_width=True)
+        c6.dataframe(metrics_table(pre.metrics), use_container_width=True, hide_index=True)
+        st.download_button("📑 Tarih Bazlı Sonuçlar (.csv)", pre.daily.to_csv(index=False).encode('utf-8'), f"Sismiq_Netlik_{pre.seed}.csv", "text/csv")
             
     st.markdown("---")
     st.subheader("🌍 Dünya Literatürü ile Karşılaştırma")
@@ -1018,4 +415,17 @@ elif page == "❓ Nasıl Yorumlamalı?":
     st.markdown("🟡 ORTA RİSK (126-225): Takip Edilmeli."); st.success("🟢 DÜŞÜK RİSK (0-125): Olağan.")
 
 
+# -----------------------------------------------------------------------------
+# 6. PERFORMANS PANELİ
+# -----------------------------------------------------------------------------
+# Sayfanın sonunda çizilir; bu çalıştırmadaki aşamalar da tabloya girer.
+if perf_panel:
+    with st.sidebar.expander("🔧 Aşama Süreleri", expanded=True):
+        stage_stats = instrument.stats()
+        if stage_stats: st.dataframe(pd.DataFrame(stage_stats).round(2), use_container_width=True, hide_index=True)
+        else: st.caption("Henüz ölçüm yok; bir analiz çalıştırın.")
+        st.download_button("📄 JSON", instrument.to_json(), "sismiq_asamalar.json", "application/json")
+        st.download_button("🧭 Chrome İzi", instrument.to_chrome_trace(), "sismiq_iz.json", "application/json",
+                           help="chrome://tracing veya ui.perfetto.dev ile açılır.")
+        if st.button("Ölçümleri Sıfırla"): instrument.reset(); st.rerun()
 
@@ -0,0 +1,49 @@
+from .engine import (
+    ANALIZ_YARICAP_KM, POST_SISMIK_YARICAP_KM, TETIKLENME_YARICAP_KM, BUYUKLUK_FILTRESI,
+    FAY_TAMPON_BOLGESI_KM, MIN_DEPREM_SAYISI, RAPOR_ALT_LIMIT, ACTIVE_FAULTS,
+    KOMSU_YARICAP_KM, ULUSAL_IZGARA_ENLEM, ULUSAL_IZGARA_BOYLAM,
+    UZAK_FAY_ADI, haversine_vectorized, check_fault_proximity, fault_proximity, active_faults, set_active_faults,
+    FAY_RASTERI_ACIK, fault_raster,
+    build_neighbour_table,
+    calculate_risk_engine, calculate_risk_timeline, calculate_risk_grid, grid_indicators,
+    ZAMAN_SERISI_GUN, calculate_risk_series,
+)
+from .faults import (
+    FAY_ENLEM_PENCERESI, FAY_RASTER_KAPSAMI, FAY_RASTER_COZUNURLUK, RASTER_UZAK, RASTER_SINIR,
+    FaultSet, FaultRaster, load_fault_geojson, segment_distances,
+)
+from .spatial import BUYUK_DEPREM_BUYUKLUGU, BUYUKLUK_OLCEGI, BAYRAK_DOLUNAY, mag_code, SpatialIndex, NeighbourTable, LargeEventIndex, EventTimeTable
+from . import instrument
+from .instrument import IZLEME_OLAY_SINIRI, stage, traced
+from .parallel import EnginePool, split_chunks
+from .validation import RECALL_GECIKMELERI, recall_hits, recall_lag_flags, precision_counts, followup_hits, followup_hits_many
+from .backtest import (
+    BACKTEST_TOHUM, BACKTEST_TARIH_SAYISI, DOGRULAMA_IZGARA_ENLEM, DOGRULAMA_IZGARA_BOYLAM,
+    wilson_interval, recall_quakes, backtest_dates, confusion_counts, confusion_metrics,
+    run_recall_backtest, run_precision_backtest, metrics_table, RecallResult, PrecisionResult,
+)
+from .catalog import parse_catalog, finalize_catalog, open_compiled_catalog, catalog_cache_dir, CompiledCatalog, LiveCatalog
+from .memo import ScoreCache, engine_params_hash
+from .report import (
+    RAPOR_ARALIKLARI, RAPOR_ETIKETLERI, ISI_AGIRLIKLARI, GECMIS_YARICAP_KM, GECMIS_SAYFA_BOYUTU, SKOR_SUTUNLARI,
+    get_risk_label_and_color, get_risk_label_text, get_snapshot_status, snapshot_dates, heat_values,
+    snapshot_scores, score_sites, site_reports, timeline_frame, is_reportable, report_text, NearbyQuakes, nearby_quakes,
+)
+from .scan import (
+    ADAPTIF_MIN_HUCRE, HUCRE_SUTUNU, IL_OZET_SUTUNLARI,
+    score_batch, refine_mask, adaptive_scan, district_scan, province_summary,
+)
+from .synthetic import (
+    SENTETIK_PARCA_BOYUTU, SENTETIK_TOHUM, SENTETIK_BASLANGIC, SENTETIK_BITIS, SENTETIK_B_DEGERI, SENTETIK_FAY_ORANI,
+    catalog_header, format_events, write_catalog, resampled_chunks, gutenberg_richter, omori_delays, model_chunks,
+)
+from .merge import (
+    TEKRAR_ZAMAN_S, TEKRAR_MESAFE_KM, TEKRAR_BUYUKLUK_FARKI, KAYNAK_BICIMLERI,
+    detect_source_format, parse_afad, parse_source_spec, read_source, duplicate_mask, merge_catalogs, write_merged_catalog, MergedCatalog,
+)
+from .bench import (
+    BENCH_ASAMALARI, BENCH_SENTETIK_BOYUTLARI, BENCH_TEKRAR, measure, parse_sizes, synthetic_catalog,
+    bench_catalog, run_benchmarks, compare_results, write_results,
+)
+from .service import ScoringService, LatencyWindow, parse_point, run_service
+from .districts import TURKEY_DISTRICTS, district_table, province_centres
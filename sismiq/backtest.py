@@ -0,0 +1,101 @@
+import math
+import datetime
+import collections
+
+import numpy as np
+import pandas as pd
+
+from .engine import calculate_risk_grid
+from .parallel import split_chunks
+from .validation import RECALL_GECIKMELERI, recall_lag_flags, followup_hits_many
+from .instrument import traced
+
+# -----------------------------------------------------------------------------
+# GERİYE DÖNÜK TEST (BACKTEST)
+# -----------------------------------------------------------------------------
+# Recall: başlangıçtan 3 yıl sonrasındaki tüm M6+ depremler x tüm gecikmeler.
+# Netlik: sabit tohumla seçilen yüzlerce tarihte doğrulama ızgarasının her hücresi
+# için (işaretlendi mi, sonraki 2 yılda ±1.5° içinde M5.5+ oldu mu) karışıklık matrisi.
+# Aynı tohum ve katalog her zaman aynı tarihleri ve aynı sonucu verir.
+BACKTEST_TOHUM = 42
+BACKTEST_TARIH_SAYISI = 200
+RECALL_MIN_BUYUKLUK = 6.0
+GUVEN_Z = 1.96 # %95 güven aralığı
+
+DOGRULAMA_IZGARA_ENLEM = np.arange(36, 42, 0.5)
+DOGRULAMA_IZGARA_BOYLAM = np.arange(26, 45, 0.5)
+
+RecallResult = collections.namedtuple('RecallResult', ['quakes', 'lag_flags', 'hits', 'metrics'])
+PrecisionResult = collections.namedtuple('PrecisionResult', ['seed', 'dates', 'daily', 'confusion', 'metrics'])
+
+def wilson_interval(k, n, z=GUVEN_Z):
+    if n == 0: return float('nan'), float('nan')
+    p = k / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return float(centre - half), float(centre + half)
+
+def proportion(k, n):
+    low, high = wilson_interval(k, n)
+    return {'k': int(k), 'n': int(n), 'oran': float(k / n) if n else float('nan'), 'alt': low, 'ust': high}
+
+def recall_quakes(df, min_mag=RECALL_MIN_BUYUKLUK):
+    d_safe = df['Tarih'].min() + datetime.timedelta(days=365*3)
+    return df[(df['Mag'] >= min_mag) & (df['Tarih'] > d_safe)].sort_values('Tarih', kind='stable')
+
+def backtest_dates(df, n_dates=BACKTEST_TARIH_SAYISI, seed=BACKTEST_TOHUM):
+    # Başlangıçtan 1000 gün sonrası ile bitişten 1000 gün öncesi arasında, tekrarsız gün seçimi.
+    d_start = df['Tarih'].min(); days = (df['Tarih'].max() - d_start).days - 1000
+    if days < 1000: return []
+    offsets = np.arange(1000, days + 1)
+    rng = np.random.default_rng(seed)
+    chosen = np.sort(rng.choice(offsets, size=min(n_dates, len(offsets)), replace=False))
+    return [d_start + datetime.timedelta(days=int(o)) for o in chosen]
+
+@traced('backtest.confusion_counts')
+def confusion_counts(index, dates, lats, lons):
+    # Tarih başına [TP, FP, FN, TN]; tüm tarihler tek motor ve tek takip sorgusuyla puanlanır.
+    scores, _, _ = calculate_risk_grid(index, lats, lons, dates)
+    flagged = (scores >= 50) & (scores != 9999)
+    occurred = followup_hits_many(index, dates, lats, lons)
+    return np.stack([(flagged & occurred).sum(axis=0), (flagged & ~occurred).sum(axis=0),
+                     (~flagged & occurred).sum(axis=0), (~flagged & ~occurred).sum(axis=0)], axis=1).astype(np.int64)
+
+def confusion_metrics(tp, fp, fn, tn):
+    return {
+        'Netlik (Precision)': proportion(tp, tp + fp),
+        'Duyarlılık (Recall)': proportion(tp, tp + fn),
+        'Özgüllük': proportion(tn, tn + fp),
+        'Doğruluk': proportion(tp + tn, tp + fp + fn + tn),
+        'Uyarı Oranı': proportion(tp + fp, tp + fp + fn + tn),
+    }
+
+@traced('backtest.recall')
+def run_recall_backtest(pool, df, n_chunks=1, on_progress=None):
+    quakes = recall_quakes(df)
+    quake_list = list(zip(quakes['Enlem'], quakes['Boylam'], quakes['Tarih']))
+    chunks = pool.map(recall_lag_flags, [(chunk,) for chunk in split_chunks(quake_list, n_chunks)], on_progress)
+    lag_flags = np.concatenate(chunks) if chunks else np.zeros((0, len(RECALL_GECIKMELERI)), dtype=bool)
+    hits = lag_flags.any(axis=1)
+    metrics = {'Recall': proportion(hits.sum(), len(hits)),
+               **{f"{lag} gün önce": proportion(lag_flags[:, j].sum(), len(hits)) for j, lag in enumerate(RECALL_GECIKMELERI)}}
+    return RecallResult(quakes, lag_flags, hits, metrics)
+
+@traced('backtest.precision')
+def run_precision_backtest(pool, df, n_dates=BACKTEST_TARIH_SAYISI, seed=BACKTEST_TOHUM, n_chunks=1, on_progress=None,
+                           lats=DOGRULAMA_IZGARA_ENLEM, lons=DOGRULAMA_IZGARA_BOYLAM):
+    grid_lats, grid_lons = (a.ravel() for a in np.meshgrid(lats, lons, indexing='ij'))
+    dates = backtest_dates(df, n_dates, seed)
+    date_chunks = split_chunks(dates, n_chunks) if dates else []
+    counts = pool.map(confusion_counts, [(chunk, grid_lats, grid_lons) for chunk in date_chunks], on_progress)
+    counts = np.concatenate(counts) if counts else np.zeros((0, 4), dtype=np.int64)
+    daily = pd.DataFrame(counts, columns=['TP', 'FP', 'FN', 'TN'])
+    daily.insert(0, 'Tarih', pd.to_datetime(dates))
+    tp, fp, fn, tn = (int(v) for v in counts.sum(axis=0))
+    confusion = pd.DataFrame([[tp, fp], [fn, tn]], index=['Uyarı Var', 'Uyarı Yok'], columns=['M5.5+ Oldu', 'M5.5+ Olmadı'])
+    return PrecisionResult(seed, dates, daily, confusion, confusion_metrics(tp, fp, fn, tn))
+
+def metrics_table(metrics):
+    return pd.DataFrame([{'Ölçüt': name, 'Değer (%)': m['oran'] * 100, '%95 GA Alt': m['alt'] * 100, '%95 GA Üst': m['ust'] * 100,
+                          'k / n': f"{m['k']} / {m['n']}"} for name, m in metrics.items()])
@@ -0,0 +1,147 @@
+import os
+import sys
+import json
+import time
+import platform
+import datetime
+import subprocess
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from .engine import ULUSAL_IZGARA_ENLEM, ULUSAL_IZGARA_BOYLAM, calculate_risk_engine, calculate_risk_timeline
+from .catalog import parse_catalog, compile_index
+from .parallel import EnginePool
+from .report import snapshot_dates
+from .scan import score_batch
+from .backtest import BACKTEST_TOHUM, BACKTEST_TARIH_SAYISI, run_recall_backtest, run_precision_backtest
+from .synthetic import SENTETIK_TOHUM, SENTETIK_BASLANGIC, SENTETIK_BITIS, write_catalog, model_chunks
+
+# -----------------------------------------------------------------------------
+# PERFORMANS ÖLÇÜMÜ
+# -----------------------------------------------------------------------------
+# Her katalog için aşamalar sırayla ölçülür: süre 'repeat' kez (ilk çalıştırma soğuk
+# önbelleklerle), bellek ayrı bir çalıştırmada tracemalloc ile (ana süreçteki Python ve
+# NumPy ayırmalarının tepe değeri; işçi süreçleri dahil değildir). Sonuçlar JSON olarak
+# yazılır; iki sonuç dosyası compare_results ile karşılaştırılır.
+BENCH_ASAMALARI = ['parse', 'compile', 'point', 'timeline', 'scan', 'recall', 'precision']
+BENCH_SENTETIK_BOYUTLARI = [100_000, 1_000_000, 10_000_000]
+BENCH_TEKRAR = 3
+BENCH_NOKTASI = (37.5, 37.0) # DAF - Maraş
+BENCH_FORMAT_SURUMU = 1
+BENCH_KLASORU = os.path.join('.sismiq_cache', 'bench') # sentetik kataloglar burada tutulur
+
+def measure(func, repeat=BENCH_TEKRAR, memory=True):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter(); result = func(); times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try: func(); peak = tracemalloc.get_traced_memory()[1]
+        finally: tracemalloc.stop()
+    return result, {'times_s': times, 'min_s': min(times), 'median_s': float(np.median(times)),
+                    'peak_mem_mb': None if peak is None else peak / 2**20}
+
+def parse_sizes(text):
+    # "100k,1m,10m" veya "all" -> olay sayıları
+    if text in (None, ''): return []
+    if text == 'all': return list(BENCH_SENTETIK_BOYUTLARI)
+    scale = {'k': 10**3, 'm': 10**6}
+    return [int(float(part[:-1]) * scale[part[-1]]) if part[-1] in scale else int(part)
+            for part in text.lower().replace('_', '').split(',') if part]
+
+def synthetic_catalog(n_events, work_dir, seed=SENTETIK_TOHUM, start=SENTETIK_BASLANGIC, end=SENTETIK_BITIS):
+    # Model kataloğu (bkz. synthetic.model_chunks); aynı boyut, tohum ve süreyle üretilmiş dosya varsa yeniden kullanılır.
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    os.makedirs(work_dir, exist_ok=True)
+    path = os.path.join(work_dir, f"sentetik-{n_events}-{seed}-{start:%Y%m%d}-{end:%Y%m%d}.txt")
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        write_catalog(tmp, model_chunks(n_events, start, end, seed))
+        os.replace(tmp, path)
+    return path
+
+def bench_catalog(name, path, stages=BENCH_ASAMALARI, repeat=BENCH_TEKRAR, workers=1, memory=True,
+                  precision_dates=BACKTEST_TARIH_SAYISI, log=None):
+    results, info = [], {'catalog': name, 'events': None}
+    def run(stage, func, required=False):
+        # Seçilmemiş aşama ölçülmez; sonraki aşamaların girdisiyse (parse, compile) bir kez çalışır.
+        if stage not in stages: return func() if required else None
+        result, stats = measure(func, repeat, memory)
+        results.append({**info, 'stage': stage, **stats})
+        if log: log(f"{name:>24} {stage:<10} min {stats['min_s']:9.3f} s  median {stats['median_s']:9.3f} s"
+                    + (f"  peak {stats['peak_mem_mb']:9.1f} MB" if stats['peak_mem_mb'] is not None else ""))
+        return result
+
+    df = run('parse', lambda: parse_catalog(path), required=True)
+    info['events'] = len(df)
+    for r in results: r['events'] = len(df)
+    if df.empty: return results
+    index = run('compile', lambda: compile_index(df), required=True)
+    lat, lon = BENCH_NOKTASI
+    date = df['Tarih'].max().to_pydatetime()
+    run('point', lambda: calculate_risk_engine(index, lat, lon, date))
+    run('timeline', lambda: calculate_risk_timeline(index, lat, lon, snapshot_dates(date)))
+    if not set(stages) & {'scan', 'recall', 'precision'}: return results
+
+    pool = EnginePool(index, workers)
+    try:
+        grid_lats, grid_lons = (a.ravel() for a in np.meshgrid(ULUSAL_IZGARA_ENLEM, ULUSAL_IZGARA_BOYLAM, indexing='ij'))
+        n_chunks = pool.max_workers * 4
+        if 'scan' in stages: run('scan', lambda: score_batch(pool, grid_lats, grid_lons, [date] * len(grid_lats), n_chunks))
+        if 'recall' in stages: run('recall', lambda: run_recall_backtest(pool, df, n_chunks))
+        if 'precision' in stages: run('precision', lambda: run_precision_backtest(pool, df, precision_dates, BACKTEST_TOHUM, n_chunks))
+    finally:
+        pool.close()
+    return results
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run_benchmarks(catalog_path, synthetic_sizes=(), stages=BENCH_ASAMALARI, repeat=BENCH_TEKRAR, workers=1, memory=True,
+                   precision_dates=BACKTEST_TARIH_SAYISI, work_dir=BENCH_KLASORU, seed=SENTETIK_TOHUM, log=None):
+    results = bench_catalog(os.path.basename(catalog_path), catalog_path, stages, repeat, workers, memory, precision_dates, log)
+    if synthetic_sizes:
+        # Sentetik kataloglar paketli kataloğun zaman aralığını kapsar (doğrulama testleri aynı tarihlerle çalışır).
+        source = parse_catalog(catalog_path)
+        span = (source['Tarih'].min(), source['Tarih'].max()) if not source.empty else (SENTETIK_BASLANGIC, SENTETIK_BITIS)
+        for size in synthetic_sizes:
+            if log: log(f"sentetik katalog: {size} olay")
+            path = synthetic_catalog(size, work_dir, seed, *span)
+            results += bench_catalog(f"sentetik-{size}", path, stages, repeat, workers, memory, precision_dates, log)
+    return {
+        'format': BENCH_FORMAT_SURUMU,
+        'meta': {
+            'tarih': datetime.datetime.now().isoformat(timespec='seconds'), 'commit': _git_commit(),
+            'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'platform': platform.platform(), 'cpu_count': os.cpu_count(), 'workers': workers, 'repeat': repeat,
+            'precision_dates': precision_dates, 'seed': seed,
+        },
+        'results': results,
+    }
+
+def compare_results(old, new):
+    # Aynı (katalog, aşama) için en iyi sürelerin oranı; oran < 1 yeni sürüm daha hızlı demektir.
+    before = {(r['catalog'], r['stage']): r for r in old['results']}
+    rows = []
+    for r in new['results']:
+        o = before.get((r['catalog'], r['stage']))
+        if o is None: continue
+        rows.append({'catalog': r['catalog'], 'stage': r['stage'], 'old_min_s': o['min_s'], 'new_min_s': r['min_s'],
+                     'ratio': r['min_s'] / o['min_s'] if o['min_s'] else None,
+                     'old_peak_mem_mb': o.get('peak_mem_mb'), 'new_peak_mem_mb': r.get('peak_mem_mb')})
+    return pd.DataFrame(rows, columns=['catalog', 'stage', 'old_min_s', 'new_min_s', 'ratio', 'old_peak_mem_mb', 'new_peak_mem_mb'])
+
+def write_results(results, path=None):
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if path:
+        with open(path, 'w', encoding='utf-8') as f: f.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
@@ -0,0 +1,510 @@
+import io
+import os
+import csv
+import json
+import shutil
+import hashlib
+import threading
+import collections
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pa_compute
+except ImportError: # pyarrow yoksa katalog pandas C okuyucusuyla okunur
+    pa = pa_csv = pa_compute = None
+
+from .spatial import SpatialIndex
+from .engine import build_neighbour_table, extend_neighbour_table
+
+# -----------------------------------------------------------------------------
+# KATALOG OKUMA VE DERLENMİŞ ÖNBELLEK
+# -----------------------------------------------------------------------------
+# Metin katalog ilk yüklemede ayrıştırılır ve sütunlar (DataFrame + mekansal
+# indeks dizileri) kaynağın yanındaki önbellek klasörüne yazılır. Sonraki açılışlar
+# dosyaları bellek eşlemeli (mmap) açar; ayrıştırma yapılmaz.
+# Anlık görüntü klasörü: df/ altında DataFrame sütunları ham ikili dosyalar olarak (yalnızca
+# sonlarına yazılır), her sürümün kendi alt klasöründe manifest, indeks dizileri ve kategori
+# etiketleri. Sona eklenen satırlar sütun dosyalarının sonuna yazılır; bir sürümün okuduğu ilk
+# 'rows' satır sonraki eklemelerde değişmez. Sürüm klasörü geçici adla yazılıp tek adımda yerine konur.
+KATALOG_ONBELLEK_KLASORU = '.sismiq_cache'
+KATALOG_FORMAT_SURUMU = 7
+# Sona eklenen satırlar doğrulanırken eski içeriğin son bu kadar baytı karşılaştırılır.
+EK_SINIR_BAYT = 1 << 20
+
+# version: aynı kaynak için her yeni derlemede bir artan sürüm numarası. Sürüm, önceki
+# sürümün sonuna satır eklenerek oluştuysa appended_from o sürümü, appended_since eklenen
+# en erken olayın zamanını (epoch saniye) verir; bu zamandan önceki tarihlerin skorları değişmez.
+CompiledCatalog = collections.namedtuple('CompiledCatalog', ['df', 'index', 'fingerprint', 'version', 'appended_from', 'appended_since'],
+                                         defaults=(None, 0, None, None))
+
+KATALOG_SUTUNLARI = ['No', 'Deprem Kodu', 'Olus tarihi', 'Olus zamani', 'Enlem', 'Boylam', 'Der(km)',
+                     'xM', 'MD', 'ML', 'Mw', 'Ms', 'Mb', 'Tip', 'Yer']
+BUYUKLUK_TURLERI = ['MD', 'ML', 'Mw', 'Ms', 'Mb']
+SAYISAL_SUTUNLAR = ['Enlem', 'Boylam', 'Der(km)', 'xM'] + BUYUKLUK_TURLERI
+# pandas'ın varsayılan eksik değer dizgileri; iki okuyucuya da açıkça verilir.
+EKSIK_DEGERLER = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                  '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+def _catalog_start(raw):
+    # Başlık satırı: "Olus tarihi" veya "Enlem" geçen ilk satır; yoksa dosyanın tamamı veridir.
+    hits = [pos for pos in (raw.find(b"Olus tarihi"), raw.find(b"Enlem")) if pos >= 0]
+    if not hits: return 0
+    header_end = raw.find(b'\n', min(hits))
+    return header_end + 1 if header_end >= 0 else len(raw)
+
+def _count_data_lines(raw, start):
+    buf = np.frombuffer(raw, dtype=np.uint8, offset=start)
+    ends = np.flatnonzero(buf == 10)
+    if len(buf) and buf[-1] != 10: ends = np.append(ends, len(buf))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    lengths = ends - starts
+    # '\r\n' satır sonlarında yalnızca '\r' kalan satırlar da boştur.
+    has_cr = lengths > 0
+    has_cr[has_cr] = buf[ends[has_cr] - 1] == 13
+    return int(np.count_nonzero(lengths - has_cr > 0))
+
+def _max_fields(raw, start, tab):
+    # Bir satırdaki en fazla alan sayısı: sekmeli dosyada sekme sayısı + 1, boşluklu dosyada
+    # boşluk olmayan parça sayısı. Okuyucuya bu kadar sütun verilir; uzun satır atılmaz.
+    buf = np.frombuffer(raw, dtype=np.uint8, offset=start)
+    if tab:
+        marks = np.flatnonzero(buf == 9)
+    else:
+        blank = (buf == 32) | (buf == 9) | (buf == 10) | (buf == 13)
+        marks = np.flatnonzero(~blank & np.concatenate(([True], blank[:-1])))
+    ends = np.append(np.flatnonzero(buf == 10), len(buf))
+    per_line = np.diff(np.searchsorted(marks, ends), prepend=0)
+    return int(per_line.max()) + tab
+
+def _join_place(fields, parts):
+    # Taşan 'Yer' parçaları tek boşlukla birleştirilir.
+    return fields[parts[0]].str.cat([fields[c] for c in parts[1:]], sep=' ', na_rep='').str.rstrip().astype(object)
+
+def _read_fields(raw, start, encoding):
+    stream = io.BytesIO(raw); stream.seek(start)
+    text_columns = {'Olus tarihi': object, 'Olus zamani': object, 'Tip': object, 'Yer': object}
+    common = dict(header=None, engine='c', quoting=csv.QUOTE_NONE, encoding=encoding,
+                  na_values=EKSIK_DEGERLER, keep_default_na=False)
+    tab = _is_tab_separated(raw, start)
+    # 'Yer' içinde ayırıcı geçen satırların fazla alanları ek sütunlara okunup 'Yer'e katılır.
+    extra = [f"Yer_{i}" for i in range(1, _max_fields(raw, start, tab) - len(KATALOG_SUTUNLARI) + 1)]
+    if tab:
+        fields = pd.read_csv(stream, sep='\t', names=KATALOG_SUTUNLARI + extra, usecols=KATALOG_SUTUNLARI[1:] + extra,
+                             dtype={**text_columns, **{c: object for c in extra}}, **common)
+        if extra:
+            overflow = fields[extra].notna().any(axis=1)
+            fields['Yer'] = fields['Yer'].where(~overflow, _join_place(fields, ['Yer'] + extra))
+        return fields.drop(columns=extra)
+    fields = pd.read_csv(stream, sep=r'\s+', names=KATALOG_SUTUNLARI + extra,
+                         dtype={**text_columns, **{c: object for c in extra}}, **common)
+    fields['Yer'] = _join_place(fields, ['Yer'] + extra)
+    return fields.drop(columns=['No'] + extra)
+
+def _is_tab_separated(raw, start):
+    return b'\t' in raw[start:start + (1 << 16)]
+
+def _numeric(column, dtype=np.float64):
+    return pd.to_numeric(column, errors='coerce').to_numpy(dtype=dtype, na_value=np.nan)
+
+def _text_times(dates, times):
+    # Eski ayrıştırıcının kuralı: "yyyy.aa.gg" + " " + saatin ilk 8 karakteri; okunamayan NaT.
+    return pd.to_datetime(dates.astype(str) + ' ' + times.astype(str).str.slice(0, 8),
+                          format="%Y.%m.%d %H:%M:%S", errors='coerce').to_numpy()
+
+def _read_columns_pandas(raw, start):
+    for encoding in ('utf-8', 'cp1254'):
+        try:
+            fields = _read_fields(raw, start, encoding)
+            break
+        except UnicodeDecodeError: continue
+    else:
+        return None
+    return _count_data_lines(raw, start), {
+        'Deprem Kodu': pd.to_numeric(fields['Deprem Kodu'], errors='coerce').fillna(0).to_numpy(dtype=np.int64),
+        'Tarih': _text_times(fields['Olus tarihi'], fields['Olus zamani']),
+        **{c: _numeric(fields[c]) for c in SAYISAL_SUTUNLAR},
+        'ML var': fields['ML'].notna().to_numpy(),
+        'Tip': pd.Categorical(fields['Tip'].to_numpy()), 'Yer': pd.Categorical(fields['Yer'].to_numpy()),
+    }
+
+# --- HIZLI YOL (pyarrow) ---
+# Sekmeyle ayrılmış katalog arrow'un CSV okuyucusuyla doğrudan tipli sütunlara okunur
+# (çekirdek sayısı kadar iş parçacığıyla); hiçbir alan için Python nesnesi oluşmaz. Tarih
+# ve saat, dize sütununun bayt tamponu üzerinde sabit genişlikli rakam aritmetiğiyle çözülür.
+# Alan sayısı tutmayan satır, sayıya çevrilemeyen değer veya UTF-8 olmayan metin görülürse
+# dosya pandas yoluna bırakılır; iki yolun sonucu aynıdır. pyarrow streamlit ile gelir.
+def _fixed_bytes(column, width):
+    # Dize sütunu -> (n, width) bayt matrisi ve en az width karakteri olan (boş olmayan) satırlar.
+    arr = column.combine_chunks()
+    buffers = arr.buffers()
+    offsets = np.frombuffer(buffers[1], dtype=np.int32, count=len(arr) + 1, offset=arr.offset * 4)
+    data = np.frombuffer(buffers[2], dtype=np.uint8) if buffers[2] is not None else np.zeros(1, dtype=np.uint8)
+    lengths = np.diff(offsets)
+    ok = lengths >= width
+    if arr.null_count: ok &= arr.is_valid().to_numpy(zero_copy_only=False)
+    if len(arr) and ok.all() and (lengths == lengths[0]).all():
+        # Olağan durum: tüm değerler aynı uzunlukta, tampon kopyalanmadan yeniden biçimlenir.
+        return data[offsets[0]:offsets[-1]].reshape(len(arr), lengths[0])[:, :width], ok
+    positions = np.where(ok, offsets[:-1], 0)[:, None] + np.arange(width)
+    return data[np.minimum(positions, len(data) - 1)], ok
+
+def _digits(m, cols):
+    value = m[:, cols[0]].astype(np.int64)
+    for c in cols[1:]: value = value * 10 + m[:, c]
+    return value
+
+def _arrow_times(dates, times):
+    d, d_ok = _fixed_bytes(dates, 10)
+    t, t_ok = _fixed_bytes(times, 8)
+    d_num, t_num = d - 48, t - 48 # rakam olmayan baytlar 9'dan büyük olur
+    date_digits, time_digits = [0, 1, 2, 3, 5, 6, 8, 9], [0, 1, 3, 4, 6, 7]
+    year, month, day = _digits(d_num, [0, 1, 2, 3]), _digits(d_num, [5, 6]), _digits(d_num, [8, 9])
+    hour, minute, second = _digits(t_num, [0, 1]), _digits(t_num, [3, 4]), _digits(t_num, [6, 7])
+    regular = (d_ok & t_ok & (d[:, 4] == 46) & (d[:, 7] == 46) & (t[:, 2] == 58) & (t[:, 5] == 58)
+               & (d_num[:, date_digits] <= 9).all(axis=1) & (t_num[:, time_digits] <= 9).all(axis=1)
+               & (year >= 1000) & (month >= 1) & (month <= 12) & (day >= 1) & (hour < 24) & (minute < 60) & (second < 60))
+    months = np.where(regular, (year - 1970) * 12 + month - 1, 0).astype('datetime64[M]')
+    regular &= day <= ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+    tarih = (months.astype('datetime64[D]') + (day - 1)).astype('datetime64[us]') + (hour * 3600 + minute * 60 + second) * 10**6
+    tarih[~regular] = np.datetime64('NaT')
+    # Biçimi tutmayan satırlar (ör. tek haneli ay) pandas kuralıyla çözülür.
+    rest = np.flatnonzero(~regular)
+    if len(rest):
+        tarih[rest] = _text_times(pd.Series(dates.take(rest).to_pylist(), dtype=object), pd.Series(times.take(rest).to_pylist(), dtype=object))
+    return tarih
+
+def _arrow_categorical(column):
+    # Parça sözlükleri, pd.Categorical'daki gibi sıralı tek kategori listesinde birleştirilir; boş değer kodu -1.
+    chunks = column.chunks
+    values = pa.concat_arrays([chunk.dictionary for chunk in chunks])
+    categories = values.unique()
+    categories = categories.take(pa_compute.array_sort_indices(categories))
+    codes = [np.append(pa_compute.index_in(chunk.dictionary, value_set=categories).to_numpy(zero_copy_only=False), -1)
+             [chunk.indices.fill_null(-1).to_numpy()] for chunk in chunks]
+    return pd.Categorical.from_codes(np.concatenate(codes).astype(np.int32), categories=pd.Index(categories.to_pandas()))
+
+def _read_columns_arrow(raw, start):
+    dictionary = pa.dictionary(pa.int32(), pa.string())
+    types = {'Deprem Kodu': pa.int64(), 'Olus tarihi': pa.string(), 'Olus zamani': pa.string(), 'Tip': dictionary, 'Yer': dictionary,
+             **{c: pa.float64() for c in SAYISAL_SUTUNLAR}}
+    irregular = []
+    try:
+        table = pa_csv.read_csv(
+            pa.py_buffer(memoryview(raw)[start:]),
+            read_options=pa_csv.ReadOptions(column_names=KATALOG_SUTUNLARI),
+            parse_options=pa_csv.ParseOptions(delimiter='\t', quote_char=False, invalid_row_handler=lambda row: irregular.append(row) or 'skip'),
+            # pandas'ın varsayılan eksik değer dizgileri ("", "NA", "nan"...) iki yolda da boş sayılır.
+            convert_options=pa_csv.ConvertOptions(include_columns=KATALOG_SUTUNLARI[1:], column_types=types,
+                                                  null_values=EKSIK_DEGERLER, strings_can_be_null=True))
+    except pa.ArrowException:
+        return None
+    if irregular or table.num_rows == 0: return None
+    return table.num_rows, {
+        'Deprem Kodu': table['Deprem Kodu'].fill_null(0).to_numpy(),
+        'Tarih': _arrow_times(table['Olus tarihi'], table['Olus zamani']),
+        **{c: table[c].to_numpy() for c in SAYISAL_SUTUNLAR},
+        'ML var': table['ML'].is_valid().to_numpy(),
+        'Tip': _arrow_categorical(table['Tip']), 'Yer': _arrow_categorical(table['Yer']),
+    }
+
+def parse_catalog(filepath):
+    try:
+        with open(filepath, 'rb') as f: raw = f.read()
+    except OSError:
+        return pd.DataFrame()
+    return parse_catalog_bytes(raw)
+
+def parse_catalog_bytes(raw, has_header=True):
+    # Katalog tek seferde sütunlara ayrılır (pyarrow varsa hızlı yol, yoksa pandas C okuyucusu);
+    # satır satır Python döngüsü yoktur. Okunamayan veri satırlarının sayısı df.attrs['reddedilen_satir'] içindedir.
+    start = _catalog_start(raw) if has_header else 0
+    # Okunan satır sayısı ve sütunlar; hızlı yolda her veri satırı bir tablo satırıdır.
+    parsed = _read_columns_arrow(raw, start) if pa_csv is not None and _is_tab_separated(raw, start) else None
+    if parsed is None: parsed = _read_columns_pandas(raw, start) if _count_data_lines(raw, start) else None
+    if parsed is None: return pd.DataFrame()
+    data_lines, columns = parsed
+
+    lat, lon = columns['Enlem'], columns['Boylam']
+    xm, ml = columns['xM'], columns['ML']
+    mag = np.where(xm == 0.0, ml, xm)
+    tarih = columns['Tarih'].astype('datetime64[us]', copy=False)
+    # Eski ayrıştırıcı ile aynı kural: ML'ye kadar tüm alanlar bulunmalı, konum ve büyüklük sayı olmalı.
+    valid = ~np.isnan(lat) & ~np.isnan(lon) & ~np.isnan(mag) & columns['ML var'] & ~np.isnat(tarih)
+    if valid.all(): valid = slice(None) # olağan durum: kopyasız
+
+    category = lambda c: columns[c] if isinstance(valid, slice) else columns[c][valid].remove_unused_categories()
+    df = pd.DataFrame({
+        'Deprem Kodu': columns['Deprem Kodu'][valid],
+        'Tarih': tarih[valid],
+        'Enlem': lat[valid], 'Boylam': lon[valid],
+        'Derinlik': columns['Der(km)'][valid].astype(np.float32),
+        'Mag': mag[valid],
+        **{m: columns[m][valid].astype(np.float32) for m in BUYUKLUK_TURLERI},
+        'Tip': category('Tip'), 'Yer': category('Yer'),
+    })
+    return finalize_catalog(df, data_lines - len(df))
+
+def finalize_catalog(df, rejected=0):
+    # Her kaynağın ortak son adımı: zaman sırası, okunamayan satır sayısı ve Dolunay bayrağı.
+    # Katalog zaman sıralı tutulur; tarih pencereleri ikili aramayla ardışık dilim olur.
+    df = df.sort_values('Tarih', kind='stable', ignore_index=True)
+    df.attrs['reddedilen_satir'] = rejected
+
+    ref_new_moon = pd.Timestamp("1988-12-09 01:39:00")
+    days = (df['Tarih'] - ref_new_moon).dt.total_seconds() / 86400.0
+    current_phase_day = days % 29.53059
+    df['Dolunay'] = ((current_phase_day >= 13.5) & (current_phase_day <= 16.5)).astype(np.int8)
+    return df
+
+def append_events(df, new_rows):
+    # Yeni olaylar mevcut sütunların sonuna eklenir; zaman sırası bozulduysa kararlı sıralanır.
+    columns = {}
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            columns[c] = union_categoricals([df[c], new_rows[c]], ignore_order=True)
+        else:
+            columns[c] = np.concatenate([df[c].to_numpy(), new_rows[c].to_numpy().astype(df[c].dtype)])
+    merged = pd.DataFrame(columns)
+    if not merged['Tarih'].is_monotonic_increasing:
+        merged = merged.sort_values('Tarih', kind='stable', ignore_index=True)
+    merged.attrs['reddedilen_satir'] = df.attrs.get('reddedilen_satir', 0) + new_rows.attrs.get('reddedilen_satir', 0)
+    return merged
+
+def compile_index(df):
+    index = SpatialIndex(df)
+    # Sabit ulusal ızgaranın komşu tablosu da katalog sürümüyle birlikte derlenip saklanır.
+    index.neighbours = build_neighbour_table(index)
+    return index
+
+def file_fingerprint(filepath):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''): digest.update(block)
+    return digest.hexdigest()
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f: return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f: json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _column_path(snapshot_dir, column):
+    return os.path.join(snapshot_dir, 'df', f"{column}.bin")
+
+def _column_values(series):
+    # Kategorik sütunlar mmap ile açılabilsin diye kod dizisi + sabit genişlikli etiketler olarak yazılır.
+    return series.cat.codes.to_numpy() if isinstance(series.dtype, pd.CategoricalDtype) else series.to_numpy()
+
+def _write_version(snapshot_dir, fingerprint, rows, dtypes, categories, attrs, index):
+    version_dir = os.path.join(snapshot_dir, fingerprint)
+    tmp_dir = f"{version_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(os.path.join(tmp_dir, 'index')); os.makedirs(os.path.join(tmp_dir, 'categories'))
+    for column, labels in categories.items():
+        np.save(os.path.join(tmp_dir, 'categories', f"{column}.npy"), labels.to_numpy(dtype=str))
+    arrays, meta = index.to_arrays()
+    for name, arr in arrays.items():
+        np.save(os.path.join(tmp_dir, 'index', f"{name}.npy"), arr)
+    _write_json(os.path.join(tmp_dir, 'manifest.json'), {
+        'format': KATALOG_FORMAT_SURUMU, 'rows': rows, 'df_columns': list(dtypes),
+        'dtypes': {c: dtype.str for c, dtype in dtypes.items()}, 'categorical': list(categories),
+        'index_arrays': list(arrays),
+        'attrs': attrs,
+        'index_meta': {k: v.item() if isinstance(v, np.generic) else v for k, v in meta.items()},
+    })
+    try: os.replace(tmp_dir, version_dir)
+    except OSError: shutil.rmtree(tmp_dir, ignore_errors=True) # aynı sürümü başka bir süreç yazdı
+
+def write_snapshot(snapshot_dir, df, index, fingerprint):
+    tmp_dir = f"{snapshot_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(os.path.join(tmp_dir, 'df'))
+    for column in df.columns: _column_values(df[column]).tofile(_column_path(tmp_dir, column))
+    _write_version(tmp_dir, fingerprint, len(df), {c: _column_values(df[c]).dtype for c in df.columns},
+                   {c: df[c].cat.categories for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)}, df.attrs, index)
+    try: os.replace(tmp_dir, snapshot_dir)
+    except OSError:
+        # Başka bir süreç aynı anlık görüntüyü önce yazdıysa onunkini kullan; eski biçimdeyse değiştir.
+        existing = _read_json(os.path.join(snapshot_dir, fingerprint, 'manifest.json'))
+        if existing and existing.get('format') == KATALOG_FORMAT_SURUMU:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+        os.replace(tmp_dir, snapshot_dir)
+
+def append_snapshot(snapshot_dir, previous, new_rows, index, fingerprint):
+    # Yeni satırlar önceki sürümün satırlarının hemen arkasına yazılır (yarım kalmış bir eklemenin
+    # artığı varsa üzerine); dosyalar hiç kısaltılmaz, açık eşlemeler geçerli kalır.
+    n_old = len(previous.df)
+    dtypes, categories, tails = {}, {}, {}
+    for column in previous.df.columns:
+        old = previous.df[column]
+        dtypes[column] = _column_values(old).dtype
+        if isinstance(old.dtype, pd.CategoricalDtype):
+            # Yeni etiketler eskilerin arkasına eklenir (union_categoricals sırası); eski kodlar değişmez.
+            categories[column] = labels = old.cat.categories.append(new_rows[column].cat.categories.difference(old.cat.categories, sort=False))
+            if len(labels) >= np.iinfo(dtypes[column]).max: return False # kod tipi büyümeli: tam yazım
+            tails[column] = labels.get_indexer(new_rows[column].astype(object)).astype(dtypes[column])
+        else:
+            tails[column] = new_rows[column].to_numpy().astype(dtypes[column])
+    for column, values in tails.items():
+        with open(_column_path(snapshot_dir, column), 'r+b') as f:
+            f.seek(n_old * values.dtype.itemsize); f.write(values.tobytes())
+    attrs = {**previous.df.attrs, 'reddedilen_satir': previous.df.attrs.get('reddedilen_satir', 0) + new_rows.attrs.get('reddedilen_satir', 0)}
+    _write_version(snapshot_dir, fingerprint, n_old + len(new_rows), dtypes, categories, attrs, index)
+    return True
+
+def _read_appended_tail(filepath, pointer, size):
+    # Önceki derlemenin okuduğu bölüm yerinde duruyorsa (sınır baytları aynı) yalnızca
+    # sonrası yenidir. Yarım yazılmış son satır bir sonraki okumaya bırakılır.
+    old_size = pointer['size']
+    if size <= old_size or not pointer.get('boundary'): return None
+    with open(filepath, 'rb') as f:
+        f.seek(max(old_size - EK_SINIR_BAYT, 0))
+        boundary = f.read(old_size - f.tell())
+        if hashlib.blake2b(boundary, digest_size=16).hexdigest() != pointer['boundary']: return None
+        tail = f.read(size - old_size)
+    return tail[:tail.rfind(b'\n') + 1]
+
+def _boundary_digest(filepath, size):
+    with open(filepath, 'rb') as f:
+        f.seek(max(size - EK_SINIR_BAYT, 0))
+        boundary = f.read(size - f.tell())
+    # Son satır tamamlanmadıysa sona ekleme yoluna girilmez; tam derleme yapılır.
+    return hashlib.blake2b(boundary, digest_size=16).hexdigest() if boundary.endswith(b'\n') else None
+
+def open_snapshot(snapshot_dir, fingerprint):
+    version_dir = os.path.join(snapshot_dir, fingerprint)
+    manifest = _read_json(os.path.join(version_dir, 'manifest.json'))
+    if not manifest or manifest.get('format') != KATALOG_FORMAT_SURUMU: return None
+    load = lambda *parts: np.load(os.path.join(version_dir, *parts), mmap_mode='r')
+    try:
+        # Sütun dosyaları sonraki sürümlerin satırlarını da taşıyabilir; bu sürüm ilk 'rows' satırı görür.
+        columns = {c: np.memmap(_column_path(snapshot_dir, c), dtype=np.dtype(manifest['dtypes'][c]), mode='r', shape=(manifest['rows'],))
+                   for c in manifest['df_columns']}
+        for c in manifest['categorical']:
+            columns[c] = pd.Categorical.from_codes(columns[c], categories=load('categories', f"{c}.npy"))
+        arrays = {name: load('index', f"{name}.npy") for name in manifest['index_arrays']}
+    except (OSError, ValueError):
+        return None
+    df = pd.DataFrame(columns, copy=False)
+    df.attrs.update(manifest['attrs'])
+    return CompiledCatalog(df, SpatialIndex.from_arrays(arrays, manifest['index_meta']), fingerprint)
+
+def catalog_cache_dir(filepath):
+    return os.path.join(os.path.dirname(os.path.abspath(filepath)), KATALOG_ONBELLEK_KLASORU)
+
+def _compile_snapshot(cache_dir, snapshot_name, df, fingerprint):
+    index = compile_index(df)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        write_snapshot(os.path.join(cache_dir, snapshot_name), df, index, fingerprint)
+    except OSError:
+        return CompiledCatalog(df.reset_index(drop=True), index, fingerprint)
+    return open_snapshot(os.path.join(cache_dir, snapshot_name), fingerprint)
+
+def _append_to_snapshot(cache_dir, snapshot_name, previous, new_rows, fingerprint):
+    # Yeni olayların hepsi eskilerden sonraysa indeks ve komşu tablosu derlenmeden güncellenir
+    # (bkz. SpatialIndex.appended), sütun dosyalarına yalnızca yeni satırlar yazılır. Değilse None.
+    appended = previous.index.appended(new_rows)
+    if appended is None: return None
+    index, old_positions, positions = appended
+    if previous.index.neighbours is not None:
+        index.neighbours = extend_neighbour_table(index, previous.index.neighbours, old_positions, positions)
+    snapshot_dir = os.path.join(cache_dir, snapshot_name)
+    try:
+        if not append_snapshot(snapshot_dir, previous, new_rows, index, fingerprint): return None
+    except OSError:
+        return CompiledCatalog(append_events(previous.df, new_rows), index, fingerprint)
+    return open_snapshot(snapshot_dir, fingerprint)
+
+def open_compiled_catalog(filepath, cache_dir=None):
+    # Hızlı yol: boyut ve mtime değişmediyse önbellek doğrudan açılır. Dosyanın sonuna
+    # satır eklendiyse yalnızca yeni kuyruk ayrıştırılıp önceki sütunlara eklenir. Aksi
+    # halde içerik özeti hesaplanır; aynı içerik için önceden derlenmiş görüntü yeniden kullanılır.
+    try: stat = os.stat(filepath)
+    except OSError: return CompiledCatalog(pd.DataFrame(), None)
+    cache_dir = cache_dir or catalog_cache_dir(filepath)
+    name = os.path.basename(filepath)
+    pointer_path = os.path.join(cache_dir, f"{name}.json")
+
+    pointer = _read_json(pointer_path)
+    if not pointer or pointer.get('format') != KATALOG_FORMAT_SURUMU: pointer = None
+    previous = open_snapshot(os.path.join(cache_dir, pointer['snapshot']), pointer['fingerprint']) if pointer else None
+    if previous is not None:
+        previous = previous._replace(version=pointer['version'], appended_from=pointer.get('appended_from'),
+                                     appended_since=pointer.get('appended_since'))
+        if pointer['size'] == stat.st_size and pointer['mtime_ns'] == stat.st_mtime_ns: return previous
+
+    tail = _read_appended_tail(filepath, pointer, stat.st_size) if previous is not None else None
+    if tail is not None:
+        if not tail: return previous # yalnızca yarım satır eklenmiş
+        size = pointer['size'] + len(tail)
+        new_rows = parse_catalog_bytes(tail, has_header=False)
+        if new_rows.empty:
+            # Eklenen satırların hiçbiri okunamadı: katalog aynı, yalnızca okunan boyut ilerler.
+            catalog, snapshot_name = previous, pointer['snapshot']
+        else:
+            fingerprint = hashlib.blake2b(pointer['fingerprint'].encode('ascii') + tail, digest_size=16).hexdigest()
+            snapshot_name = pointer['snapshot']
+            catalog = _append_to_snapshot(cache_dir, snapshot_name, previous, new_rows, fingerprint)
+            if catalog is None:
+                # Eklenen olaylar eskilerin arasına giriyor: birleşik katalog baştan derlenir.
+                snapshot_name = f"{name}-{fingerprint}"
+                catalog = _compile_snapshot(cache_dir, snapshot_name, append_events(previous.df, new_rows), fingerprint)
+            catalog = catalog._replace(version=previous.version + 1, appended_from=previous.version,
+                                       appended_since=int(new_rows['Tarih'].min().value // 10**9))
+    else:
+        size, fingerprint = stat.st_size, file_fingerprint(filepath)
+        snapshot_name = f"{name}-{fingerprint}"
+        catalog = open_snapshot(os.path.join(cache_dir, snapshot_name), fingerprint)
+        if catalog is None:
+            df = parse_catalog(filepath)
+            if df.empty: return CompiledCatalog(df, None, fingerprint)
+            catalog = _compile_snapshot(cache_dir, snapshot_name, df, fingerprint)
+        catalog = catalog._replace(version=(pointer['version'] if pointer else 0) + 1)
+
+    try:
+        _write_json(pointer_path, {'format': KATALOG_FORMAT_SURUMU, 'size': size,
+                                   'mtime_ns': stat.st_mtime_ns if size == stat.st_size else None,
+                                   'fingerprint': catalog.fingerprint, 'snapshot': snapshot_name,
+                                   'boundary': _boundary_digest(filepath, size), 'version': catalog.version,
+                                   'appended_from': catalog.appended_from, 'appended_since': catalog.appended_since})
+    except OSError:
+        return catalog
+    # Aynı kaynağın eski görüntüleri ve eski sürüm klasörleri artık kullanılmaz.
+    for entry in os.listdir(cache_dir):
+        if entry.startswith(f"{name}-") and entry != snapshot_name and not entry.endswith('.tmp'):
+            shutil.rmtree(os.path.join(cache_dir, entry), ignore_errors=True)
+    snapshot_dir = os.path.join(cache_dir, snapshot_name)
+    for entry in os.listdir(snapshot_dir) if os.path.isdir(snapshot_dir) else []:
+        if entry not in ('df', catalog.fingerprint) and not entry.endswith('.tmp'):
+            shutil.rmtree(os.path.join(snapshot_dir, entry), ignore_errors=True)
+    return catalog
+
+class LiveCatalog:
+    # Kaynak dosyayı izleyen, süreç boyunca paylaşılan katalog: her çağrıda yalnızca
+    # os.stat yapılır; dosya değiştiyse open_compiled_catalog yeni sürümü derler/açar.
+    def __init__(self, filepath, cache_dir=None):
+        self.filepath, self.cache_dir = filepath, cache_dir
+        self.catalog, self._stat = None, None
+        self._lock = threading.Lock()
+
+    def current(self):
+        try: stat = os.stat(self.filepath); key = (stat.st_size, stat.st_mtime_ns)
+        except OSError: key = None
+        if self.catalog is not None and key == self._stat: return self.catalog
+        with self._lock:
+            if self.catalog is None or key != self._stat:
+                self.catalog = open_compiled_catalog(self.filepath, self.cache_dir)
+                self._stat = key
+        return self.catalog
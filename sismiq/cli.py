@@ -0,0 +1,281 @@
+import os
+import sys
+import json
+import argparse
+import datetime
+import itertools
+import numpy as np
+import pandas as pd
+
+from .catalog import open_compiled_catalog, parse_catalog
+from .parallel import EnginePool
+from .scan import score_batch, district_scan, province_summary
+from .backtest import BACKTEST_TARIH_SAYISI
+from .synthetic import (SENTETIK_PARCA_BOYUTU, SENTETIK_TOHUM, SENTETIK_BASLANGIC, SENTETIK_BITIS, SENTETIK_B_DEGERI,
+                        SENTETIK_FAY_ORANI, write_catalog, model_chunks, resampled_chunks)
+from .bench import BENCH_ASAMALARI, BENCH_TEKRAR, BENCH_KLASORU, parse_sizes, run_benchmarks, compare_results, write_results
+from .merge import TEKRAR_ZAMAN_S, TEKRAR_MESAFE_KM, TEKRAR_BUYUKLUK_FARKI, parse_source_spec, merge_catalogs, write_merged_catalog
+from .service import SERVIS_ADRESI, SERVIS_PORTU, TOPLAMA_PENCERESI_MS, EN_BUYUK_PARTI, run_service
+
+# -----------------------------------------------------------------------------
+# KOMUT SATIRI: python -m sismiq score siteler.csv > skorlar.csv
+# -----------------------------------------------------------------------------
+# Girdi satırları partiler halinde okunur, puanlanır ve hemen stdout'a yazılır;
+# dosya ne kadar büyük olursa olsun bellekte yalnızca bir parti tutulur.
+VARSAYILAN_KATALOG = 'deprem.txt'
+TOPLU_PARTI_BOYUTU = 5000
+GIRDI_SUTUNLARI = {
+    'lat': ('lat', 'latitude', 'enlem'),
+    'lon': ('lon', 'lng', 'longitude', 'boylam'),
+    'date': ('date', 'tarih', 'time', 'zaman'),
+}
+
+def detect_format(path, fmt=None):
+    if fmt: return fmt
+    return 'jsonl' if str(path).lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+def read_batches(source, fmt, batch_size=TOPLU_PARTI_BOYUTU):
+    if fmt == 'csv':
+        yield from pd.read_csv(source, chunksize=batch_size)
+        return
+    rows = (json.loads(line) for line in source if line.strip())
+    while batch := list(itertools.islice(rows, batch_size)):
+        yield pd.DataFrame.from_records(batch)
+
+def resolve_columns(columns, required=True):
+    # Her anahtar için partide bulunan tüm eş adlar, GIRDI_SUTUNLARI sırasıyla. JSONL satırları farklı
+    # eş adlar kullanabildiği için her partide yeniden çözülür; satır başına ilk dolu eş ad kullanılır.
+    lowered = [(str(c).strip().lower(), c) for c in columns]
+    found = {key: [c for n in names for name, c in lowered if name == n] for key, names in GIRDI_SUTUNLARI.items()}
+    missing = [key for key in ('lat', 'lon') if not found[key]]
+    if required and missing: raise ValueError(f"girdide {' / '.join(GIRDI_SUTUNLARI[missing[0]])} sütunu yok")
+    return found
+
+def first_present(batch, names):
+    # Satır başına ilk dolu eş ad (örn. lat boşsa enlem); hiçbiri yoksa None.
+    if not names: return None
+    values = batch[names[0]]
+    for name in names[1:]: values = values.where(values.notna(), batch[name])
+    return values
+
+def parse_rows(batch, columns, default_date):
+    # Geçersiz enlem/boylam/tarih içeren satırlar atlanır; kalan satırların maskesi döner.
+    # Partide hiç enlem/boylam sütunu yoksa satırları geçersizdir; tarih yoksa --date kullanılır.
+    lats, lons = (np.full(len(batch), np.nan) if values is None else pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64)
+                  for values in (first_present(batch, columns['lat']), first_present(batch, columns['lon'])))
+    raw = first_present(batch, columns['date'])
+    if raw is None: dates = pd.DatetimeIndex([default_date] * len(batch))
+    else:
+        dates = pd.DatetimeIndex(pd.to_datetime(raw, errors='coerce', format='mixed'))
+        if dates.tz is not None: dates = dates.tz_localize(None)
+        dates = dates.where(raw.notna(), pd.Timestamp(default_date))
+    valid = (np.abs(lats) <= 90) & (np.abs(lons) <= 180) & dates.notna()
+    return valid, lats, lons, dates
+
+def write_batch(out, fmt, frame, first):
+    frame = frame.assign(Tarih=frame['Tarih'].dt.strftime('%Y-%m-%d %H:%M:%S'))
+    if fmt == 'csv':
+        frame.to_csv(out, index=False, header=first)
+    else:
+        for record in frame.astype(object).where(frame.notna(), None).to_dict('records'):
+            out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    out.flush()
+
+def score_command(args):
+    in_fmt = detect_format(args.input, args.input_format)
+    out_fmt = args.format or in_fmt
+    default_date = pd.Timestamp(args.date) if args.date else pd.Timestamp(datetime.date.today())
+    catalog = open_compiled_catalog(args.catalog, args.cache_dir)
+    if catalog is None or catalog.df.empty:
+        print(f"sismiq: katalog okunamadı: {args.catalog}", file=sys.stderr); return 2
+    try:
+        source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8', newline='' if in_fmt == 'csv' else None)
+    except OSError as e:
+        print(f"sismiq: girdi açılamadı: {e}", file=sys.stderr); return 2
+    pool = EnginePool(catalog.index, args.workers)
+    scored = skipped = 0
+    try:
+        # Aktarılan sütunlar ilk partiden sabitlenir (CSV başlığı bir kez yazılır); sonraki partiler
+        # bu sütunlara göre hizalanır: eksikler boş kalır, yeni anahtarlar atılır.
+        passthrough_columns = None
+        for batch in read_batches(source, in_fmt, args.batch_size):
+            columns = resolve_columns(batch.columns, required=passthrough_columns is None)
+            valid, lats, lons, dates = parse_rows(batch, columns, default_date)
+            passthrough = batch.drop(columns=[c for names in columns.values() for c in names]).iloc[valid].reset_index(drop=True)
+            first = passthrough_columns is None
+            if first: passthrough_columns = passthrough.columns
+            else: passthrough = passthrough.reindex(columns=passthrough_columns)
+            frame = score_batch(pool, lats[valid], lons[valid], dates[valid], pool.max_workers)
+            write_batch(sys.stdout, out_fmt, pd.concat([passthrough, frame], axis=1), first=first)
+            scored += int(valid.sum()); skipped += int((~valid).sum())
+    except ValueError as e:
+        print(f"sismiq: {e}", file=sys.stderr); return 2
+    finally:
+        if source is not sys.stdin: source.close()
+        pool.close()
+    if skipped: print(f"sismiq: {skipped} satır geçersiz enlem/boylam/tarih nedeniyle atlandı.", file=sys.stderr)
+    if args.verbose: print(f"sismiq: {scored} nokta puanlandı (katalog sürüm {catalog.version}, {len(catalog.df)} deprem).", file=sys.stderr)
+    return 0
+
+def districts_command(args):
+    catalog = open_compiled_catalog(args.catalog, args.cache_dir)
+    if catalog is None or catalog.df.empty:
+        print(f"sismiq: katalog okunamadı: {args.catalog}", file=sys.stderr); return 2
+    date = pd.Timestamp(args.date or datetime.date.today()).to_pydatetime()
+    pool = EnginePool(catalog.index, args.workers)
+    try: ranked = district_scan(pool, date)
+    finally: pool.close()
+    if args.provinces: ranked = province_summary(ranked)
+    if args.top: ranked = ranked.head(args.top)
+    if args.format == 'parquet':
+        if not args.output:
+            print("sismiq: parquet çıktısı için --output gerekli.", file=sys.stderr); return 2
+        try: ranked.to_parquet(args.output, index=False)
+        except ImportError as e:
+            print(f"sismiq: parquet yazılamadı: {e}", file=sys.stderr); return 2
+        return 0
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        if 'Tarih' in ranked: write_batch(out, args.format, ranked, first=True)
+        elif args.format == 'csv': ranked.to_csv(out, index=False)
+        else:
+            for record in ranked.to_dict('records'): out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    finally:
+        if out is not sys.stdout: out.close()
+    return 0
+
+def bench_command(args):
+    unknown = set(args.stages) - set(BENCH_ASAMALARI)
+    if unknown:
+        print(f"sismiq: bilinmeyen aşama: {', '.join(sorted(unknown))} (geçerli: {', '.join(BENCH_ASAMALARI)})", file=sys.stderr); return 2
+    try: sizes = parse_sizes(args.synthetic)
+    except (ValueError, KeyError):
+        print(f"sismiq: geçersiz --synthetic: {args.synthetic}", file=sys.stderr); return 2
+    log = lambda message: print(message, file=sys.stderr, flush=True)
+    results = run_benchmarks(args.catalog, sizes, args.stages, args.repeat, args.workers, not args.no_memory,
+                             args.precision_dates, args.work_dir, log=log)
+    write_results(results, args.output)
+    if args.compare:
+        try:
+            with open(args.compare, encoding='utf-8') as f: old = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"sismiq: karşılaştırma dosyası okunamadı: {e}", file=sys.stderr); return 2
+        print(compare_results(old, results).to_string(index=False, float_format=lambda v: f"{v:.3f}"), file=sys.stderr)
+    return 0
+
+def synth_command(args):
+    try:
+        if args.source == 'resample':
+            source = parse_catalog(args.catalog)
+            if source.empty:
+                print(f"sismiq: katalog okunamadı: {args.catalog}", file=sys.stderr); return 2
+            chunks = resampled_chunks(source, args.events, args.seed, args.chunk_size)
+        else:
+            chunks = model_chunks(args.events, pd.Timestamp(args.start), pd.Timestamp(args.end), args.seed, args.b_value,
+                                  args.fault_fraction, chunk_size=args.chunk_size)
+        n = write_catalog(args.output, chunks)
+    except (OSError, ValueError) as e:
+        print(f"sismiq: {e}", file=sys.stderr); return 2
+    if args.verbose: print(f"sismiq: {n} olay yazıldı: {args.output}", file=sys.stderr)
+    return 0
+
+def merge_command(args):
+    log = (lambda message: print(f"sismiq: {message}", file=sys.stderr)) if args.verbose else None
+    try:
+        merged = merge_catalogs([parse_source_spec(s) for s in args.sources], args.window_s, args.distance_km, args.mag_diff, log)
+        if merged.empty:
+            print("sismiq: kaynaklarda okunabilir olay yok.", file=sys.stderr); return 2
+        n = write_merged_catalog(args.output, merged)
+    except (OSError, ValueError) as e:
+        print(f"sismiq: {e}", file=sys.stderr); return 2
+    if args.verbose: print(f"sismiq: {n} olay yazıldı ({merged.attrs['tekrar_olay']} tekrar ayıklandı): {args.output}", file=sys.stderr)
+    return 0
+
+def serve_command(args):
+    return run_service(args.catalog, args.host, args.port, cache_dir=args.cache_dir, workers=args.workers,
+                       batch_window_ms=args.batch_window_ms, max_batch=args.max_batch)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m sismiq', description="SİSMİQ sismik risk motoru (Streamlit'siz).")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    score = commands.add_parser('score', help="CSV/JSONL (enlem, boylam, tarih) satırlarını toplu puanla, sonucu stdout'a yaz.")
+    score.add_argument('input', help="Girdi dosyası ('-' = stdin). Sütunlar: lat/enlem, lon/boylam, isteğe bağlı date/tarih; diğerleri aynen aktarılır.")
+    score.add_argument('--catalog', default=VARSAYILAN_KATALOG, help="Deprem kataloğu (varsayılan: %(default)s)")
+    score.add_argument('--cache-dir', default=None, help="Derlenmiş katalog önbelleği klasörü")
+    score.add_argument('--input-format', choices=['csv', 'jsonl'], default=None, help="Girdi biçimi (varsayılan: uzantıdan)")
+    score.add_argument('--format', choices=['csv', 'jsonl'], default=None, help="Çıktı biçimi (varsayılan: girdiyle aynı)")
+    score.add_argument('--date', default=None, help="Tarihi olmayan satırlar için analiz tarihi (varsayılan: bugün)")
+    score.add_argument('--batch-size', type=int, default=TOPLU_PARTI_BOYUTU, help="Parti başına satır (varsayılan: %(default)s)")
+    score.add_argument('--workers', type=int, default=int(os.environ.get("SISMIQ_ISCI_SAYISI", 1)), help="Paralel işçi süreç sayısı")
+    score.add_argument('-v', '--verbose', action='store_true')
+    score.set_defaults(func=score_command)
+    
+    districts = commands.add_parser('districts', help="Tüm ilçeleri bir tarih için puanla; puana göre sıralı tablo veya il özeti.")
+    districts.add_argument('--catalog', default=VARSAYILAN_KATALOG, help="Deprem kataloğu (varsayılan: %(default)s)")
+    districts.add_argument('--cache-dir', default=None, help="Derlenmiş katalog önbelleği klasörü")
+    districts.add_argument('--date', default=None, help="Analiz tarihi (varsayılan: bugün)")
+    districts.add_argument('--provinces', action='store_true', help="İlçe sıralaması yerine il özeti yaz")
+    districts.add_argument('--top', type=int, default=None, help="Yalnızca ilk N satır")
+    districts.add_argument('--format', choices=['csv', 'jsonl', 'parquet'], default='csv', help="Çıktı biçimi (varsayılan: %(default)s)")
+    districts.add_argument('-o', '--output', default=None, help="Çıktı dosyası (varsayılan: stdout; parquet için gerekli)")
+    districts.add_argument('--workers', type=int, default=int(os.environ.get("SISMIQ_ISCI_SAYISI", 1)), help="Paralel işçi süreç sayısı")
+    districts.set_defaults(func=districts_command)
+    
+    bench = commands.add_parser('bench', help="Ayrıştırma, motor, tarama ve doğrulama aşamalarının süre ve bellek ölçümü (JSON).")
+    bench.add_argument('--catalog', default=VARSAYILAN_KATALOG, help="Deprem kataloğu (varsayılan: %(default)s)")
+    bench.add_argument('--synthetic', default='', help="Ek sentetik katalog boyutları, örn. '100k,1m,10m' veya 'all'")
+    bench.add_argument('--stages', nargs='+', default=BENCH_ASAMALARI, help="Ölçülecek aşamalar (varsayılan: hepsi)")
+    bench.add_argument('--repeat', type=int, default=BENCH_TEKRAR, help="Süre ölçümü tekrar sayısı (varsayılan: %(default)s)")
+    bench.add_argument('--precision-dates', type=int, default=BACKTEST_TARIH_SAYISI, help="Netlik testi tarih sayısı (varsayılan: %(default)s)")
+    bench.add_argument('--no-memory', action='store_true', help="Bellek ölçümünü atla (tracemalloc çalıştırması)")
+    bench.add_argument('--work-dir', default=BENCH_KLASORU, help="Sentetik katalogların klasörü (varsayılan: %(default)s)")
+    bench.add_argument('--workers', type=int, default=int(os.environ.get("SISMIQ_ISCI_SAYISI", 1)), help="Paralel işçi süreç sayısı")
+    bench.add_argument('-o', '--output', default=None, help="Sonuç JSON dosyası (varsayılan: stdout)")
+    bench.add_argument('--compare', default=None, help="Önceki sonuç JSON dosyası; oranlar stderr'e yazılır")
+    bench.set_defaults(func=bench_command)
+    
+    synth = commands.add_parser('synth', help="deprem.txt biçiminde sentetik katalog üret (parça parça diske yazılır).")
+    synth.add_argument('output', help="Çıktı katalog dosyası")
+    synth.add_argument('-n', '--events', type=int, required=True, help="Olay sayısı")
+    synth.add_argument('--source', choices=['model', 'resample'], default='model',
+                       help="model: fay kümelenmesi + Gutenberg-Richter + artçılar; resample: --catalog olaylarını yeniden örnekle")
+    synth.add_argument('--start', default=SENTETIK_BASLANGIC, help="Başlangıç tarihi (varsayılan: %(default)s)")
+    synth.add_argument('--end', default=SENTETIK_BITIS, help="Bitiş tarihi (varsayılan: %(default)s)")
+    synth.add_argument('--b-value', type=float, default=SENTETIK_B_DEGERI, help="Gutenberg-Richter b-değeri (varsayılan: %(default)s)")
+    synth.add_argument('--fault-fraction', type=float, default=SENTETIK_FAY_ORANI, help="Fay izlerinde kümelenen ana olay oranı (varsayılan: %(default)s)")
+    synth.add_argument('--seed', type=int, default=SENTETIK_TOHUM, help="Rastgele tohum (varsayılan: %(default)s)")
+    synth.add_argument('--catalog', default=VARSAYILAN_KATALOG, help="resample kaynağı (varsayılan: %(default)s)")
+    synth.add_argument('--chunk-size', type=int, default=SENTETIK_PARCA_BOYUTU, help="Parça başına olay (varsayılan: %(default)s)")
+    synth.add_argument('-v', '--verbose', action='store_true')
+    synth.set_defaults(func=synth_command)
+    
+    merge = commands.add_parser('merge', help="Kandilli/AFAD kataloglarını birleştir, tekrar olayları ayıkla; deprem.txt biçiminde yaz.")
+    merge.add_argument('output', help="Birleşik katalog dosyası")
+    merge.add_argument('sources', nargs='+', help="Kaynak dosyalar, öncelik sırasıyla (tekrarlarda öndeki kaynağın kaydı kalır). "
+                                                  "'yol=saat' kaynağın zamanlarına saat farkı ekler, örn. afad.csv=-3")
+    merge.add_argument('--window-s', type=float, default=TEKRAR_ZAMAN_S, help="Tekrar için en büyük zaman farkı (varsayılan: %(default)s s)")
+    merge.add_argument('--distance-km', type=float, default=TEKRAR_MESAFE_KM, help="Tekrar için en büyük uzaklık (varsayılan: %(default)s km)")
+    merge.add_argument('--mag-diff', type=float, default=TEKRAR_BUYUKLUK_FARKI, help="Tekrar için en büyük büyüklük farkı (varsayılan: %(default)s)")
+    merge.add_argument('-v', '--verbose', action='store_true')
+    merge.set_defaults(func=merge_command)
+    
+    serve = commands.add_parser('serve', help="Yerel HTTP puanlama servisi (GET/POST /score, /metrics, /health).")
+    serve.add_argument('--catalog', default=VARSAYILAN_KATALOG, help="Deprem kataloğu (varsayılan: %(default)s)")
+    serve.add_argument('--cache-dir', default=None, help="Derlenmiş katalog önbelleği klasörü")
+    serve.add_argument('--host', default=SERVIS_ADRESI, help="Dinlenecek adres (varsayılan: %(default)s)")
+    serve.add_argument('--port', type=int, default=SERVIS_PORTU, help="Port (varsayılan: %(default)s)")
+    serve.add_argument('--workers', type=int, default=int(os.environ.get("SISMIQ_ISCI_SAYISI", 1)), help="Paralel işçi süreç sayısı")
+    serve.add_argument('--batch-window-ms', type=float, default=TOPLAMA_PENCERESI_MS, help="Parti toplama penceresi (varsayılan: %(default)s ms)")
+    serve.add_argument('--max-batch', type=int, default=EN_BUYUK_PARTI, help="Parti başına en fazla nokta (varsayılan: %(default)s)")
+    serve.set_defaults(func=serve_command)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # Çıktı erken kapatıldı (örn. "| head"); kalan yazımlar sessizce atılır.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
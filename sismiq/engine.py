@@ -0,0 +1,299 @@
+import os
+import threading
+import datetime
+import numpy as np
+
+from .spatial import BUYUKLUK_OLCEGI, BAYRAK_DOLUNAY, to_epoch, haversine_vectorized, mag_code, NeighbourTable
+from .instrument import stage
+from .faults import FaultSet, FaultRaster, FAY_RASTER_COZUNURLUK, RASTER_SINIR, load_fault_geojson
+
+# -----------------------------------------------------------------------------
+# SABİT DEĞİŞKENLER
+# -----------------------------------------------------------------------------
+# Analiz Parametreleri
+ANALIZ_YARICAP_KM = 150
+POST_SISMIK_YARICAP_KM = 50
+TETIKLENME_YARICAP_KM = 150
+BUYUKLUK_FILTRESI = 3.5
+FAY_TAMPON_BOLGESI_KM = 35
+MIN_DEPREM_SAYISI = 20
+RAPOR_ALT_LIMIT = 126
+KOMSU_YARICAP_KM = max(ANALIZ_YARICAP_KM, POST_SISMIK_YARICAP_KM, TETIKLENME_YARICAP_KM)
+
+# Ulusal Tarama Izgarası (0.5°)
+ULUSAL_IZGARA_ENLEM = np.arange(36.0, 42.1, 0.5)
+ULUSAL_IZGARA_BOYLAM = np.arange(26.0, 45.1, 0.5)
+
+# Fay Hatları
+ACTIVE_FAULTS = {
+    "KAF - Doğu": ((39.1, 40.9), (39.7, 39.5)), "KAF - Orta": ((39.7, 39.5), (40.7, 31.6)),
+    "KAF - Batı": ((40.7, 31.6), (40.7, 29.9)), "KAF - Marmara": ((40.7, 29.9), (40.8, 27.0)),
+    "KAF - Bursa": ((40.5, 30.2), (40.2, 28.0)), "DAF - Bingöl": ((39.0, 40.8), (38.3, 39.0)),
+    "DAF - Maraş": ((38.3, 39.0), (37.5, 37.0)), "DAF - Hatay": ((37.5, 37.0), (36.0, 36.0)),
+    "Ölüdeniz": ((36.0, 36.0), (34.0, 36.1)), "Ege Grabenleri": ((38.5, 28.5), (37.5, 27.0)),
+    "Tuz Gölü": ((39.0, 33.5), (37.5, 33.8)), "Ecemiş": ((38.5, 35.0), (37.0, 34.8)),
+    "Van Gölü": ((38.3, 42.8), (38.7, 44.0)), "Eskişehir": ((39.8, 30.5), (39.5, 32.5)),
+    "Malatya-Ovacık": ((39.5, 39.0), (38.3, 38.0))
+}
+UZAK_FAY_ADI = "Ana Faylara Uzak"
+
+# -----------------------------------------------------------------------------
+# GEOMETRİ VE FAY YAKINLIĞI
+# -----------------------------------------------------------------------------
+# Etkin fay seti: yerleşik ACTIVE_FAULTS veya SISMIQ_FAY_GEOJSON ile verilen gerçek fay izleri.
+# set_active_faults çalışan süreçte değiştirir; EnginePool işçileri oluşturuldukları andaki seti görür.
+_active_faults = load_fault_geojson(os.environ["SISMIQ_FAY_GEOJSON"]) if os.environ.get("SISMIQ_FAY_GEOJSON") else FaultSet.from_segments(ACTIVE_FAULTS)
+
+def active_faults():
+    return _active_faults
+
+def set_active_faults(fault_set):
+    global _active_faults
+    _active_faults = fault_set if isinstance(fault_set, FaultSet) else FaultSet.from_segments(fault_set)
+
+# Fay mesafe rasteri (bkz. faults.FaultRaster): fay seti başına ilk sorguda bir kez kurulur (~0.6 s),
+# diske yazılır; sonraki süreçler diskten açar (~1 ms). Sorgu boyutundan bağımsızdır: tek nokta da
+# rasterden okunur (~40 µs, tam fay sorgusu ~190 µs). SISMIQ_FAY_RASTERI=0 kapatır.
+FAY_RASTERI_ACIK = os.environ.get("SISMIQ_FAY_RASTERI", "1") != "0"
+FAY_RASTER_COZUNURLUGU = float(os.environ.get("SISMIQ_FAY_RASTER_COZUNURLUK", FAY_RASTER_COZUNURLUK))
+FAY_RASTER_KLASORU = os.environ.get("SISMIQ_FAY_RASTER_KLASORU", ".sismiq_cache")
+_fault_rasters = {}
+_fault_raster_lock = threading.Lock()
+
+def fault_raster(faults=None, build=True):
+    faults = faults or _active_faults
+    raster = _fault_rasters.get(faults.fingerprint)
+    if raster is not None or not build: return raster
+    with _fault_raster_lock:
+        if faults.fingerprint not in _fault_rasters:
+            _fault_rasters[faults.fingerprint] = FaultRaster.load_or_build(faults, FAY_TAMPON_BOLGESI_KM, FAY_RASTER_COZUNURLUGU,
+                                                                           cache_dir=FAY_RASTER_KLASORU)
+        return _fault_rasters[faults.fingerprint]
+
+def fault_proximity(lats, lons, faults=None):
+    # Noktalar için (fay tamponunda mı, fay adı) dizileri. Rasterde kesin olan hücreler tablodan
+    # okunur; sınır hücreleri ve kapsam dışı noktalar tek vektörel tam sorguya gider.
+    faults = faults or _active_faults
+    lats = np.atleast_1d(np.asarray(lats, dtype=np.float64)); lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+    raster = fault_raster(faults) if FAY_RASTERI_ACIK else None
+    fault = raster.lookup(lats, lons) if raster is not None else np.full(len(lats), RASTER_SINIR)
+    exact = fault == RASTER_SINIR
+    if exact.any(): fault[exact] = faults.nearest(lats[exact], lons[exact], max_km=FAY_TAMPON_BOLGESI_KM)[0]
+    on_fault = fault >= 0
+    names = np.full(len(fault), UZAK_FAY_ADI, dtype=object)
+    names[on_fault] = faults.names[fault[on_fault]]
+    return on_fault, names
+
+def check_fault_proximity(user_lat, user_lon):
+    on_fault, names = fault_proximity([user_lat], [user_lon])
+    return bool(on_fault[0]), names[0]
+
+# --- RİSK MOTORU (CORE) ---
+def calculate_risk_engine(index, lat, lon, simdi):
+    return calculate_risk_timeline(index, lat, lon, [simdi])[0]
+
+def calculate_risk_timeline(index, lat, lon, dates):
+    scores, reasons, faults = calculate_risk_grid(index, [lat], [lon], dates)
+    return list(zip(scores[0].tolist(), reasons[0], faults[0]))
+
+def segment_sums(values, starts, ends):
+    bounds = np.stack([starts, ends], axis=-1).ravel()
+    sums = np.add.reduceat(np.append(values, 0.0), bounds)[::2].reshape(starts.shape)
+    return np.where(ends > starts, sums, 0.0)
+
+# Noktalar x olaylar: kutu içindeki her (nokta, olay) çifti bir kez üretilir.
+def box_pairs(index, lats, lons):
+    owner, idx = index.query_box_many(lats - 2.0, lats + 2.0, lons - 2.0, lons + 2.0)
+    dists = haversine_vectorized(lats[owner], lons[owner], index.lat[idx], index.lon[idx])
+    first_rank = np.full(len(lats), len(index.times) + 1)
+    np.minimum.at(first_rank, owner, index.t_rank[idx])
+    return owner, idx, dists, first_rank
+
+def build_neighbour_table(index, lats=ULUSAL_IZGARA_ENLEM, lons=ULUSAL_IZGARA_BOYLAM, chunk_size=256):
+    # Izgaranın her hücresi için KOMSU_YARICAP_KM içindeki olaylar; puanlama bunların dışına hiç bakmaz.
+    cell_lat, cell_lon = (a.ravel() for a in np.meshgrid(lats, lons, indexing='ij'))
+    counts, idx, dist, first_rank = [], [], [], []
+    for i in range(0, len(cell_lat), chunk_size):
+        owner, c_idx, c_dist, c_first = box_pairs(index, cell_lat[i:i+chunk_size], cell_lon[i:i+chunk_size])
+        keep = c_dist <= KOMSU_YARICAP_KM
+        counts.append(np.bincount(owner[keep], minlength=len(c_first)))
+        idx.append(c_idx[keep]); dist.append(c_dist[keep]); first_rank.append(c_first)
+    indptr = np.concatenate(([0], np.cumsum(np.concatenate(counts)))) if counts else np.zeros(1, dtype=np.int64)
+    cat = lambda parts, dtype: np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+    return NeighbourTable(cell_lat, cell_lon, indptr, cat(idx, np.int64), cat(dist, np.float64), cat(first_rank, np.int64))
+
+def extend_neighbour_table(index, table, old_positions, positions, chunk_size=4096):
+    # SpatialIndex.appended ile eklenen olaylar için komşu tablosu: eski çiftler yalnızca yeni olay
+    # numaralarına taşınır, mesafe yalnızca yeni olaylarla hücreler arasında hesaplanır. Hücre içi
+    # sıra (olay no artan), mesafeler ve ilk olay sıraları tam derlemeyle aynıdır.
+    n_cells, n_events = len(table), len(index)
+    lat, lon = index.lat[positions].astype(np.float64), index.lon[positions].astype(np.float64)
+    # Eski tablonun 'olay yok' işareti (eski zaman sayısı + 1) yeni zaman sayısına taşınır.
+    n_old_times = len(index.times) - len(np.unique(index.t[positions]))
+    first_rank = np.where(table.first_rank > n_old_times, len(index.times) + 1, table.first_rank)
+    owner, idx, dist = [], [], []
+    for i in range(0, len(positions), chunk_size):
+        # box_pairs ile aynı ±2° kutu süzgeci (kova ızgarası kutunun içindeki olayları zaten kapsar).
+        inside = ((lat[None, i:i+chunk_size] >= (table.cell_lat - 2.0)[:, None]) & (lat[None, i:i+chunk_size] <= (table.cell_lat + 2.0)[:, None]) &
+                  (lon[None, i:i+chunk_size] >= (table.cell_lon - 2.0)[:, None]) & (lon[None, i:i+chunk_size] <= (table.cell_lon + 2.0)[:, None]))
+        cells, events = np.nonzero(inside)
+        events = positions[i + events]
+        np.minimum.at(first_rank, cells, index.t_rank[events])
+        d = haversine_vectorized(table.cell_lat[cells], table.cell_lon[cells], index.lat[events], index.lon[events])
+        keep = d <= KOMSU_YARICAP_KM
+        owner.append(cells[keep]); idx.append(events[keep]); dist.append(d[keep])
+    owner, idx, dist = (np.concatenate(parts) if parts else np.zeros(0, dtype=dtype)
+                        for parts, dtype in ((owner, np.int64), (idx, np.int64), (dist, np.float64)))
+    order = np.lexsort((idx, owner)); owner, idx, dist = owner[order], idx[order], dist[order]
+    old_owner = np.repeat(np.arange(n_cells), np.diff(table.indptr))
+    old_idx = old_positions[table.idx]
+    at = np.searchsorted(old_owner * n_events + old_idx, owner * n_events + idx)
+    indptr = table.indptr + np.searchsorted(owner, np.arange(n_cells + 1))
+    return NeighbourTable(table.cell_lat, table.cell_lon, indptr, np.insert(old_idx, at, idx),
+                          np.insert(np.asarray(table.dist), at, dist), first_rank)
+
+# Her tarihin pencere sayımları (nokta, zaman sırası) anahtarlarında ikili aramadır.
+def grid_window_stats(index, n_points, owner, idx, dists, first_rank, le_now, lt_1y, lt_3y):
+    key_base = len(index.times) + 1
+    mags, rank = index.mag10[idx], index.t_rank[idx]
+    base = (np.arange(n_points) * key_base)[:, None]
+    def positions(keys, cut): return np.searchsorted(keys, base + np.atleast_2d(cut))
+    
+    final = (dists <= ANALIZ_YARICAP_KM) & (mags >= mag_code(BUYUKLUK_FILTRESI))
+    final_keys = owner[final] * key_base + rank[final]
+    order = np.argsort(final_keys, kind='stable'); final_keys = final_keys[order]
+    final_mags = mags[final][order]
+    final_moon = np.concatenate(([0], np.cumsum(index.flags[idx[final]][order] & BAYRAK_DOLUNAY, dtype=np.int64)))
+    
+    p_start = np.searchsorted(final_keys, base).repeat(le_now.shape[-1], axis=1)
+    p_now, p_1y, p_3y = positions(final_keys, le_now), positions(final_keys, lt_1y), positions(final_keys, lt_3y)
+    
+    return {
+        'has_data': first_rank[:, None] < np.atleast_2d(le_now),
+        'n_final': p_now - p_start,
+        'mag_sum': segment_sums(final_mags, p_start, p_now) / BUYUKLUK_OLCEGI,
+        'n_last_1y': p_now - p_1y, 'moon_last_1y': final_moon[p_now] - final_moon[p_1y],
+        'n_prev_2y': p_1y - p_3y, 'moon_prev_2y': final_moon[p_1y] - final_moon[p_3y],
+    }
+
+# Post-sismik ve tetiklenme bölgeleri yalnızca büyük depremlere bakar: noktaların
+# büyük deprem çiftleri bir kez toplanır, her tarih için iki ikili arama yeter.
+def large_event_counts(index, lats, lons, le_now, lt_1y, lt_3y):
+    large = index.large_events()
+    owner, idx = large.box_pairs(lats, lons, 2.0)
+    dists = haversine_vectorized(lats[owner], lons[owner], large.events.lat[idx], large.events.lon[idx])
+    dead = dists <= POST_SISMIK_YARICAP_KM
+    trigger = (dists > POST_SISMIK_YARICAP_KM) & (dists <= TETIKLENME_YARICAP_KM)
+    return {
+        'n_dead': large.time_table(len(lats), owner[dead], idx[dead]).count_between(lt_1y, le_now),
+        'n_trigger': large.time_table(len(lats), owner[trigger], idx[trigger]).count_between(lt_3y, le_now),
+    }
+
+# Tarih listesi -> zaman sırası kesimleri; (nokta, tarih) matrisi verilirse aynı biçimde döner.
+def date_cuts(index, dates, days=0, side='right'):
+    shape = np.shape(dates)
+    flat = [d for row in dates for d in row] if len(shape) == 2 else dates
+    epochs = [to_epoch(d - datetime.timedelta(days=days), ceil=side == 'left') for d in flat]
+    return np.searchsorted(index.times, epochs, side=side).reshape(shape)
+
+# Noktalar x tarihler gösterge matrisleri (pencere sayımları, b-değeri, Dolunay oranları, puan).
+# Tarihler birbirinden bağımsızdır: her pencere önek toplamlarında iki ikili aramadır.
+# dates tüm noktalar için ortak bir liste ya da her noktanın kendi tarihlerini veren (nokta, tarih) matrisidir.
+def grid_indicators(index, lats, lons, dates, chunk_size=256):
+    lats = np.asarray(lats, dtype=np.float64).ravel()
+    lons = np.asarray(lons, dtype=np.float64).ravel()
+    with stage('engine.fault_proximity'): on_fault_1d, fault_names_1d = fault_proximity(lats, lons)
+    on_fault = on_fault_1d[:, None]
+    
+    le_now, lt_1y, lt_3y = date_cuts(index, dates), date_cuts(index, dates, 365, 'left'), date_cuts(index, dates, 365*3, 'left')
+    def rows(cut, i): return cut[i:i+chunk_size] if cut.ndim == 2 else cut
+    
+    # Sabit ızgaradaki noktalar için çiftler komşu tablosundan gelir; mesafe hesaplanmaz.
+    cells = index.neighbours.lookup(lats, lons) if index.neighbours is not None else np.full(len(lats), -1)
+    chunks = []
+    for i in range(0, len(lats), chunk_size):
+        chunk_cells = cells[i:i+chunk_size]
+        with stage('engine.pairs'):
+            if (chunk_cells >= 0).all(): pairs = index.neighbours.pairs(chunk_cells)
+            else: pairs = box_pairs(index, lats[i:i+chunk_size], lons[i:i+chunk_size])
+        with stage('engine.window_stats'):
+            chunks.append(grid_window_stats(index, len(chunk_cells), *pairs, rows(le_now, i), rows(lt_1y, i), rows(lt_3y, i)))
+    stats = {k: np.concatenate([c[k] for c in chunks]) if chunks else np.zeros((0, le_now.shape[-1])) for k in
+           ['has_data', 'n_final', 'mag_sum', 'n_last_1y', 'moon_last_1y', 'n_prev_2y', 'moon_prev_2y']}
+    with stage('engine.large_events'): stats.update(large_event_counts(index, lats, lons, le_now, lt_1y, lt_3y))
+    
+    with stage('engine.scoring'):
+        veri_yok = ~stats['has_data']
+        yetersiz = ~veri_yok & (stats['n_final'] < MIN_DEPREM_SAYISI)
+        post = ~veri_yok & ~yetersiz & (stats['n_dead'] > 0)
+        active = ~veri_yok & ~yetersiz & ~post
+
+        trigger_pts = np.where(stats['n_trigger'] > 0, np.where(on_fault, 35, 30), 0)
+
+        # b-değeri: grup ortalaması (Aki); tüm analiz depremleri zaten BUYUKLUK_FILTRESI üstündedir.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean_mag = stats['mag_sum'] / stats['n_final']
+            b_val = np.where(mean_mag == BUYUKLUK_FILTRESI, 1.0, 0.4343 / (mean_mag - BUYUKLUK_FILTRESI))
+            ratio_last_1y = np.where(stats['n_last_1y'] > 0, stats['moon_last_1y'] / stats['n_last_1y'] * 100, 0)
+            ratio_prev_2y = np.where(stats['n_prev_2y'] > 0, stats['moon_prev_2y'] / stats['n_prev_2y'] * 100, 0)
+        has_b = (stats['n_final'] >= 15) & (b_val < 0.85)
+        b_pts = np.where(has_b, np.where(on_fault, 35, 25), 0)
+
+        is_catirdama = (stats['n_last_1y'] >= 5) & (ratio_last_1y > 15.0)
+        is_prev_silence = (stats['n_prev_2y'] >= 5) & (ratio_prev_2y < 9.0)
+        is_current_silence = (stats['n_last_1y'] >= 5) & (ratio_last_1y < 9.0)
+        is_ani_kilit = (stats['n_prev_2y'] >= 5) & (ratio_prev_2y > 15.0) & is_current_silence
+        moon_pts = np.select([is_catirdama, is_ani_kilit, is_current_silence],
+                             [35 + np.where(on_fault, 15, 0) + np.where(is_prev_silence, 25, 0),
+                              np.where(on_fault, 75, 50), np.where(on_fault, 25, 10)], 0)
+
+        scores = np.select([post, yetersiz, active],
+                           [9999, np.where(on_fault, 35, 0), np.minimum(trigger_pts + b_pts + moon_pts, 150)], 0)
+        stats.update(on_fault=on_fault_1d, fault_names=fault_names_1d, veri_yok=veri_yok, yetersiz=yetersiz, post=post,
+                     trigger_pts=trigger_pts, b_val=b_val, b_pts=b_pts, ratio_last_1y=ratio_last_1y, ratio_prev_2y=ratio_prev_2y,
+                     is_catirdama=is_catirdama, is_ani_kilit=is_ani_kilit, is_current_silence=is_current_silence,
+                     moon_pts=moon_pts, scores=scores)
+    return stats
+
+def calculate_risk_grid(index, lats, lons, dates, chunk_size=256):
+    ind = grid_indicators(index, lats, lons, dates, chunk_size)
+    scores = ind['scores']
+    with stage('engine.reasons'): reasons, fault_names = _grid_reasons(ind, len(dates))
+    return scores, reasons, fault_names
+
+def _grid_reasons(ind, n_dates):
+    veri_yok, yetersiz, post, trigger_pts, b_pts, b_val, moon_pts, is_catirdama, is_ani_kilit, is_current_silence = (ind[k] for k in
+        ['veri_yok', 'yetersiz', 'post', 'trigger_pts', 'b_pts', 'b_val', 'moon_pts', 'is_catirdama', 'is_ani_kilit', 'is_current_silence'])
+    reasons, fault_names = [], []
+    for p, (is_on_fault, fault_name) in enumerate(zip(ind['on_fault'].tolist(), ind['fault_names'].tolist())):
+        row_reasons, row_faults = [], []
+        for d in range(n_dates):
+            if veri_yok[p, d]: r, f = [], "Veri Yok"
+            elif yetersiz[p, d]:
+                r, f = (["Yetersiz Veri / Sismik Boşluk (+35)"], fault_name) if is_on_fault else ([], "Yetersiz Veri")
+            elif post[p, d]: r, f = ["POST-SİSMİK"], fault_name
+            else:
+                r, f = [], fault_name
+                if trigger_pts[p, d]: r.append(f"Stres Transferi (+{trigger_pts[p, d]})")
+                if b_pts[p, d]: r.append(f"Fiziksel Gerilme (b={b_val[p, d]:.2f}) (+{b_pts[p, d]})")
+                if is_catirdama[p, d]: r.append(f"Çatırdama (+{moon_pts[p, d]})")
+                elif is_ani_kilit[p, d]: r.append(f"Ani Kilitlenme (+{moon_pts[p, d]})")
+                elif is_current_silence[p, d]: r.append(f"Baskılanma/Sessizlik (+{moon_pts[p, d]})")
+            row_reasons.append(r); row_faults.append(f)
+        reasons.append(row_reasons); fault_names.append(row_faults)
+    return reasons, fault_names
+
+# Tek nokta için günlük (veya step_days adımlı) seri: end_date'ten days gün geriye, eskiden yeniye.
+# Tüm tarihler tek grid_indicators taramasıyla; nedenler üretilmediği için 365 gün de anlıktır.
+ZAMAN_SERISI_GUN = 365
+def calculate_risk_series(index, lat, lon, end_date, days=ZAMAN_SERISI_GUN, step_days=1):
+    dates = [end_date - datetime.timedelta(days=d) for d in range(0, days + 1, step_days)][::-1]
+    ind = grid_indicators(index, [lat], [lon], dates)
+    with np.errstate(invalid='ignore'):
+        b_val = np.where(ind['n_final'][0] > 0, ind['b_val'][0], np.nan)
+    return {
+        'dates': dates, 'scores': ind['scores'][0], 'b_value': b_val, 'n_final': ind['n_final'][0],
+        'ratio_last_1y': ind['ratio_last_1y'][0], 'n_last_1y': ind['n_last_1y'][0],
+        'ratio_prev_2y': ind['ratio_prev_2y'][0], 'n_prev_2y': ind['n_prev_2y'][0],
+        'on_fault': bool(ind['on_fault'][0]), 'fault_name': ind['fault_names'][0],
+    }
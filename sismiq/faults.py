@@ -0,0 +1,236 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+from .spatial import haversine_vectorized, expand_ranges
+
+# -----------------------------------------------------------------------------
+# FAY GEOMETRİSİ
+# -----------------------------------------------------------------------------
+# Faylar çok köşeli çizgilerdir (polyline). Tüm çizgilerin parçaları düz diziler
+# halinde tutulur: parça i, (seg_lat1[i], seg_lon1[i]) -> (seg_lat2[i], seg_lon2[i])
+# ve seg_fault[i] fay numarasıdır. Parçaların tampon kadar genişletilmiş sınır
+# kutuları kovalara dağıtılır (CSR); bir nokta yalnızca kendi kovasındaki
+# parçalara bakar. En yakın fay ve mesafe tüm noktalar için tek seferde hesaplanır.
+FAY_KOVA_DERECE = 0.5
+FAY_INDEKS_TAMPON_KM = 50 # Bu mesafeye kadarki sorgular kova indeksini kullanır.
+# Tarihsel davranış: bir fay, enlem kapsamının ortası noktaya 2.5°'den uzaksa hiç
+# değerlendirilmez (tek parçalı faylarda uç noktaların ortalaması).
+FAY_ENLEM_PENCERESI = 2.5
+KM_PER_DERECE = 6371 * np.pi / 180
+
+def segment_distances(lats, lons, lat1, lon1, lat2, lon2):
+    # Noktanın parçaya (enlem/boylam düzleminde) en yakın noktası bulunur, mesafe haversine ile ölçülür.
+    dx, dy = lon2 - lon1, lat2 - lat1
+    length2 = dx*dx + dy*dy
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = ((lons - lon1) * dx + (lats - lat1) * dy) / length2
+    closest_lon = np.where(t < 0, lon1, np.where(t > 1, lon2, lon1 + t * dx))
+    closest_lat = np.where(t < 0, lat1, np.where(t > 1, lat2, lat1 + t * dy))
+    dists = haversine_vectorized(lats, lons, closest_lat, closest_lon)
+    # Nokta parça (iki köşesi aynı) için tarihsel düzlemsel yaklaşım.
+    degenerate = length2 == 0
+    if degenerate.any(): dists = np.where(degenerate, np.sqrt((lons - lon1)**2 + (lats - lat1)**2) * 111, dists)
+    return dists
+
+class FaultSet:
+    def __init__(self, names, traces, index_km=FAY_INDEKS_TAMPON_KM, cell_deg=FAY_KOVA_DERECE):
+        # names: fay adları; traces: (fay no, enlemler, boylamlar) çizgileri (bir fayın birden çok parçası olabilir).
+        self.names = np.array(names, dtype=object)
+        seg_fault, lat1, lon1, lat2, lon2 = [], [], [], [], []
+        lat_min, lat_max = np.full(len(names), np.inf), np.full(len(names), -np.inf)
+        for fault, lats, lons in sorted(traces, key=lambda tr: tr[0]):
+            lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+            if len(lats) == 1: lats, lons = np.repeat(lats, 2), np.repeat(lons, 2)
+            seg_fault.append(np.full(len(lats) - 1, fault)); lat1.append(lats[:-1]); lon1.append(lons[:-1]); lat2.append(lats[1:]); lon2.append(lons[1:])
+            lat_min[fault], lat_max[fault] = min(lat_min[fault], lats.min()), max(lat_max[fault], lats.max())
+        cat = lambda parts, dtype=np.float64: np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype=dtype)
+        self.seg_fault = cat(seg_fault, np.int64)
+        self.seg_lat1, self.seg_lon1, self.seg_lat2, self.seg_lon2 = cat(lat1), cat(lon1), cat(lat2), cat(lon2)
+        self.centre_lat = (lat_min + lat_max) / 2
+        self.index_km, self.cell_deg = index_km, cell_deg
+        self._build_index()
+        digest = hashlib.blake2b(repr(list(self.names)).encode('utf-8'), digest_size=8)
+        for arr in (self.seg_fault, self.seg_lat1, self.seg_lon1, self.seg_lat2, self.seg_lon2): digest.update(arr.tobytes())
+        self.fingerprint = digest.hexdigest()
+
+    @classmethod
+    def from_segments(cls, faults, **kwargs):
+        # {ad: ((enlem1, boylam1), (enlem2, boylam2), ...)} sözlüğü; motorun yerleşik ACTIVE_FAULTS biçimi.
+        names = list(faults)
+        return cls(names, [(i, [p[0] for p in coords], [p[1] for p in coords]) for i, coords in enumerate(faults.values())], **kwargs)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _build_index(self):
+        # Parça kutuları tampon kadar genişletilir; boylam payı parçanın en yüksek enleminde hesaplanır.
+        pad_lat = self.index_km / KM_PER_DERECE * 1.1
+        top = np.minimum(np.maximum(np.abs(self.seg_lat1), np.abs(self.seg_lat2)) + pad_lat, 89.0)
+        pad_lon = pad_lat / np.cos(np.radians(top))
+        box = (np.minimum(self.seg_lat1, self.seg_lat2) - pad_lat, np.maximum(self.seg_lat1, self.seg_lat2) + pad_lat,
+               np.minimum(self.seg_lon1, self.seg_lon2) - pad_lon, np.maximum(self.seg_lon1, self.seg_lon2) + pad_lon)
+        self.lat0 = np.floor(box[0].min()) if len(self.seg_fault) else 0.0
+        self.lon0 = np.floor(box[2].min()) if len(self.seg_fault) else 0.0
+        r_lo, r_hi, c_lo, c_hi = (((edge - origin) // self.cell_deg).astype(np.int64) for edge, origin in
+                                  zip(box, (self.lat0, self.lat0, self.lon0, self.lon0)))
+        self.n_rows = int(r_hi.max()) + 1 if len(r_hi) else 0
+        self.n_cols = int(c_hi.max()) + 1 if len(c_hi) else 0
+        # Her parça kapsadığı tüm kovalara yazılır: önce satırlar, sonra sütunlar açılır.
+        seg_of_row, rows = expand_ranges(r_lo, r_hi - r_lo + 1)
+        seg_of_cell, cols = expand_ranges(c_lo[seg_of_row], (c_hi - c_lo + 1)[seg_of_row])
+        segs, keys = seg_of_row[seg_of_cell], rows[seg_of_cell] * self.n_cols + cols
+        order = np.lexsort((segs, keys))
+        self.cell_segments = segs[order]
+        self.cell_offsets = np.searchsorted(keys[order], np.arange(self.n_rows * self.n_cols + 1))
+
+    def candidate_pairs(self, lats, lons):
+        # (nokta, parça) adayları: noktanın kovasındaki parçalar (indeks tamponu içindeki her parça bunların arasındadır).
+        rows = ((lats - self.lat0) // self.cell_deg).astype(np.int64)
+        cols = ((lons - self.lon0) // self.cell_deg).astype(np.int64)
+        inside = (rows >= 0) & (rows < self.n_rows) & (cols >= 0) & (cols < self.n_cols)
+        points = np.flatnonzero(inside)
+        keys = rows[points] * self.n_cols + cols[points]
+        starts = self.cell_offsets[keys]
+        slot_owner, slots = expand_ranges(starts, self.cell_offsets[keys + 1] - starts)
+        return points[slot_owner], self.cell_segments[slots]
+
+    def all_pairs(self, lats, lons):
+        owner = np.repeat(np.arange(len(lats)), len(self.seg_fault))
+        return owner, np.tile(np.arange(len(self.seg_fault)), len(lats))
+
+    def nearest(self, lats, lons, max_km=None, lat_window=FAY_ENLEM_PENCERESI, with_second=False, chunk_pairs=1 << 22):
+        # Her nokta için en yakın fay numarası ve mesafesi; max_km içinde fay yoksa (-1, inf).
+        # Eşit mesafede sıralamada önce gelen fay kazanır. with_second: ikinci en yakın
+        # (farklı) fayın mesafesi de döner.
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64)); lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        fault, dist, second = np.full(len(lats), -1), np.full(len(lats), np.inf), np.full(len(lats), np.inf)
+        if len(self.seg_fault) and len(lats):
+            indexed = max_km is not None and max_km <= self.index_km
+            # Kova indeksi dışında (nokta x tüm parçalar) çiftleri bellek sınırı için parça parça işlenir.
+            step = len(lats) if indexed else max(1, chunk_pairs // len(self.seg_fault))
+            for i in range(0, len(lats), step):
+                sl = slice(i, i + step)
+                fault[sl], dist[sl], second[sl] = self._nearest_chunk(lats[sl], lons[sl], max_km, lat_window, indexed)
+        return (fault, dist, second) if with_second else (fault, dist)
+
+    def _nearest_chunk(self, lats, lons, max_km, lat_window, indexed):
+        fault, dist, second = np.full(len(lats), -1), np.full(len(lats), np.inf), np.full(len(lats), np.inf)
+        owner, seg = (self.candidate_pairs if indexed else self.all_pairs)(lats, lons)
+        keep = np.abs(lats[owner] - self.centre_lat[self.seg_fault[seg]]) <= lat_window
+        owner, seg = owner[keep], seg[keep]
+        d = segment_distances(lats[owner], lons[owner], self.seg_lat1[seg], self.seg_lon1[seg], self.seg_lat2[seg], self.seg_lon2[seg])
+        if max_km is not None: keep = d <= max_km; owner, seg, d = owner[keep], seg[keep], d[keep]
+        order = np.lexsort((seg, d, owner))
+        owner, fault_of, d = owner[order], self.seg_fault[seg[order]], d[order]
+        first = np.r_[True, owner[1:] != owner[:-1]] if len(owner) else np.zeros(0, dtype=bool)
+        fault[owner[first]], dist[owner[first]] = fault_of[first], d[first]
+        other = fault_of != fault[owner]
+        owner2, d2 = owner[other], d[other]
+        first2 = np.r_[True, owner2[1:] != owner2[:-1]] if len(owner2) else np.zeros(0, dtype=bool)
+        second[owner2[first2]] = d2[first2]
+        return fault, dist, second
+
+# --- FAY MESAFE RASTERI ---
+# Fay yakınlığı yalnızca konuma bağlıdır: Türkiye kapsamı sabit çözünürlüklü hücrelere
+# bölünür ve her hücre için sonuç bir kez hesaplanıp diske yazılır. Hücre kodu:
+#   >= 0        hücrenin her noktası bu fayın tamponunda ve en yakın fay budur,
+#   RASTER_UZAK  hücrenin hiçbir noktası tamponda değildir,
+#   RASTER_SINIR tampon sınırı, en yakın fayın değiştiği yer veya 2.5° penceresinin
+#                kenarı hücreden geçer; bu hücrelerde tam hesaba dönülür.
+# Kesinlik: hücre merkezinden en fazla yarım hücre uzaktaki bir noktada mesafe
+# 2 x (km/derece) x çözünürlükten fazla değişemez; bu pay %10 artırılarak kullanılır.
+FAY_RASTER_KAPSAMI = (35.0, 43.0, 25.0, 46.0) # enlem min, enlem max, boylam min, boylam max
+FAY_RASTER_COZUNURLUK = 0.01
+FAY_RASTER_FORMAT_SURUMU = 1
+RASTER_UZAK, RASTER_SINIR = -1, -2
+
+class FaultRaster:
+    def __init__(self, faults, buffer_km, resolution=FAY_RASTER_COZUNURLUK, extent=FAY_RASTER_KAPSAMI, codes=None):
+        self.buffer_km, self.resolution, self.extent = buffer_km, resolution, tuple(extent)
+        self.lat0, lat_max, self.lon0, lon_max = self.extent
+        self.n_rows = int(round((lat_max - self.lat0) / resolution))
+        self.n_cols = int(round((lon_max - self.lon0) / resolution))
+        self.key = hashlib.blake2b(repr((FAY_RASTER_FORMAT_SURUMU, faults.fingerprint, buffer_km, resolution, self.extent)).encode('utf-8'),
+                                   digest_size=8).hexdigest()
+        self.codes = codes if codes is not None else self._compute(faults)
+
+    @classmethod
+    def load_or_build(cls, faults, buffer_km, resolution=FAY_RASTER_COZUNURLUK, extent=FAY_RASTER_KAPSAMI, cache_dir=None):
+        raster = cls.__new__(cls)
+        cls.__init__(raster, faults, buffer_km, resolution, extent, codes=np.zeros(0, dtype=np.int16))
+        path = os.path.join(cache_dir, f"fay_raster-{raster.key}.npy") if cache_dir else None
+        if path and os.path.exists(path):
+            try:
+                codes = np.load(path, mmap_mode='r')
+                if codes.shape == (raster.n_rows, raster.n_cols): raster.codes = codes; return raster
+            except (OSError, ValueError): pass
+        raster.codes = raster._compute(faults)
+        if path:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.tmp"
+                with open(tmp, 'wb') as f: np.save(f, raster.codes)
+                os.replace(tmp, path)
+            except OSError: pass
+        return raster
+
+    def cell_centres(self, rows):
+        lats = self.lat0 + (np.asarray(rows) + 0.5) * self.resolution
+        lons = self.lon0 + (np.arange(self.n_cols) + 0.5) * self.resolution
+        return np.repeat(lats, self.n_cols), np.tile(lons, len(lats))
+
+    def _compute(self, faults, rows_per_chunk=50):
+        margin = 2 * KM_PER_DERECE * self.resolution * 1.1
+        half = self.resolution / 2
+        codes = np.full((self.n_rows, self.n_cols), RASTER_SINIR, dtype=np.int16)
+        for r0 in range(0, self.n_rows, rows_per_chunk):
+            rows = np.arange(r0, min(r0 + rows_per_chunk, self.n_rows))
+            lats, lons = self.cell_centres(rows)
+            fault, dist, second = faults.nearest(lats, lons, max_km=self.buffer_km + margin, with_second=True)
+            chunk = np.full(len(lats), RASTER_SINIR, dtype=np.int16)
+            chunk[dist - margin > self.buffer_km] = RASTER_UZAK
+            certain = (dist + margin <= self.buffer_km) & (second - margin > dist + margin)
+            chunk[certain] = fault[certain]
+            # 2.5° penceresinin kenarı hücre satırından geçiyorsa pencereye giren/çıkan fay da hesaba katılır.
+            row_lat = self.lat0 + (rows + 0.5) * self.resolution
+            edges = np.concatenate([faults.centre_lat - FAY_ENLEM_PENCERESI, faults.centre_lat + FAY_ENLEM_PENCERESI])
+            crossing = ((edges[None, :] >= row_lat[:, None] - half) & (edges[None, :] <= row_lat[:, None] + half)).any(axis=1)
+            if crossing.any():
+                cells = np.flatnonzero(np.repeat(crossing, self.n_cols))
+                _, any_dist = faults.nearest(lats[cells], lons[cells], max_km=self.buffer_km + margin, lat_window=np.inf)
+                chunk[cells] = np.where(any_dist - margin > self.buffer_km, RASTER_UZAK, RASTER_SINIR)
+            codes[rows] = chunk.reshape(len(rows), self.n_cols)
+        return codes
+
+    def lookup(self, lats, lons):
+        # Noktaların hücre kodları; kapsam dışındaki noktalar RASTER_SINIR (tam hesap).
+        lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+        with np.errstate(invalid='ignore'):
+            rows = np.floor((lats - self.lat0) / self.resolution)
+            cols = np.floor((lons - self.lon0) / self.resolution)
+        inside = (rows >= 0) & (rows < self.n_rows) & (cols >= 0) & (cols < self.n_cols)
+        codes = np.full(len(lats), RASTER_SINIR, dtype=np.int64)
+        codes[inside] = self.codes[rows[inside].astype(np.int64), cols[inside].astype(np.int64)]
+        return codes
+
+def load_fault_geojson(path, name_keys=('name', 'ad', 'Name', 'NAME', 'fault_name'), **kwargs):
+    # LineString / MultiLineString nesneleri (koordinatlar [boylam, enlem]); aynı adlı nesneler tek fay sayılır.
+    with open(path, encoding='utf-8') as f: data = json.load(f)
+    features = data.get('features', []) if data.get('type') == 'FeatureCollection' else [data]
+    names, traces = {}, []
+    for i, feature in enumerate(features):
+        geometry = feature.get('geometry', feature) or {}
+        props = feature.get('properties') or {}
+        if geometry.get('type') == 'LineString': lines = [geometry['coordinates']]
+        elif geometry.get('type') == 'MultiLineString': lines = geometry['coordinates']
+        else: continue
+        name = next((str(props[k]) for k in name_keys if props.get(k)), f"Fay {i + 1}")
+        fault = names.setdefault(name, len(names))
+        for line in lines:
+            if len(line) == 0: continue
+            coords = np.asarray(line, dtype=np.float64)[:, :2]
+            traces.append((fault, coords[:, 1], coords[:, 0]))
+    if not traces: raise ValueError(f"{path}: çizgi (LineString) içeren fay bulunamadı")
+    return FaultSet(list(names), traces, **kwargs)
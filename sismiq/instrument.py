@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import threading
+import functools
+import contextvars
+import collections
+
+# -----------------------------------------------------------------------------
+# AŞAMA ÖLÇÜMÜ (İZLEME)
+# -----------------------------------------------------------------------------
+# Motorun, taramaların ve ekran fonksiyonlarının aşamaları stage('ad') bloklarıyla veya
+# @traced('ad') ile işaretlidir. İzleme kapalıyken stage() paylaşılan boş bir bağlam döner,
+# @traced yalnızca bir bayrak okur; ölçülebilir maliyet yoktur. Açıkken her aşama için
+# çağrı sayısı ve süre toplanır, son IZLEME_OLAY_SINIRI aralık Chrome izi için tutulur.
+# EnginePool işçilerindeki aralıklar görev sonucuyla ana sürece taşınır (bkz. parallel).
+# Açık/kapalı bayrağı bağlama özeldir (contextvars): enable() yalnızca çağıran iş parçacığını
+# veya asyncio görevini etkiler; bir Streamlit oturumunun paneli diğer oturumları ölçtürmez.
+# Yeni iş parçacıkları SISMIQ_IZLEME ortam değişkeninden gelen varsayılanla başlar.
+IZLEME_OLAY_SINIRI = 100_000
+
+_enabled = contextvars.ContextVar('sismiq_izleme', default=os.environ.get("SISMIQ_IZLEME", "0") == "1")
+_lock = threading.Lock()
+_stats = {}
+_spans = collections.deque(maxlen=IZLEME_OLAY_SINIRI)
+
+def enabled():
+    return _enabled.get()
+
+def enable(on=True):
+    _enabled.set(bool(on))
+
+def disable():
+    _enabled.set(False)
+
+def reset():
+    with _lock:
+        _stats.clear(); _spans.clear()
+
+def record(name, start_ns, dur_ns, pid=None, tid=None):
+    with _lock:
+        s = _stats.get(name)
+        if s is None: _stats[name] = [1, dur_ns, dur_ns, dur_ns]
+        else: s[0] += 1; s[1] += dur_ns; s[2] = min(s[2], dur_ns); s[3] = max(s[3], dur_ns)
+        span = (name, start_ns, dur_ns, pid or os.getpid(), tid or threading.get_ident())
+        _spans.append(span)
+        collector = _collector.get()
+        if collector is not None: collector.append(span)
+
+class _Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+class _NoSpan:
+    __slots__ = ()
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+
+_NO_SPAN = _NoSpan()
+
+def stage(name):
+    return _Span(name) if _enabled.get() else _NO_SPAN
+
+def traced(name):
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled.get(): return func(*args, **kwargs)
+            with _Span(name): return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+# --- İŞÇİ SÜREÇLERİ ---
+# İşçi, görevi izleme açıkken çalıştırır ve yalnızca o görevin aralıklarını sonuçla birlikte döner.
+_collector = contextvars.ContextVar('sismiq_izleme_toplayici', default=None)
+
+def capture(func, *args):
+    spans = []
+    token = _collector.set(spans)
+    try:
+        return func(*args), spans
+    finally:
+        _collector.reset(token)
+
+def merge(spans):
+    for name, start_ns, dur_ns, pid, tid in spans: record(name, start_ns, dur_ns, pid, tid)
+
+# --- DIŞA AKTARMA ---
+def stats():
+    # Aşama başına özet, toplam süreye göre azalan.
+    with _lock: items = [(name, list(s)) for name, s in _stats.items()]
+    rows = [{'Aşama': name, 'Çağrı': count, 'Toplam (ms)': total / 1e6, 'Ortalama (ms)': total / count / 1e6,
+             'En Kısa (ms)': lo / 1e6, 'En Uzun (ms)': hi / 1e6} for name, (count, total, lo, hi) in items]
+    return sorted(rows, key=lambda r: -r['Toplam (ms)'])
+
+def to_json():
+    with _lock: spans = list(_spans)
+    return json.dumps({
+        'stages': stats(),
+        'spans': [{'name': n, 'start_us': s / 1e3, 'dur_us': d / 1e3, 'pid': p, 'tid': t} for n, s, d, p, t in spans],
+    }, ensure_ascii=False, indent=2)
+
+def to_chrome_trace():
+    # chrome://tracing veya Perfetto ile açılan "Trace Event" biçimi (tam süreli 'X' olayları).
+    with _lock: spans = list(_spans)
+    events = [{'name': n, 'cat': n.split('.', 1)[0], 'ph': 'X', 'ts': s / 1e3, 'dur': d / 1e3, 'pid': p, 'tid': t}
+              for n, s, d, p, t in spans]
+    return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}, ensure_ascii=False)
@@ -0,0 +1,122 @@
+import json
+import sqlite3
+import hashlib
+import threading
+import collections
+
+from . import engine
+from .engine import calculate_risk_timeline
+from .spatial import to_ns
+
+# -----------------------------------------------------------------------------
+# SKOR ÖNBELLEĞİ
+# -----------------------------------------------------------------------------
+# Anahtar: (katalog sürümü, analiz parametreleri özeti, yuvarlanmış enlem/boylam,
+# tarih). Bellekteki LRU katmanı tüm oturumlarca paylaşılır; isteğe bağlı sqlite
+# katmanı yeniden başlatmalardan sonra da kalır. Katalog değişince eski kayıtlar
+# hem bellekten hem diskten atılır; katalog yalnızca sona eklemeyle büyüdüyse
+# eklenen en erken olaydan önceki tarihlerin kayıtları geçerli kalır.
+SKOR_ONBELLEK_KAPASITESI = 4096
+KOORDINAT_HASSASIYETI = 4 # ondalık basamak (~11 m)
+SKOR_MOTORU_SURUMU = 2 # Puanlama mantığı değişirse artırılır.
+
+def engine_params_hash():
+    params = (SKOR_MOTORU_SURUMU, engine.ANALIZ_YARICAP_KM, engine.POST_SISMIK_YARICAP_KM, engine.TETIKLENME_YARICAP_KM,
+              engine.BUYUKLUK_FILTRESI, engine.FAY_TAMPON_BOLGESI_KM, engine.MIN_DEPREM_SAYISI, engine.active_faults().fingerprint)
+    return hashlib.blake2b(repr(params).encode('utf-8'), digest_size=8).hexdigest()
+
+class ScoreCache:
+    def __init__(self, capacity=SKOR_ONBELLEK_KAPASITESI, db_path=None):
+        self.capacity = capacity
+        self.params = engine_params_hash()
+        self.version = self.version_number = None
+        self.hits = self.disk_hits = self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute("CREATE TABLE IF NOT EXISTS skorlar (surum TEXT, parametre TEXT, enlem INTEGER, boylam INTEGER, "
+                                 "zaman INTEGER, deger TEXT, PRIMARY KEY (surum, parametre, enlem, boylam, zaman)) WITHOUT ROWID")
+                self._db.commit()
+            except sqlite3.Error:
+                self._db = None
+
+    def _switch_version(self, catalog):
+        # Sürüm önceki sürümün sonuna ekleme ise yalnızca eklenen olaylardan etkilenebilecek
+        # (tarihi appended_since veya sonrası) kayıtlar atılır; aksi halde hepsi atılır.
+        keep_before = None
+        if self.version is not None and catalog.appended_from == self.version_number:
+            keep_before = catalog.appended_since * 10**9
+        old_version, self.version, self.version_number = self.version, catalog.fingerprint, catalog.version
+        if keep_before is None: self._entries.clear()
+        else:
+            for key in [k for k in self._entries if k[2] >= keep_before]: del self._entries[key]
+        if self._db is None: return
+        try:
+            if keep_before is not None:
+                self._db.execute("UPDATE OR REPLACE skorlar SET surum=? WHERE surum=? AND parametre=? AND zaman < ?",
+                                 (self.version, old_version, self.params, keep_before))
+            self._db.execute("DELETE FROM skorlar WHERE surum != ? OR parametre != ?", (self.version, self.params))
+            self._db.commit()
+        except sqlite3.Error:
+            self._db = None
+
+    def _lookup(self, key):
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key); self.hits += 1
+            return value
+        if self._db is not None:
+            try:
+                row = self._db.execute("SELECT deger FROM skorlar WHERE surum=? AND parametre=? AND enlem=? AND boylam=? AND zaman=?",
+                                       (self.version, self.params) + key).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                score, reasons, fault = json.loads(row[0])
+                self._store(key, (score, tuple(reasons), fault)); self.disk_hits += 1
+                return self._entries[key]
+        self.misses += 1
+        return None
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity: self._entries.popitem(last=False)
+
+    def timeline(self, catalog, lat, lon, dates):
+        # calculate_risk_timeline ile aynı çıktı; yalnızca önbellekte olmayan tarihler
+        # tek motor çağrısıyla hesaplanır. Puan yuvarlanmış koordinatta hesaplanır,
+        # böylece aynı anahtar her zaman aynı sonucu verir.
+        q = 10 ** KOORDINAT_HASSASIYETI
+        q_lat, q_lon = int(round(lat * q)), int(round(lon * q))
+        keys = [(q_lat, q_lon, to_ns(d)) for d in dates]
+        with self._lock:
+            # Parametreler (ör. set_active_faults ile fay seti) değiştiyse bellekteki kayıtlar atılır;
+            # diskteki kayıtlar parametre özetiyle ayrıldığından eski özetle sorgulanmaz.
+            params = engine_params_hash()
+            if params != self.params: self._entries.clear(); self.params = params
+            if catalog.fingerprint != self.version: self._switch_version(catalog)
+            found = [self._lookup(k) for k in keys]
+        missing = [i for i, v in enumerate(found) if v is None]
+        if missing:
+            computed = calculate_risk_timeline(catalog.index, q_lat / q, q_lon / q, [dates[i] for i in missing])
+            rows = []
+            with self._lock:
+                current = catalog.fingerprint == self.version and params == self.params
+                for i, (score, reasons, fault) in zip(missing, computed):
+                    found[i] = (score, tuple(reasons), fault)
+                    if current: self._store(keys[i], found[i])
+                    rows.append((catalog.fingerprint, params) + keys[i] + (json.dumps([score, reasons, fault]),))
+                if self._db is not None and current:
+                    try:
+                        self._db.executemany("INSERT OR REPLACE INTO skorlar VALUES (?, ?, ?, ?, ?, ?)", rows)
+                        self._db.commit()
+                    except sqlite3.Error:
+                        self._db = None
+        return [(score, list(reasons), fault) for score, reasons, fault in found]
+
+    def stats(self):
+        return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses, 'entries': len(self._entries)}
@@ -0,0 +1,231 @@
+import io
+import os
+import csv
+import json
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .catalog import BUYUKLUK_TURLERI, parse_catalog, finalize_catalog, append_events, file_fingerprint, catalog_cache_dir, LiveCatalog
+from .spatial import KM_PER_DERECE_ALT_SINIR, expand_ranges, haversine_vectorized
+from .synthetic import write_catalog
+
+# -----------------------------------------------------------------------------
+# ÇOK KAYNAKLI KATALOG: OKUMA, ORTAK ŞEMA VE TEKRAR AYIKLAMA
+# -----------------------------------------------------------------------------
+# Kandilli dışa aktarımları (deprem.txt biçimi, yıllık arşivler dahil) ve AFAD dışa
+# aktarımları (CSV/JSON) sırayla, her seferinde bir dosya okunur ve parse_catalog'un
+# sütunlarına çevrilir. Her yeni kaynak o ana kadarki birleşimle karşılaştırılır:
+# olaylar TEKRAR_* toleransları boyunda uzay-zaman kovalarına ayrılır, adaylar yalnızca
+# komşu 27 kovada ikili aramayla bulunur (O(n log n), ikili karşılaştırma yok). İki kayıt
+# toleranslar içindeyse ve birbirinin en yakın eşiyse aynı depremdir; önce verilen
+# kaynağın kaydı kalır. Aynı dosyanın kendi olayları birbirinin tekrarı sayılmaz.
+TEKRAR_ZAMAN_S = 20
+TEKRAR_MESAFE_KM = 30.0
+TEKRAR_BUYUKLUK_FARKI = 1.0
+KAYNAK_BICIMLERI = ['kandilli', 'afad']
+AFAD_SUTUNLARI = {
+    'Tarih': ('date', 'tarih', 'origin time', 'oluş zamanı', 'olus zamani'),
+    'Enlem': ('latitude', 'enlem'),
+    'Boylam': ('longitude', 'boylam'),
+    'Derinlik': ('depth', 'derinlik', 'derinlik(km)'),
+    'Mag': ('magnitude', 'büyüklük', 'buyukluk', 'mag'),
+    'Tür': ('type', 'tür', 'tur', 'magnitude type', 'büyüklük türü'),
+    'Yer': ('location', 'yer', 'lokasyon'),
+    'Deprem Kodu': ('eventid', 'event id', 'deprem id', 'id'),
+}
+AFAD_OLAY_TIPI = 'Ke' # AFAD dışa aktarımında olay tipi yok; Kandilli'nin kesinleşmiş olay tipi kullanılır
+BIRLESIK_KATALOG_ONEKI = 'birlesik'
+
+def detect_source_format(path):
+    # Uzantı .json/.csv ise veya başlıkta Kandilli sütunları yoksa ama enlem/latitude varsa AFAD.
+    if str(path).lower().endswith(('.json', '.csv')): return 'afad'
+    with open(path, 'rb') as f: head = f.read(1 << 16)
+    if b'Olus tarihi' in head or b'Deprem Kodu' in head: return 'kandilli'
+    first = head.split(b'\n', 1)[0].lower()
+    return 'afad' if b'latitude' in first or (b'enlem' in first and (b',' in first or b';' in first)) else 'kandilli'
+
+def _afad_records(path):
+    with open(path, 'rb') as f: raw = f.read()
+    for encoding in ('utf-8-sig', 'cp1254'):
+        try: text = raw.decode(encoding); break
+        except UnicodeDecodeError: continue
+    else:
+        return pd.DataFrame()
+    if text.lstrip().startswith(('[', '{')):
+        data = json.loads(text)
+        # API yanıtı liste ya da listeyi taşıyan bir nesne olabilir.
+        if isinstance(data, dict): data = next((v for v in data.values() if isinstance(v, list)), [])
+        return pd.DataFrame.from_records(data).astype(str)
+    first = text.split('\n', 1)[0]
+    sep = max(',;\t', key=first.count)
+    frame = pd.read_csv(io.StringIO(text), sep=sep, dtype=str, quoting=csv.QUOTE_MINIMAL, on_bad_lines='skip')
+    # Noktalı virgüllü Türkçe dışa aktarımlarda ondalık ayırıcı virgüldür.
+    if sep == ';': frame = frame.apply(lambda c: c.str.replace(',', '.', regex=False))
+    return frame
+
+def parse_afad(path, time_shift_h=0.0):
+    records = _afad_records(path)
+    if records.empty: return pd.DataFrame()
+    lowered = {str(c).strip().lower(): c for c in records.columns}
+    cols = {key: next((lowered[n] for n in names if n in lowered), None) for key, names in AFAD_SUTUNLARI.items()}
+    missing = [key for key in ('Tarih', 'Enlem', 'Boylam', 'Mag') if cols[key] is None]
+    if missing: raise ValueError(f"{path}: AFAD sütunu bulunamadı: {', '.join(AFAD_SUTUNLARI[missing[0]])}")
+    column = lambda key: records[cols[key]] if cols[key] is not None else pd.Series([None] * len(records))
+    number = lambda key, dtype=np.float64: pd.to_numeric(column(key), errors='coerce').to_numpy(dtype=dtype, na_value=np.nan)
+
+    tarih = pd.DatetimeIndex(pd.to_datetime(column('Tarih'), errors='coerce', format='ISO8601', utc=True)).tz_localize(None)
+    tarih = (tarih + pd.Timedelta(hours=time_shift_h)).floor('s')
+    lat, lon, mag = number('Enlem'), number('Boylam'), number('Mag')
+    valid = ~np.isnan(lat) & ~np.isnan(lon) & ~np.isnan(mag) & tarih.notna()
+    kind = column('Tür').fillna('').str.strip().str.lower().to_numpy()
+    df = pd.DataFrame({
+        'Deprem Kodu': pd.to_numeric(column('Deprem Kodu'), errors='coerce').fillna(0).to_numpy(dtype=np.int64)[valid],
+        'Tarih': tarih.to_numpy()[valid],
+        'Enlem': lat[valid], 'Boylam': lon[valid],
+        'Derinlik': number('Derinlik', np.float32)[valid],
+        'Mag': mag[valid],
+        # Büyüklük türü sütunu varsa değer o türün sütununa da yazılır.
+        **{m: np.where(kind == m.lower(), mag, np.nan).astype(np.float32)[valid] for m in BUYUKLUK_TURLERI},
+        'Tip': pd.Categorical(np.full(int(valid.sum()), AFAD_OLAY_TIPI)),
+        'Yer': pd.Categorical(column('Yer').fillna('').to_numpy(dtype=object)[valid]),
+    })
+    return finalize_catalog(df, len(records) - len(df))
+
+def parse_source_spec(text):
+    # "yol" veya "yol=saat": saat, kaynağın zamanlarına eklenecek fark (örn. yerel saatli dosya için "afad.csv=-3").
+    path, sep, shift = text.rpartition('=')
+    if sep:
+        try: return path, None, float(shift)
+        except ValueError: pass
+    return text, None, 0.0
+
+def read_source(path, fmt=None, time_shift_h=0.0):
+    # Kaynak dosya -> parse_catalog sütunları. time_shift_h: kaynağın saatlerini ortak saate çeviren fark.
+    fmt = fmt or detect_source_format(path)
+    if fmt == 'afad': return parse_afad(path, time_shift_h)
+    if fmt != 'kandilli': raise ValueError(f"bilinmeyen katalog biçimi: {fmt} (geçerli: {', '.join(KAYNAK_BICIMLERI)})")
+    df = parse_catalog(path)
+    if time_shift_h and not df.empty:
+        df = finalize_catalog(df.drop(columns='Dolunay').assign(Tarih=df['Tarih'] + pd.Timedelta(hours=time_shift_h)),
+                              df.attrs.get('reddedilen_satir', 0))
+    return df
+
+def _bucket_keys(t, lat, lon, window_s, dlat, dlon, origin):
+    # (zaman, enlem, boylam) kovası -> tek int64 anahtar; her eksende ±1 komşu için birer boş kova payı bırakılır.
+    t0, lat0, lon0, n_lat, n_lon = origin
+    tb = ((t - t0) // window_s).astype(np.int64) + 1
+    lb = np.floor((lat - lat0) / dlat).astype(np.int64) + 1
+    ob = np.floor((lon - lon0) / dlon).astype(np.int64) + 1
+    return (tb * n_lat + lb) * n_lon + ob
+
+def duplicate_mask(base, new, window_s=TEKRAR_ZAMAN_S, distance_km=TEKRAR_MESAFE_KM, mag_diff=TEKRAR_BUYUKLUK_FARKI):
+    # new'in base'de eşi olan olayları (True). Kova boyu toleransa eşit olduğundan her eş,
+    # olayın kendi kovası ya da 26 komşusundan birindedir.
+    mask = np.zeros(len(new), dtype=bool)
+    if base.empty or new.empty: return mask
+    t_b, t_n = (df['Tarih'].to_numpy().astype('datetime64[s]').view(np.int64) for df in (base, new))
+    lat_b, lat_n = base['Enlem'].to_numpy(dtype=np.float64), new['Enlem'].to_numpy(dtype=np.float64)
+    lon_b, lon_n = base['Boylam'].to_numpy(dtype=np.float64), new['Boylam'].to_numpy(dtype=np.float64)
+    mag_b, mag_n = base['Mag'].to_numpy(dtype=np.float64), new['Mag'].to_numpy(dtype=np.float64)
+
+    dlat = distance_km / KM_PER_DERECE_ALT_SINIR
+    max_lat = min(max(np.abs(lat_b).max(), np.abs(lat_n).max()) + dlat, 89.0)
+    dlon = dlat / np.cos(np.radians(max_lat))
+    lat0, lon0 = min(lat_b.min(), lat_n.min()), min(lon_b.min(), lon_n.min())
+    n_lat = int((max(lat_b.max(), lat_n.max()) - lat0) // dlat) + 3
+    n_lon = int((max(lon_b.max(), lon_n.max()) - lon0) // dlon) + 3
+    origin = (min(t_b.min(), t_n.min()), lat0, lon0, n_lat, n_lon)
+    keys_b = _bucket_keys(t_b, lat_b, lon_b, window_s, dlat, dlon, origin)
+    keys_n = _bucket_keys(t_n, lat_n, lon_n, window_s, dlat, dlon, origin)
+    order = np.argsort(keys_b, kind='stable'); sorted_keys = keys_b[order]
+
+    owners, matches = [], []
+    for dt in (-1, 0, 1):
+        for dl in (-1, 0, 1):
+            for do in (-1, 0, 1):
+                target = keys_n + (dt * n_lat + dl) * n_lon + do
+                lo, hi = np.searchsorted(sorted_keys, target, 'left'), np.searchsorted(sorted_keys, target, 'right')
+                owner, pos = expand_ranges(lo, hi - lo)
+                owners.append(owner); matches.append(order[pos])
+    i, j = np.concatenate(owners), np.concatenate(matches)
+    dt_s = np.abs(t_n[i] - t_b[j])
+    dist = haversine_vectorized(lat_n[i], lon_n[i], lat_b[j], lon_b[j])
+    keep = (dt_s <= window_s) & (dist <= distance_km) & (np.abs(mag_n[i] - mag_b[j]) <= mag_diff)
+    i, j, score = i[keep], j[keep], (dt_s[keep] / window_s) ** 2 + (dist[keep] / distance_km) ** 2
+    if not len(i): return mask
+
+    # Karşılıklı en yakın eşler: artçı dizilerinde bir olay, komşusunun tekrarını üstlenmez.
+    best_for_new = np.lexsort((score, i)); best_for_new = best_for_new[np.r_[True, i[best_for_new][1:] != i[best_for_new][:-1]]]
+    best_for_base = np.lexsort((score, j)); best_for_base = best_for_base[np.r_[True, j[best_for_base][1:] != j[best_for_base][:-1]]]
+    mutual = np.intersect1d(best_for_new, best_for_base, assume_unique=True)
+    mask[i[mutual]] = True
+    return mask
+
+def merge_catalogs(sources, window_s=TEKRAR_ZAMAN_S, distance_km=TEKRAR_MESAFE_KM, mag_diff=TEKRAR_BUYUKLUK_FARKI, log=None):
+    # sources: dosya yolu veya (yol, biçim, saat farkı) öğeleri; öncelik sırasıyla.
+    # Dönen: tekrarsız katalog; attrs['kaynaklar'] kaynak başına okunan/eklenen/tekrar sayısı.
+    merged, stats = pd.DataFrame(), []
+    for source in sources:
+        if isinstance(source, (str, os.PathLike)): source = (source,)
+        path, fmt, shift = (tuple(source) + (None, 0.0))[:3]
+        df = read_source(path, fmt, shift or 0.0)
+        dup = duplicate_mask(merged, df, window_s, distance_km, mag_diff)
+        added = df[~dup].reset_index(drop=True)
+        added.attrs.update(df.attrs)
+        merged = added if merged.empty else append_events(merged, added) if len(added) else merged
+        stats.append({'dosya': str(path), 'okunan': len(df), 'eklenen': len(added), 'tekrar': int(dup.sum()),
+                      'reddedilen_satir': df.attrs.get('reddedilen_satir', 0)})
+        if log: log(f"{path}: {len(df)} olay, {int(dup.sum())} tekrar, {len(added)} eklendi")
+    merged.attrs['kaynaklar'] = stats
+    merged.attrs['tekrar_olay'] = sum(s['tekrar'] for s in stats)
+    return merged
+
+def write_merged_catalog(path, df, chunk_size=200_000):
+    # Birleşik katalog deprem.txt biçiminde yazılır (LiveCatalog ve motor aynı yoldan okur).
+    tmp = f"{path}.{os.getpid()}.tmp"
+    def chunks():
+        for a in range(0, len(df), chunk_size):
+            part = df.iloc[a:a + chunk_size]
+            yield (part['Tarih'].to_numpy().astype('datetime64[s]').view(np.int64), part['Enlem'].to_numpy(), part['Boylam'].to_numpy(),
+                   np.nan_to_num(part['Derinlik'].to_numpy(dtype=np.float64)), part['Mag'].to_numpy(),
+                   part['Yer'].astype(str).str.replace(r'[\t\r\n]', ' ', regex=True).to_numpy(),
+                   {m: part[m].to_numpy(dtype=np.float64) for m in BUYUKLUK_TURLERI}, part['Tip'].astype(str).to_numpy())
+    n = write_catalog(tmp, chunks())
+    # İçerik aynıysa eski dosya (ve mtime'ı) korunur; LiveCatalog yeniden derlemez.
+    if os.path.exists(path) and file_fingerprint(path) == file_fingerprint(tmp): os.remove(tmp)
+    else: os.replace(tmp, path)
+    return n
+
+class MergedCatalog:
+    # LiveCatalog'un çok kaynaklı karşılığı: kaynaklardan biri değişince birleşim yeniden
+    # kurulup önbellek klasörüne yazılır; derleme, sürüm ve mmap LiveCatalog'dan gelir.
+    def __init__(self, sources, cache_dir=None, window_s=TEKRAR_ZAMAN_S, distance_km=TEKRAR_MESAFE_KM, mag_diff=TEKRAR_BUYUKLUK_FARKI):
+        self.sources = list(sources)
+        self.paths = [s if isinstance(s, (str, os.PathLike)) else s[0] for s in self.sources]
+        self.cache_dir = cache_dir or catalog_cache_dir(self.paths[0])
+        digest = hashlib.blake2b(repr([os.path.abspath(p) for p in self.paths]).encode('utf-8'), digest_size=8).hexdigest()
+        self.merged_path = os.path.join(self.cache_dir, f"{BIRLESIK_KATALOG_ONEKI}-{digest}.txt")
+        self.tolerances = (window_s, distance_km, mag_diff)
+        self.live, self.stats, self._stat = LiveCatalog(self.merged_path, self.cache_dir), [], None
+        self._lock = threading.Lock()
+
+    def _stat_key(self):
+        keys = []
+        for path in self.paths:
+            try: stat = os.stat(path); keys.append((stat.st_size, stat.st_mtime_ns))
+            except OSError: keys.append(None)
+        return tuple(keys)
+
+    def current(self):
+        key = self._stat_key()
+        if key != self._stat:
+            with self._lock:
+                if key != self._stat:
+                    merged = merge_catalogs(self.sources, *self.tolerances)
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    write_merged_catalog(self.merged_path, merged)
+                    self.stats, self._stat = merged.attrs['kaynaklar'], key
+        return self.live.current()
@@ -0,0 +1,88 @@
+import os
+import weakref
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory, spawn
+
+import numpy as np
+
+from . import instrument, worker
+
+# -----------------------------------------------------------------------------
+# PARALEL YÜRÜTME
+# -----------------------------------------------------------------------------
+# Katalog indeksi bir kez paylaşımlı belleğe kopyalanır; işçiler başlarken
+# bu bloklara bağlanır. Görevlere yalnızca küçük argümanlar (nokta/tarih
+# parçaları) gönderilir, katalog hiçbir görevde yeniden paketlenmez. İşçi tarafı
+# worker.py'dedir.
+def _release(executor, blocks):
+    if executor is not None: executor.shutdown(wait=False, cancel_futures=True)
+    for shm in blocks:
+        shm.close(); shm.unlink()
+
+def _mp_context():
+    # fork yalnızca ana iş parçacığından ve başka canlı iş parçacığı yokken güvenlidir (komut
+    # satırı). Aksi halde çocuk, başka bir iş parçacığının o an tuttuğu kilitlerle (G/Ç, günlük,
+    # BLAS) doğup kilitlenebilir; Streamlit sunucusu ve HTTP servisi havuzu iş parçacıklarından
+    # kurar. Bu durumda işçiler yalnızca sismiq'i önceden yüklemiş forkserver sürecinden doğar
+    # (bkz. worker.py). Sınırlama: denetim havuz kurulurken yapılır; fork işçileri ilk görevde
+    # doğduğundan havuz, kurulduğu iş parçacığından ve başka iş parçacığı başlatılmadan
+    # kullanılmalıdır. forkserver olmayan platformlarda (Windows) varsayılan yöntem kullanılır
+    # ve spawn işçileri __main__ betiğini yeniden yürütür.
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods and threading.current_thread() is threading.main_thread() and threading.active_count() == 1:
+        return multiprocessing.get_context("fork")
+    if "forkserver" in methods:
+        context = multiprocessing.get_context("forkserver")
+        # Sunucu başlamadan önce ana betiğin yolu bildirilir; çocuklar betiği yeniden yürütmez.
+        main_path = spawn.get_preparation_data('sismiq').get('init_main_from_path')
+        if main_path: os.environ[worker.ANA_BETIK_DEGISKENI] = main_path
+        context.set_forkserver_preload(["sismiq.worker"])
+        return context
+    return multiprocessing.get_context()
+
+def split_chunks(items, n_chunks):
+    n_chunks = max(1, min(n_chunks, len(items)))
+    bounds = np.linspace(0, len(items), n_chunks + 1).astype(int)
+    return [items[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+class EnginePool:
+    def __init__(self, index, max_workers=None):
+        self.index = index
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.executor, self.blocks = None, []
+        if self.max_workers > 1:
+            arrays, meta = index.to_arrays()
+            spec = {}
+            for name, arr in arrays.items():
+                shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+                np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+                self.blocks.append(shm)
+                spec[name] = (shm.name, arr.shape, arr.dtype.str)
+            self.executor = ProcessPoolExecutor(self.max_workers, mp_context=_mp_context(),
+                                                initializer=worker.attach, initargs=(spec, meta))
+        self._finalizer = weakref.finalize(self, _release, self.executor, self.blocks)
+
+    def imap(self, func, tasks):
+        # func(index, *args) her görev için çalışır; sonuçlar bitiş sırasıyla
+        # (görev no, sonuç) olarak akar, böylece ilerleme çubuğu güncellenebilir.
+        if self.executor is None:
+            for i, args in enumerate(tasks): yield i, func(self.index, *args)
+            return
+        tracing = instrument.enabled()
+        futures = {self.executor.submit(worker.run_task, func, args, tracing): i for i, args in enumerate(tasks)}
+        for future in as_completed(futures):
+            result, spans = future.result()
+            if spans: instrument.merge(spans)
+            yield futures[future], result
+
+    def map(self, func, tasks, on_progress=None):
+        results = [None] * len(tasks)
+        for done, (i, result) in enumerate(self.imap(func, tasks), start=1):
+            results[i] = result
+            if on_progress: on_progress(done / len(tasks))
+        return results
+
+    def close(self):
+        self._finalizer()
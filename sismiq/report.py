@@ -0,0 +1,147 @@
+import datetime
+import numpy as np
+import pandas as pd
+
+from .engine import RAPOR_ALT_LIMIT, ZAMAN_SERISI_GUN, calculate_risk_grid, calculate_risk_series
+from .memo import KOORDINAT_HASSASIYETI
+from .spatial import BUYUKLUK_OLCEGI
+from .instrument import traced
+
+# -----------------------------------------------------------------------------
+# RAPOR: ISI PUANI, RİSK SEVİYESİ VE DEPREM GEÇMİŞİ
+# -----------------------------------------------------------------------------
+# Isı puanı: şimdiden 1 yıl öncesine beş anlık görüntü; yakın geçmiş daha ağır basar.
+RAPOR_ARALIKLARI = [0, 30, 90, 180, 365]
+RAPOR_ETIKETLERI = ["Şimdi", "1 Ay Önce", "3 Ay Önce", "6 Ay Önce", "1 Yıl Önce"]
+ISI_AGIRLIKLARI = [1.5, 0.8, 0.6, 0.4, 0.2]
+GECMIS_YARICAP_KM = 100
+GECMIS_SAYFA_BOYUTU = 50
+SKOR_SUTUNLARI = ['Enlem', 'Boylam', 'Tarih', 'Puan', 'Seviye', 'Anlık Puan', 'Durum', 'Bölge', 'Detay']
+
+def get_risk_label_and_color(score):
+    if score >= 326: return "KRİTİK RİSK", "#FF0000"
+    if score >= 226: return "YÜKSEK RİSK", "#FFA500"
+    if score >= 126: return "ORTA RİSK", "#FFFF00"
+    return "DÜŞÜK RİSK", "#00FF00"
+
+def get_risk_label_text(score):
+    return get_risk_label_and_color(score)[0]
+
+def get_snapshot_status(score):
+    if score == 9999: return "POST-SİSMİK", "#808080", 20 
+    if score >= 75: return "YÜKSEK STRES", "#FF0000", score 
+    if score >= 50: return "HAREKETLİ", "#FFA500", score 
+    return "NORMAL", "#00FF00", 20 
+
+def snapshot_dates(date):
+    return [date - datetime.timedelta(days=d) for d in RAPOR_ARALIKLARI]
+
+def heat_values(scores, count_post_history=False):
+    # scores: (nokta, RAPOR_ARALIKLARI) matrisi, şimdiden geçmişe. 50 altı anlar sayılmaz;
+    # geçmişteki post-sismik anlar da sayılmaz (tek nokta ekranı tarihsel olarak sayar).
+    scores = np.atleast_2d(scores)
+    counted = scores >= 50
+    if not count_post_history: counted[:, 1:] &= scores[:, 1:] != 9999
+    heat = np.zeros(len(scores))
+    for j, w in enumerate(ISI_AGIRLIKLARI): heat = heat + np.where(counted[:, j], scores[:, j], 0) * w
+    return heat.astype(np.int64)
+
+@traced('report.snapshot_scores')
+def snapshot_scores(index, lats, lons, dates):
+    # Noktalar kendi tarihleriyle puanlanır; aynı tarihli noktalar tek ızgara motor çağrısını paylaşır.
+    # Dönen: (nokta, RAPOR_ARALIKLARI) puanları, şimdiki anın nedenleri ve fay adları.
+    lats = np.asarray(lats, dtype=np.float64); lons = np.asarray(lons, dtype=np.float64)
+    dates = pd.DatetimeIndex(pd.to_datetime(np.asarray(dates)))
+    scores = np.zeros((len(lats), len(RAPOR_ARALIKLARI)), dtype=np.int64)
+    reasons, faults = np.empty(len(lats), dtype=object), np.empty(len(lats), dtype=object)
+    for date in dates.unique():
+        sel = np.flatnonzero(dates == date)
+        group_scores, group_reasons, group_faults = calculate_risk_grid(index, lats[sel], lons[sel], snapshot_dates(date.to_pydatetime()))
+        scores[sel] = group_scores
+        reasons[sel] = [r[0] for r in group_reasons]
+        faults[sel] = [f[0] for f in group_faults]
+    return lats, lons, dates, scores, reasons, faults
+
+@traced('report.score_sites')
+def score_sites(index, lats, lons, dates):
+    # Ulusal tarama anlamı: post-sismik noktanın ısı puanı 0, geçmişteki post-sismik anlar sayılmaz.
+    lats, lons, dates, scores, reasons, faults = snapshot_scores(index, lats, lons, dates)
+    curr = scores[:, 0]
+    heat = heat_values(scores)
+    post = curr == 9999
+    heat[post] = 0
+    return pd.DataFrame({
+        'Enlem': lats, 'Boylam': lons, 'Tarih': dates, 'Puan': heat,
+        'Seviye': np.where(post, "POST-SİSMİK", [get_risk_label_text(h) for h in heat]),
+        'Anlık Puan': curr, 'Durum': [get_snapshot_status(s)[0] for s in curr],
+        'Bölge': faults, 'Detay': [", ".join(r) for r in reasons],
+    }, columns=SKOR_SUTUNLARI)
+
+@traced('report.site_reports')
+def site_reports(index, lats, lons, dates):
+    # Tek nokta ekranının gösterdiği sonuç (render_analysis_results ile aynı ısı puanı),
+    # JSON'a hazır sözlükler olarak; zaman tüneli eskiden yeniye.
+    lats, lons, dates, scores, reasons, faults = snapshot_scores(index, lats, lons, dates)
+    heat = heat_values(scores, count_post_history=True)
+    reports = []
+    for lat, lon, date, snaps, h, r, f in zip(lats.tolist(), lons.tolist(), dates, scores.tolist(), heat.tolist(), reasons, faults):
+        reports.append({
+            'Enlem': lat, 'Boylam': lon, 'Tarih': date.isoformat(), 'Puan': h,
+            'Seviye': "POST-SİSMİK" if snaps[0] == 9999 else get_risk_label_text(h),
+            'Anlık Puan': snaps[0], 'Durum': get_snapshot_status(snaps[0])[0], 'Bölge': f, 'Nedenler': list(r),
+            'Zaman Tüneli': [{'Dönem': label, 'Puan': s, 'Durum': get_snapshot_status(s)[0]}
+                             for label, s in zip(RAPOR_ETIKETLERI[::-1], snaps[::-1])],
+        })
+    return reports
+
+@traced('report.timeline')
+def timeline_frame(index, lat, lon, date, days=ZAMAN_SERISI_GUN, step_days=1):
+    # Zaman Tüneli grafiğinin günlük eğrisi: anlık puan, durum ve puanı belirleyen göstergeler.
+    # Koordinat ScoreCache ile aynı hassasiyette yuvarlanır; son gün "Şimdi" anıyla aynıdır.
+    lat, lon = round(lat, KOORDINAT_HASSASIYETI), round(lon, KOORDINAT_HASSASIYETI)
+    series = calculate_risk_series(index, lat, lon, date, days, step_days)
+    status = [get_snapshot_status(s) for s in series['scores'].tolist()]
+    return pd.DataFrame({
+        'Tarih': pd.to_datetime(series['dates']), 'Puan': series['scores'],
+        'Durum': [s[0] for s in status], 'Renk': [s[1] for s in status], 'Değer': [s[2] for s in status],
+        'b-Değeri': series['b_value'], 'Deprem Sayısı': series['n_final'],
+        'Dolunay Oranı 1Y (%)': series['ratio_last_1y'], 'Dolunay Oranı Önceki 2Y (%)': series['ratio_prev_2y'],
+    })
+
+def is_reportable(curr, heat):
+    return (curr != 9999) & ((curr >= 50) | (heat >= RAPOR_ALT_LIMIT))
+
+def report_text(date, location_name, lat, lon, heat_val, reasons):
+    risk_text = get_risk_label_text(heat_val)
+    return f"""SİSMİQ ANALİZ RAPORU\nTarih: {date.strftime('%Y-%m-%d')}\nKonum: {location_name} ({lat}N, {lon}E)\nRisk Puanı: {heat_val}\nDurum: {risk_text}\nDetay: {', '.join(reasons) if reasons else 'Temiz'}"""
+
+class NearbyQuakes:
+    # Noktanın çevresindeki depremler, yeniden eskiye. Sorgu mekansal indeksten yalnızca olay
+    # numaralarını ve mesafeleri tutar; tablo satırları istenen sayfa için üretilir.
+    def __init__(self, index, lat, lon, date, radius_km=GECMIS_YARICAP_KM):
+        self.index, self.radius_km = index, radius_km
+        self.idx, self.dist = index.radius_query(lat, lon, radius_km, end=date)
+
+    def __len__(self):
+        return len(self.idx)
+
+    def n_pages(self, page_size=GECMIS_SAYFA_BOYUTU):
+        return max(1, -(-len(self) // page_size))
+
+    def page(self, number, page_size=GECMIS_SAYFA_BOYUTU):
+        sl = slice(number * page_size, (number + 1) * page_size)
+        idx = self.idx[sl]
+        lats, lons = self.index.catalog_coords(idx)
+        return pd.DataFrame({
+            'Tarih': pd.to_datetime(self.index.t[idx], unit='s').strftime('%Y-%m-%d %H:%M'),
+            # İndeksteki float32 koordinatlar ve int16 büyüklükler kataloğun ondalıklarına geri çevrilir.
+            'Enlem': lats, 'Boylam': lons,
+            'Mag': self.index.mag10[idx] / BUYUKLUK_OLCEGI, 'Mesafe (km)': self.dist[sl],
+        })
+
+    def pages(self, page_size=GECMIS_SAYFA_BOYUTU):
+        for number in range(self.n_pages(page_size)): yield self.page(number, page_size)
+
+@traced('report.nearby_quakes')
+def nearby_quakes(index, lat, lon, date, radius_km=GECMIS_YARICAP_KM):
+    return NearbyQuakes(index, lat, lon, date, radius_km)
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from .engine import RAPOR_ALT_LIMIT, ULUSAL_IZGARA_ENLEM, ULUSAL_IZGARA_BOYLAM
+from .parallel import split_chunks
+from .report import score_sites, is_reportable
+from .districts import district_table
+from .instrument import traced
+
+# -----------------------------------------------------------------------------
+# UYARLAMALI TARAMA: KABA IZGARA + DÖRTLÜ AĞAÇ İNCELTMESİ
+# -----------------------------------------------------------------------------
+# Önce ulusal 0.5° ızgara puanlanır. Isı puanı RAPOR_ALT_LIMIT'i aşan hücreler, böyle
+# bir komşusu olan hücreler ve post-sismik bölge sınırındaki hücreler dörde bölünür;
+# bölme, hücre boyu ADAPTIF_MIN_HUCRE'ye inene kadar yalnızca yeni hücrelerde sürer.
+# Sıcak bölge küçükse tam ince ızgaranın birkaç katı hızlıdır; kazanç sıcak alan büyüdükçe azalır.
+# Her hücre merkezinden puanlanır; ebeveyn ve çocuk merkezleri hiç çakışmaz, bu yüzden
+# sonuç doğrudan tricontourf'a verilebilecek değişken çözünürlüklü bir nokta kümesidir.
+ADAPTIF_MIN_HUCRE = 0.0625 # derece (~7 km)
+HUCRE_SUTUNU = 'Hücre (°)'
+KOMSU_OFSETLERI = [(-1, 0), (1, 0), (0, -1), (0, 1)] # kenar komşuları; eşik çizgisi bunlardan birinden geçer
+
+@traced('scan.score_batch')
+def score_batch(pool, lats, lons, dates, n_chunks, on_progress=None):
+    tasks = [(la, lo, d) for la, lo, d in zip(split_chunks(lats, n_chunks), split_chunks(lons, n_chunks), split_chunks(dates, n_chunks))]
+    if not len(lats): return score_sites(pool.index, lats, lons, dates) # boş parti: sütun türleri dolu tabloyla aynı
+    return pd.concat(pool.map(score_sites, tasks, on_progress), ignore_index=True)
+
+def refine_mask(rows, cols, heat, post, threshold=RAPOR_ALT_LIMIT):
+    # Aynı seviyedeki hücreler (satır, sütun) anahtarlarıyla sıralanır; komşular ikili aramayla bulunur.
+    # Komşusu bu seviyede puanlanmamış hücre için o komşu yok sayılır.
+    width = int(cols.max()) + 3 if len(cols) else 1
+    keys = (rows + 1) * width + (cols + 1)
+    order = np.argsort(keys); sorted_keys = keys[order]
+    hot = heat >= threshold
+    refine = hot.copy()
+    for dr, dc in KOMSU_OFSETLERI:
+        nkeys = (rows + dr + 1) * width + (cols + dc + 1)
+        pos = np.minimum(np.searchsorted(sorted_keys, nkeys), len(keys) - 1)
+        found = sorted_keys[pos] == nkeys
+        nb = order[pos]
+        refine |= found & (hot[nb] | (post[nb] != post))
+    return refine
+
+@traced('scan.adaptive')
+def adaptive_scan(pool, date, min_cell=ADAPTIF_MIN_HUCRE, threshold=RAPOR_ALT_LIMIT,
+                  lats=ULUSAL_IZGARA_ENLEM, lons=ULUSAL_IZGARA_BOYLAM, on_progress=None):
+    # Dönen: score_sites sütunları + HUCRE_SUTUNU (noktanın temsil ettiği hücrenin boyu).
+    step = float(lats[1] - lats[0])
+    lat0, lon0 = lats[0] - step / 2, lons[0] - step / 2
+    n_levels = 1 + max(0, int(np.floor(np.log2(step / min_cell) + 1e-9)))
+    rows, cols = (a.ravel() for a in np.meshgrid(np.arange(len(lats)), np.arange(len(lons)), indexing='ij'))
+    frames = []
+    for level in range(n_levels):
+        progress = (lambda f, level=level: on_progress((level + f) / n_levels)) if on_progress else None
+        # İlk düzey girilen ızgaranın kendisidir: komşu tablosu koordinatları tam eşitlikle eşler.
+        if level == 0: cell_lat, cell_lon = np.asarray(lats)[rows], np.asarray(lons)[cols]
+        else: cell_lat, cell_lon = lat0 + (rows + 0.5) * step, lon0 + (cols + 0.5) * step
+        frame = score_batch(pool, cell_lat, cell_lon, [date] * len(rows), pool.max_workers * 4, progress)
+        frames.append(frame.assign(**{HUCRE_SUTUNU: step}))
+        if level == n_levels - 1: break
+        refine = refine_mask(rows, cols, frame['Puan'].values, frame['Anlık Puan'].values == 9999, threshold)
+        if not refine.any(): break
+        rows = ((2 * rows[refine])[:, None] + [0, 0, 1, 1]).ravel()
+        cols = ((2 * cols[refine])[:, None] + [0, 1, 0, 1]).ravel()
+        step /= 2
+    if on_progress: on_progress(1.0)
+    return pd.concat(frames, ignore_index=True)
+
+# -----------------------------------------------------------------------------
+# TÜM İLÇELER: GÜNLÜK SIRALAMA VE İL ÖZETİ
+# -----------------------------------------------------------------------------
+# Her ilçe merkezi ulusal taramanın puan anlamıyla tek toplu motor çağrısında puanlanır: geçmişteki
+# post-sismik anlar ısı puanına girmez (girseydi 9999 değerleri sıralamayı bozardı), post-sismik
+# ilçeler 0 puanla en sondadır. Diğer ilçelerde puan "İl/İlçe ile" sekmesiyle aynıdır.
+IL_OZET_SUTUNLARI = ['İl', 'İlçe Sayısı', 'En Yüksek Puan', 'Ortalama Puan', 'Riskli İlçe', 'Post-Sismik İlçe', 'En Riskli İlçe']
+
+@traced('scan.districts')
+def district_scan(pool, date, on_progress=None):
+    districts = district_table()
+    scored = score_batch(pool, districts['Enlem'].values, districts['Boylam'].values, [date] * len(districts),
+                         pool.max_workers * 4, on_progress)
+    ranked = pd.concat([districts[['İl', 'İlçe']], scored], axis=1)
+    ranked = ranked.sort_values(['Puan', 'Anlık Puan'], ascending=False, kind='stable').reset_index(drop=True)
+    ranked.insert(0, 'Sıra', np.arange(1, len(ranked) + 1))
+    return ranked
+
+def province_summary(ranked):
+    # İl düzeyinde özet; en yüksek ilçe puanına göre sıralı.
+    flagged = ranked.assign(_riskli=is_reportable(ranked['Anlık Puan'], ranked['Puan']), _post=ranked['Anlık Puan'] == 9999)
+    groups = flagged.groupby('İl', sort=False)
+    top = flagged.loc[groups['Puan'].idxmax(), ['İl', 'İlçe']].set_index('İl')['İlçe']
+    summary = pd.DataFrame({
+        'İlçe Sayısı': groups.size(), 'En Yüksek Puan': groups['Puan'].max(), 'Ortalama Puan': groups['Puan'].mean().round(1),
+        'Riskli İlçe': groups['_riskli'].sum(), 'Post-Sismik İlçe': groups['_post'].sum(), 'En Riskli İlçe': top,
+    }).rename_axis('İl').reset_index()
+    return summary.sort_values(['En Yüksek Puan', 'Ortalama Puan'], ascending=False, kind='stable').reset_index(drop=True)[IL_OZET_SUTUNLARI]
@@ -0,0 +1,265 @@
+import sys
+import json
+import signal
+import time
+import asyncio
+import datetime
+import threading
+import contextvars
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from . import instrument
+from .catalog import LiveCatalog
+from .parallel import EnginePool, split_chunks
+from .report import site_reports
+from .spatial import to_ns
+
+# -----------------------------------------------------------------------------
+# HTTP PUANLAMA SERVİSİ
+# -----------------------------------------------------------------------------
+# Katalog bir kez yüklenir (sona eklenen satırlar LiveCatalog ile alınır). Aynı
+# (enlem, boylam, tarih) için uçuştaki istekler tek sonucu bekler; farklı noktalar
+# kısa bir toplama penceresinde biriktirilip tek vektörel motor çağrısıyla puanlanır.
+SERVIS_ADRESI = '127.0.0.1'
+SERVIS_PORTU = 8765
+TOPLAMA_PENCERESI_MS = 5 # ilk bekleyen istekten sonra partinin dolması için beklenen süre
+EN_BUYUK_PARTI = 512
+ISCI_BASINA_MIN_NOKTA = 64 # parti bundan küçük parçalara bölünüp işçilere dağıtılmaz
+GECIKME_ORNEK_SAYISI = 10000
+EN_BUYUK_GOVDE_BAYT = 1 << 20
+
+HTTP_DURUMLARI = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                  413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+class LatencyWindow:
+    # Son GECIKME_ORNEK_SAYISI ölçümün yüzdelikleri (milisaniye).
+    def __init__(self, size=GECIKME_ORNEK_SAYISI):
+        self.samples = collections.deque(maxlen=size)
+    
+    def add(self, seconds):
+        self.samples.append(seconds * 1000.0)
+    
+    def summary(self):
+        if not self.samples: return {'n': 0, 'p50': None, 'p99': None, 'max': None}
+        values = np.fromiter(self.samples, dtype=np.float64)
+        p50, p99 = np.percentile(values, [50, 99])
+        return {'n': len(values), 'p50': round(float(p50), 3), 'p99': round(float(p99), 3), 'max': round(float(values.max()), 3)}
+
+def parse_point(item, default_date=None):
+    # {'lat'/'enlem', 'lon'/'boylam', 'date'/'tarih'} -> (enlem, boylam, tarih); hatalı girdi ValueError.
+    def pick(*names):
+        for name in names:
+            value = item.get(name)
+            if isinstance(value, list): value = value[0] if value else None
+            if value not in (None, ''): return value
+        return None
+    lat, lon, date = pick('lat', 'enlem'), pick('lon', 'boylam'), pick('date', 'tarih')
+    if lat is None or lon is None: raise ValueError("lat ve lon zorunludur")
+    try: lat, lon = float(lat), float(lon)
+    except (TypeError, ValueError): raise ValueError("lat/lon sayı olmalıdır")
+    if not (abs(lat) <= 90 and abs(lon) <= 180): raise ValueError("lat/lon aralık dışında")
+    if date is None: date = default_date or datetime.datetime.combine(datetime.date.today(), datetime.datetime.min.time())
+    try: date = pd.Timestamp(date)
+    except (TypeError, ValueError): raise ValueError(f"tarih okunamadı: {date}")
+    if pd.isna(date): raise ValueError("tarih okunamadı")
+    if date.tzinfo is not None: date = date.tz_localize(None)
+    return lat, lon, date
+
+class ScoringService:
+    def __init__(self, filepath, cache_dir=None, workers=1, batch_window_ms=TOPLAMA_PENCERESI_MS, max_batch=EN_BUYUK_PARTI):
+        self.catalog = LiveCatalog(filepath, cache_dir)
+        self.workers = max(1, workers)
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch = max_batch
+        self._pool, self._pool_version = None, None
+        self._pool_users = {} # havuz -> onu kullanan uçuştaki parti sayısı
+        self._pool_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='sismiq-parti')
+        self._pending = {} # anahtar -> uçuştaki sonuç (Future)
+        self._queue = []   # bir sonraki partiyi bekleyen anahtarlar
+        self._wakeup = self._slots = None
+        self.started = time.time()
+        self.counts = collections.Counter()
+        self.latency, self.engine_latency = LatencyWindow(), LatencyWindow()
+        self.batch_sizes = collections.deque(maxlen=GECIKME_ORNEK_SAYISI)
+    
+    # --- PARTİLEME ---
+    def _acquire_pool(self):
+        # Katalog sürümü değişince işçiler yeni indeksle kurulur. Eski havuz (işçiler ve paylaşımlı
+        # bellek) üzerindeki son parti bitince kapanır; kullanıcısı yoksa hemen kapanır.
+        # Katalog kilit altında alınır: eski sürümü görmüş bir parti eski havuzu yeniden kurdurmaz.
+        with self._pool_lock:
+            catalog = self.catalog.current()
+            if self._pool is None or self._pool_version != catalog.version:
+                retired = self._pool
+                self._pool, self._pool_version = EnginePool(catalog.index, self.workers), catalog.version
+                self._pool_users[self._pool] = 0
+                if retired is not None and not self._pool_users[retired]:
+                    del self._pool_users[retired]; retired.close()
+            self._pool_users[self._pool] += 1
+            return catalog, self._pool
+    
+    def _release_pool(self, pool):
+        with self._pool_lock:
+            if pool not in self._pool_users: return # servis kapanırken close() kapattı
+            self._pool_users[pool] -= 1
+            if pool is self._pool or self._pool_users[pool]: return
+            del self._pool_users[pool]
+        pool.close()
+    
+    @instrument.traced('service.evaluate')
+    def _evaluate(self, keys):
+        catalog, pool = self._acquire_pool()
+        try:
+            lats = np.array([k[0] for k in keys]); lons = np.array([k[1] for k in keys])
+            dates = pd.to_datetime(np.array([k[2] for k in keys], dtype='datetime64[ns]'))
+            n_chunks = max(1, min(self.workers, len(keys) // ISCI_BASINA_MIN_NOKTA))
+            tasks = list(zip(split_chunks(lats, n_chunks), split_chunks(lons, n_chunks), split_chunks(dates, n_chunks)))
+            reports = [r for chunk in pool.map(site_reports, tasks) for r in chunk]
+        finally: self._release_pool(pool)
+        for report in reports: report['Katalog Sürümü'] = catalog.version
+        return reports
+    
+    def _submit(self, func, *args):
+        # run_in_executor bağlamı taşımaz: izleme bayrağı (bkz. instrument) parti iş parçacığına kopyalanır.
+        return asyncio.get_running_loop().run_in_executor(self._executor, contextvars.copy_context().run, func, *args)
+    
+    async def score(self, lat, lon, date):
+        key = (lat, lon, to_ns(date))
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = asyncio.get_running_loop().create_future()
+            self._queue.append(key); self._wakeup.set()
+        else: self.counts['birlestirilen'] += 1
+        return await asyncio.shield(future)
+    
+    async def _batcher(self):
+        while True:
+            await self._wakeup.wait()
+            if len(self._queue) < self.max_batch: await asyncio.sleep(self.batch_window)
+            await self._slots.acquire()
+            batch, self._queue = self._queue[:self.max_batch], self._queue[self.max_batch:]
+            if not self._queue: self._wakeup.clear()
+            if batch: asyncio.create_task(self._run_batch(batch))
+            else: self._slots.release()
+    
+    async def _run_batch(self, keys):
+        started = time.perf_counter()
+        try:
+            reports = await self._submit(self._evaluate, keys)
+            for key, report in zip(keys, reports): self._pending.pop(key).set_result(report)
+        except Exception as e:
+            self.counts['motor_hatasi'] += 1
+            for key in keys:
+                future = self._pending.pop(key, None)
+                if future is not None and not future.done(): future.set_exception(e)
+        finally:
+            self._slots.release()
+            self.engine_latency.add(time.perf_counter() - started)
+            self.counts['parti'] += 1; self.batch_sizes.append(len(keys))
+    
+    # --- HTTP ---
+    def metrics(self):
+        sizes = np.fromiter(self.batch_sizes, dtype=np.int64) if self.batch_sizes else np.zeros(1, dtype=np.int64)
+        return {
+            'calisma_suresi_s': round(time.time() - self.started, 1),
+            'istek': self.counts['istek'], 'nokta': self.counts['nokta'], 'birlestirilen': self.counts['birlestirilen'],
+            'hatali_istek': self.counts['hatali_istek'], 'motor_hatasi': self.counts['motor_hatasi'],
+            'parti': self.counts['parti'], 'ortalama_parti': round(float(sizes.mean()), 2), 'en_buyuk_parti': int(sizes.max()),
+            'kuyruk': len(self._queue), 'ucustaki': len(self._pending),
+            'gecikme_ms': self.latency.summary(), 'motor_ms': self.engine_latency.summary(),
+            'katalog_surumu': self._pool_version,
+            # SISMIQ_IZLEME=1 ile başlatılan serviste aşama süreleri (bkz. instrument).
+            **({'asamalar': instrument.stats()} if instrument.enabled() else {}),
+        }
+    
+    async def dispatch(self, method, target, body):
+        url = urlsplit(target)
+        if url.path == '/health':
+            catalog = self.catalog.current()
+            return 200, {'durum': 'ok', 'katalog_surumu': catalog.version, 'deprem_sayisi': len(catalog.df)}
+        if url.path == '/metrics': return 200, self.metrics()
+        if url.path != '/score': return 404, {'hata': f"bilinmeyen yol: {url.path}"}
+        if method == 'GET':
+            self.counts['nokta'] += 1
+            return 200, await self.score(*parse_point(parse_qs(url.query)))
+        if method != 'POST': return 405, {'hata': "yalnızca GET ve POST"}
+        try: payload = json.loads(body or b'null')
+        except ValueError: raise ValueError("gövde geçerli JSON değil")
+        items = payload if isinstance(payload, list) else [payload]
+        if not all(isinstance(item, dict) for item in items): raise ValueError("gövde nesne veya nesne listesi olmalıdır")
+        points = [parse_point(item) for item in items]
+        self.counts['nokta'] += len(points)
+        reports = await asyncio.gather(*(self.score(*p) for p in points))
+        return 200, reports if isinstance(payload, list) else reports[0]
+    
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip(): break
+                method, target, version = request_line.decode('latin-1').split()
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length') or 0)
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+                started = time.perf_counter()
+                if length > EN_BUYUK_GOVDE_BAYT: status, payload, keep_alive = 413, {'hata': "gövde çok büyük"}, False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    self.counts['istek'] += 1
+                    try: status, payload = await self.dispatch(method, target, body)
+                    except ValueError as e: status, payload = 400, {'hata': str(e)}
+                    except Exception as e: status, payload = 500, {'hata': f"{type(e).__name__}: {e}"}
+                    if status == 200 and urlsplit(target).path == '/score': self.latency.add(time.perf_counter() - started)
+                    elif status != 200: self.counts['hatali_istek'] += 1
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                writer.write(f"HTTP/1.1 {status} {HTTP_DURUMLARI[status]}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data)
+                await writer.drain()
+                if not keep_alive: break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError): pass
+        finally:
+            writer.close()
+    
+    async def serve(self, host=SERVIS_ADRESI, port=SERVIS_PORTU, on_ready=None):
+        self._wakeup, self._slots = asyncio.Event(), asyncio.Semaphore(self.workers)
+        # İlk istek beklemesin: katalog, işçiler ve motor bir deneme partisiyle önceden ısıtılır.
+        # İşçiler dinleme soketi açılmadan doğar; soket alt süreçlere miras kalmaz.
+        await self._submit(self._evaluate, [(39.0, 35.0, to_ns(datetime.date.today()))])
+        batcher = asyncio.create_task(self._batcher())
+        server = await asyncio.start_server(self.handle, host, port)
+        # SIGTERM/SIGINT sunucuyu kapatır; işçi süreçleri ve paylaşımlı bellek serbest bırakılır.
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try: asyncio.get_running_loop().add_signal_handler(sig, server.close)
+            except (NotImplementedError, RuntimeError): pass
+        if on_ready: on_ready(server.sockets[0].getsockname())
+        try:
+            async with server: await server.serve_forever()
+        except asyncio.CancelledError: pass
+        finally:
+            batcher.cancel()
+            self.close()
+    
+    def close(self):
+        self._executor.shutdown(wait=False)
+        with self._pool_lock:
+            pools, self._pool_users, self._pool = list(self._pool_users), {}, None
+        for pool in pools: pool.close()
+
+def run_service(filepath, host=SERVIS_ADRESI, port=SERVIS_PORTU, **kwargs):
+    service = ScoringService(filepath, **kwargs)
+    catalog = service.catalog.current()
+    if catalog is None or catalog.df.empty:
+        print(f"sismiq: katalog okunamadı: {filepath}", file=sys.stderr); return 2
+    ready = lambda address: print(f"sismiq: http://{address[0]}:{address[1]} dinleniyor (katalog sürüm {service.catalog.current().version})", file=sys.stderr, flush=True)
+    try: asyncio.run(service.serve(host, port, ready))
+    except KeyboardInterrupt: pass
+    return 0
@@ -0,0 +1,303 @@
+import numpy as np
+import pandas as pd
+
+# Mekansal İndeks (Kova Boyutu, Derece)
+MEKANSAL_HUCRE_DERECE = 0.5
+# Büyük Deprem Eşiği (post-sismik, tetiklenme ve doğrulama sorguları)
+BUYUK_DEPREM_BUYUKLUGU = 5.5
+# Yarıçap sorgusu kutusu için derece başına km (haversine'in 111.19'undan küçük: kutu biraz geniş kalır)
+KM_PER_DERECE_ALT_SINIR = 111.0
+# Sıkıştırılmış indeks: koordinatlar float32 (~0.2 m), büyüklükler int16 olarak 0.1 biriminde,
+# zamanlar int64 epoch saniye, olay bayrakları tek bayt (bit alanı).
+BUYUKLUK_OLCEGI = 10
+BAYRAK_DOLUNAY = 1
+# Katalog koordinatlarının ondalık basamağı: float32 değer buna yuvarlanınca kataloğun float64 değeri geri gelir.
+KATALOG_ONDALIK = 4
+
+# --- MEKANSAL İNDEKS ---
+# Katalog bir kez enlem/boylam kovalarına dizilir; kutu sorguları tüm kataloğu
+# değil, yalnızca kutuyla kesişen kovaların ardışık dilimlerini tarar.
+def to_ns(date):
+    return pd.Timestamp(date).as_unit('ns').value
+
+def to_epoch(date, ceil=False):
+    # Olay zamanları tam saniyedir: '<=' / '>' sınırları aşağı, '>=' / '<' sınırları yukarı yuvarlanır.
+    ns = to_ns(date)
+    return -(-ns // 10**9) if ceil else ns // 10**9
+
+def mag_code(mag):
+    # Büyüklük (veya eşik) -> indeksteki int16 değeri; katalog büyüklükleri tek ondalıklıdır.
+    return np.round(np.asarray(mag, dtype=np.float64) * BUYUKLUK_OLCEGI).astype(np.int16)
+
+def haversine_vectorized(lat1, lon1, lat2_array, lon2_array):
+    # float32 katalog koordinatları mesafe hesabında float64'e yükseltilir.
+    lat2_array, lon2_array = np.asarray(lat2_array, dtype=np.float64), np.asarray(lon2_array, dtype=np.float64)
+    R = 6371
+    phi1, phi2 = np.radians(lat1), np.radians(lat2_array)
+    dphi = np.radians(lat2_array - lat1)
+    dlambda = np.radians(lon2_array - lon1)
+    a = np.sin(dphi/2)**2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
+
+def expand_ranges(starts, lengths):
+    owner = np.repeat(np.arange(len(lengths)), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    return owner, starts[owner] + np.arange(len(owner)) - offsets[owner]
+
+class SpatialIndex:
+    ARRAY_FIELDS = ('lat', 'lon', 'mag10', 't', 'flags', 'offsets', 'times', 't_rank', 'time_order', 't_sorted')
+    META_FIELDS = ('cell_deg', 'lat0', 'lon0', 'n_rows', 'n_cols')
+
+    def __init__(self, df, cell_deg=MEKANSAL_HUCRE_DERECE):
+        # Kovalar saklanan float32 değerlerden hesaplanır; kutu süzgeci de aynı değerlere bakar.
+        lat = df['Enlem'].to_numpy(dtype=np.float32).astype(np.float64)
+        lon = df['Boylam'].to_numpy(dtype=np.float32).astype(np.float64)
+        self.cell_deg = cell_deg
+        self.lat0 = np.floor(lat.min()) if len(lat) else 0.0
+        self.lon0 = np.floor(lon.min()) if len(lon) else 0.0
+        rows = ((lat - self.lat0) // cell_deg).astype(np.int64)
+        cols = ((lon - self.lon0) // cell_deg).astype(np.int64)
+        self.n_rows = int(rows.max()) + 1 if len(rows) else 0
+        self.n_cols = int(cols.max()) + 1 if len(cols) else 0
+        keys = rows * self.n_cols + cols
+        order = np.argsort(keys, kind='stable')
+        self.offsets = np.searchsorted(keys[order], np.arange(self.n_rows * self.n_cols + 1))
+
+        # Olay dizileri sıkıştırılmış tiplerle tutulur (bkz. BUYUKLUK_OLCEGI); motor bunları kopyalamadan okur.
+        self.lat, self.lon = lat[order].astype(np.float32), lon[order].astype(np.float32)
+        self.mag10 = mag_code(df['Mag'].to_numpy())[order]
+        self.t = df['Tarih'].to_numpy().astype('datetime64[s]').view(np.int64)[order] # epoch saniye
+        self.flags = np.where(df['Dolunay'].to_numpy() != 0, BAYRAK_DOLUNAY, 0).astype(np.uint8)[order]
+        # Zaman sırası: pencere sorguları olay zamanı yerine bu sıra üzerinden yapılır.
+        self.times = np.unique(self.t)
+        self.t_rank = np.searchsorted(self.times, self.t)
+        # Zaman sıralı görünüm: time_order kova sıralı dizilere işaret eder, t_sorted artan zamandır.
+        self.time_order = np.argsort(self.t, kind='stable')
+        self.t_sorted = self.t[self.time_order]
+        self.neighbours = None # Sabit ızgaranın komşu tablosu (varsa), bkz. NeighbourTable.
+
+    def __len__(self):
+        return len(self.lat)
+
+    def appended(self, df):
+        # Son olaydan sonra gelen olaylar eklenmiş indeks, yeniden sıralamadan: her olay kovasının
+        # sonuna yerleşir (tam derlemedeki kararlı sırayla aynı), eski zaman sıraları değişmez.
+        # Dönen: (indeks, eski olayların yeni yerleri, df satırlarının yerleri); olaylar son olaydan
+        # önce/aynı saniyede ya da kova ızgarasının dışındaysa None (tam derleme gerekir).
+        lat = df['Enlem'].to_numpy(dtype=np.float32).astype(np.float64)
+        lon = df['Boylam'].to_numpy(dtype=np.float32).astype(np.float64)
+        t = df['Tarih'].to_numpy().astype('datetime64[s]').view(np.int64)
+        if not len(t) or not len(self) or t.min() <= self.t_sorted[-1]: return None
+        rows = ((lat - self.lat0) // self.cell_deg).astype(np.int64)
+        cols = ((lon - self.lon0) // self.cell_deg).astype(np.int64)
+        if rows.min() < 0 or rows.max() >= self.n_rows or cols.min() < 0 or cols.max() >= self.n_cols: return None
+        keys = rows * self.n_cols + cols
+        order = np.argsort(keys, kind='stable')
+        at = self.offsets[keys[order] + 1] # yeni olay, kovasının son eski olayından sonra gelir
+        positions = np.empty(len(t), dtype=np.int64)
+        positions[order] = at + np.arange(len(t))
+        old_positions = np.arange(len(self)) + np.searchsorted(at, np.arange(len(self)), side='right')
+
+        index = SpatialIndex.__new__(SpatialIndex)
+        index.__dict__.update({name: getattr(self, name) for name in self.META_FIELDS})
+        index.offsets = self.offsets + np.searchsorted(keys[order], np.arange(len(self.offsets)))
+        def merged(old, new):
+            out = np.empty(len(old) + len(new), dtype=old.dtype)
+            out[old_positions] = old; out[positions] = new
+            return out
+        index.lat, index.lon = merged(self.lat, lat.astype(np.float32)), merged(self.lon, lon.astype(np.float32))
+        index.mag10 = merged(self.mag10, mag_code(df['Mag'].to_numpy()))
+        index.t = merged(self.t, t)
+        index.flags = merged(self.flags, np.where(df['Dolunay'].to_numpy() != 0, BAYRAK_DOLUNAY, 0).astype(np.uint8))
+        index.times = np.concatenate([self.times, np.unique(t)])
+        index.t_rank = merged(self.t_rank, np.searchsorted(index.times, t))
+        # Aynı saniyedeki yeni olaylar, tam derlemedeki kararlı sıralamada olduğu gibi yerlerine göre dizilir.
+        new_order = np.lexsort((positions, t))
+        index.time_order = np.concatenate([old_positions[self.time_order], positions[new_order]])
+        index.t_sorted = np.concatenate([self.t_sorted, t[new_order]])
+        index.neighbours = None
+        return index, old_positions, positions
+
+    # Paylaşımlı bellek ve önbellek için: dizileri ve ölçekleri ayrı ayrı verir / geri kurar.
+    # Komşu tablosu dizileri 'nb_' önekiyle aynı sözlükte taşınır.
+    def to_arrays(self):
+        arrays = {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+        if self.neighbours is not None:
+            arrays.update({f"nb_{name}": arr for name, arr in self.neighbours.to_arrays().items()})
+        return arrays, {name: getattr(self, name) for name in self.META_FIELDS}
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        index = cls.__new__(cls)
+        index.__dict__.update({name: arrays[name] for name in cls.ARRAY_FIELDS}); index.__dict__.update(meta)
+        nb_arrays = {name[3:]: arr for name, arr in arrays.items() if name.startswith('nb_')}
+        index.neighbours = NeighbourTable.from_arrays(nb_arrays) if nb_arrays else None
+        return index
+
+    def query_box_many(self, lat_min, lat_max, lon_min, lon_max):
+        # Her kutu için (kutu no, olay no) çiftleri; kutular sayısal dizilerdir.
+        lat_min, lat_max = np.atleast_1d(lat_min), np.atleast_1d(lat_max)
+        lon_min, lon_max = np.atleast_1d(lon_min), np.atleast_1d(lon_max)
+        empty = np.zeros(0, dtype=np.int64)
+        if self.n_rows == 0: return empty, empty
+
+        r_lo = np.clip((lat_min - self.lat0) // self.cell_deg, 0, self.n_rows - 1).astype(np.int64)
+        r_hi = np.clip((lat_max - self.lat0) // self.cell_deg, -1, self.n_rows - 1).astype(np.int64)
+        c_lo = np.clip((lon_min - self.lon0) // self.cell_deg, 0, self.n_cols - 1).astype(np.int64)
+        c_hi = np.clip((lon_max - self.lon0) // self.cell_deg, -1, self.n_cols - 1).astype(np.int64)
+        n_row_span = np.where(c_hi >= c_lo, np.maximum(r_hi - r_lo + 1, 0), 0)
+
+        # Her kova satırında kutunun kapsadığı kovalar katalogda ardışıktır.
+        box_of_row, rows = expand_ranges(r_lo, n_row_span)
+        starts = self.offsets[rows * self.n_cols + c_lo[box_of_row]]
+        ends = self.offsets[rows * self.n_cols + c_hi[box_of_row] + 1]
+        slice_owner, idx = expand_ranges(starts, ends - starts)
+        owner = box_of_row[slice_owner]
+
+        keep = ((self.lat[idx] >= lat_min[owner]) & (self.lat[idx] <= lat_max[owner]) &
+                (self.lon[idx] >= lon_min[owner]) & (self.lon[idx] <= lon_max[owner]))
+        return owner[keep], idx[keep]
+
+    def query_box(self, lat_min, lat_max, lon_min, lon_max):
+        return self.query_box_many(lat_min, lat_max, lon_min, lon_max)[1]
+
+    def time_window(self, start=None, end=None, include_start=True, include_end=True):
+        # Zaman sıralı görünümde [start, end] penceresi; iki ikili arama, maske yok.
+        lo, hi = 0, len(self.t_sorted)
+        if start is not None:
+            lo = np.searchsorted(self.t_sorted, to_epoch(start, ceil=include_start), side='left' if include_start else 'right')
+        if end is not None:
+            hi = np.searchsorted(self.t_sorted, to_epoch(end, ceil=not include_end), side='right' if include_end else 'left')
+        return slice(int(lo), int(max(lo, hi)))
+
+    def events_between(self, start=None, end=None, include_start=True, include_end=True):
+        return self.time_order[self.time_window(start, end, include_start, include_end)]
+
+    def radius_query(self, lat, lon, radius_km, end=None):
+        # Noktanın radius_km çevresindeki olaylar (olay no, mesafe), yeniden eskiye. Adaylar yarıçapı
+        # kapsayan kutunun kovalarından gelir; katalog boyutunda hiçbir dizi oluşturulmaz.
+        half_lat = radius_km / KM_PER_DERECE_ALT_SINIR
+        half_lon = half_lat / max(np.cos(np.radians(min(abs(lat) + half_lat, 89.9))), 1e-6)
+        idx = self.query_box(lat - half_lat, lat + half_lat, lon - half_lon, lon + half_lon)
+        if end is not None: idx = idx[self.t[idx] <= to_epoch(end)]
+        # Listelenen mesafeler kataloğun float64 koordinatlarından hesaplanır (eski geçmiş listesiyle aynı).
+        dist = haversine_vectorized(lat, lon, *self.catalog_coords(idx))
+        keep = dist <= radius_km; idx, dist = idx[keep], dist[keep]
+        order = np.lexsort((-idx, -self.t[idx]))
+        return idx[order], dist[order]
+
+    def catalog_coords(self, idx):
+        return (self.lat[idx].astype(np.float64).round(KATALOG_ONDALIK),
+                self.lon[idx].astype(np.float64).round(KATALOG_ONDALIK))
+
+    def large_events(self, min_mag=BUYUK_DEPREM_BUYUKLUGU):
+        # Büyük deprem indeksi ilk kullanımda kurulur (paylaşımlı bellekten gelen indekslerde de).
+        cache = self.__dict__.setdefault('_large_events', {})
+        if min_mag not in cache: cache[min_mag] = LargeEventIndex(self, min_mag)
+        return cache[min_mag]
+
+# --- BÜYÜK DEPREM UZAY-ZAMAN İNDEKSİ ---
+# M5.5+ olaylar kataloğun küçük bir kesridir; kendi kova indeksinde tutulur. Bir nokta
+# kümesinin bölgesindeki büyük olaylar (nokta, zaman sırası) anahtarlarıyla bir kez
+# sıralanır; "t'den sonraki ilk olay" ve "pencerede kaç olay" soruları her
+# (nokta, tarih) için tek ikili aramadır.
+class EventTimeTable:
+    def __init__(self, n_points, owner, ranks, key_base):
+        self.key_base = key_base
+        self.keys = np.sort(np.asarray(owner, dtype=np.int64) * key_base + ranks)
+        self.base = (np.arange(n_points) * key_base)[:, None]
+
+    def _positions(self, cut):
+        # cut: skaler, ortak kesim listesi ya da (nokta, kesim) matrisi.
+        return np.searchsorted(self.keys, self.base + np.atleast_2d(cut))
+
+    def count_between(self, lo_cut, hi_cut):
+        # [lo_cut, hi_cut) zaman sırası aralığındaki olay sayısı; (nokta, kesim) matrisi.
+        return self._positions(hi_cut) - self._positions(lo_cut)
+
+    def next_rank(self, cut):
+        # cut veya sonrasındaki ilk olayın zaman sırası; olay yoksa key_base.
+        keys = np.append(self.keys, np.iinfo(np.int64).max)
+        nxt = keys[self._positions(cut)] - self.base
+        return np.where(nxt < self.key_base, nxt, self.key_base)
+
+class LargeEventIndex:
+    NEVER = np.iinfo(np.int64).max
+
+    def __init__(self, index, min_mag=BUYUK_DEPREM_BUYUKLUGU):
+        sel = index.mag10 >= mag_code(min_mag)
+        self.min_mag = min_mag
+        self.events = SpatialIndex(pd.DataFrame({
+            'Enlem': index.lat[sel], 'Boylam': index.lon[sel], 'Mag': index.mag10[sel] / BUYUKLUK_OLCEGI,
+            'Tarih': index.t[sel].astype('datetime64[s]'), 'Dolunay': index.flags[sel] & BAYRAK_DOLUNAY}), index.cell_deg)
+        self.times = index.times
+        self.rank = np.searchsorted(index.times, self.events.t) # ana indeksin zaman sırası
+        self.key_base = len(index.times) + 1
+
+    def __len__(self):
+        return len(self.events)
+
+    def box_pairs(self, lats, lons, half_deg):
+        # Noktalar x büyük olaylar: |Δenlem| <= half_deg ve |Δboylam| <= half_deg.
+        lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+        pad = half_deg + 1e-9
+        owner, idx = self.events.query_box_many(lats - pad, lats + pad, lons - pad, lons + pad)
+        keep = (np.abs(self.events.lat[idx] - lats[owner]) <= half_deg) & (np.abs(self.events.lon[idx] - lons[owner]) <= half_deg)
+        return owner[keep], idx[keep]
+
+    def time_table(self, n_points, owner, idx):
+        return EventTimeTable(n_points, owner, self.rank[idx], self.key_base)
+
+    def next_after(self, lats, lons, dates, half_deg):
+        # Her noktanın kutusunda her tarihten (hariç) sonraki ilk büyük olayın zamanı (epoch saniye);
+        # yoksa NEVER. Kutu çiftleri tüm tarihler için bir kez toplanır: (nokta, tarih) matrisi.
+        lats = np.atleast_1d(lats)
+        if len(self) == 0: return np.full((len(lats), len(dates)), self.NEVER)
+        table = self.time_table(len(lats), *self.box_pairs(lats, np.atleast_1d(lons), half_deg))
+        ranks = table.next_rank(np.searchsorted(self.times, [to_epoch(d) for d in dates], side='right'))
+        return np.where(ranks < len(self.times), self.times[np.minimum(ranks, len(self.times) - 1)], self.NEVER)
+
+# --- SABİT IZGARA KOMŞU TABLOSU ---
+# Ulusal tarama ve doğrulama hep aynı ızgara hücrelerini puanlar. Her hücrenin
+# analiz yarıçapındaki olayları ve mesafeleri bir kez hesaplanıp CSR olarak tutulur:
+# hücre c'nin olayları idx[indptr[c]:indptr[c+1]], mesafeleri dist[...] aralığıdır.
+class NeighbourTable:
+    ARRAY_FIELDS = ('cell_lat', 'cell_lon', 'indptr', 'idx', 'dist', 'first_rank')
+
+    def __init__(self, cell_lat, cell_lon, indptr, idx, dist, first_rank):
+        self.cell_lat, self.cell_lon = cell_lat, cell_lon
+        self.indptr, self.idx, self.dist = indptr, idx, dist
+        self.first_rank = first_rank # hücrenin ±2° kutusundaki en erken olayın zaman sırası
+        self._keys = self._cell_keys(cell_lat, cell_lon)
+        self._key_order = np.argsort(self._keys, kind='stable')
+
+    def __len__(self):
+        return len(self.cell_lat)
+
+    @staticmethod
+    def _cell_keys(lats, lons):
+        return np.round(np.asarray(lats) * 1e6).astype(np.int64) * 2_000_000_000 + np.round(np.asarray(lons) * 1e6).astype(np.int64)
+
+    def to_arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(*(arrays[name] for name in cls.ARRAY_FIELDS))
+
+    def lookup(self, lats, lons):
+        # Noktaların hücre numaraları; koordinatı tam olarak tabloda olmayan nokta -1.
+        lats, lons = np.asarray(lats, dtype=np.float64), np.asarray(lons, dtype=np.float64)
+        if len(self) == 0: return np.full(len(lats), -1)
+        sorted_keys = self._keys[self._key_order]
+        keys = self._cell_keys(lats, lons)
+        pos = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+        cells = self._key_order[pos]
+        found = (sorted_keys[pos] == keys) & (self.cell_lat[cells] == lats) & (self.cell_lon[cells] == lons)
+        return np.where(found, cells, -1)
+
+    def pairs(self, cells):
+        # Hücreler x olaylar: (sıra no, olay no, mesafe) çiftleri ve hücrelerin ilk olay sırası.
+        owner, positions = expand_ranges(self.indptr[cells], self.indptr[cells + 1] - self.indptr[cells])
+        return owner, self.idx[positions], self.dist[positions], self.first_rank[cells]
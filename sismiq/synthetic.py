@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+
+from .catalog import KATALOG_SUTUNLARI
+from .engine import BUYUKLUK_FILTRESI, active_faults
+from .spatial import to_epoch, haversine_vectorized
+
+# -----------------------------------------------------------------------------
+# SENTETİK KATALOG
+# -----------------------------------------------------------------------------
+# Yük ve ölçek testleri için deprem.txt biçiminde (aynı başlık, sekmeyle ayrılmış aynı
+# sütunlar, CRLF) katalog yazılır. Olaylar parça parça üretilip hemen diske yazılır;
+# bellekte hiçbir zaman bir parçadan fazlası tutulmaz.
+SENTETIK_PARCA_BOYUTU = 200_000
+SENTETIK_TOHUM = 7
+SENTETIK_KONUM_SAPMASI = 0.05 # derece; örneklenen olayın çevresine eklenen gürültü
+SENTETIK_YER_ADI = "SENTETIK"
+
+# Model parametreleri: olaylar fay izleri boyunca kümelenir (kalanı ülke kapsamına düzgün
+# dağılır), büyüklükler kesik Gutenberg-Richter dağılımından gelir, SENTETIK_ARTCI_ESIGI
+# üstündeki her olay Omori-Utsu yasasıyla sönen bir artçı dizisi başlatır (verim
+# K x 10^(alfa (M - Mmin)), artçılar ana şoktan küçük, kırık uzunluğu ölçeğinde dağılır).
+SENTETIK_BASLANGIC, SENTETIK_BITIS = "2000-01-01", "2024-12-31"
+SENTETIK_KAPSAM = (36.0, 42.0, 26.0, 45.0) # enlem min, enlem max, boylam min, boylam max
+SENTETIK_B_DEGERI = 1.0
+SENTETIK_MIN_BUYUKLUK = BUYUKLUK_FILTRESI
+SENTETIK_MAX_BUYUKLUK = 7.9
+SENTETIK_FAY_ORANI = 0.7
+SENTETIK_FAY_SAPMASI_KM = 12.0
+SENTETIK_ARTCI_ESIGI = 5.0
+SENTETIK_ARTCI_VERIMI, SENTETIK_ARTCI_ALFA = 0.08, 0.9
+SENTETIK_OMORI_C_GUN, SENTETIK_OMORI_P = 0.05, 1.1
+SENTETIK_ARTCI_SURESI_GUN = 365
+ARKA_PLAN_YER_ADI, ARTCI_YER_ADI = "ARKA PLAN", "ARTCI"
+KM_PER_DERECE = 6371 * np.pi / 180
+
+def catalog_header():
+    return "No    \t" + "\t".join(KATALOG_SUTUNLARI[1:]) + "\r\n"
+
+def _fixed(values, decimals, width=0):
+    # Sabit ondalıklı sayı metni (np.strings ile vektörel; "%0{width}.{decimals}f" ile aynı).
+    values = np.asarray(values, dtype=np.float64)
+    scaled = np.round(np.abs(values) * 10**decimals).astype(np.int64)
+    whole = np.strings.zfill((scaled // 10**decimals).astype(str), max(width - decimals - 1, 1))
+    text = np.strings.add(np.strings.add(whole, '.'), np.strings.zfill((scaled % 10**decimals).astype(str), decimals))
+    return np.strings.add(np.where((values < 0) & (scaled > 0), '-', ''), text)
+
+def format_events(first_no, t, lat, lon, depth, mag, places=None, magnitudes=None, kinds=None):
+    # t: epoch saniye (yüzdelik saniye için ondalıklı olabilir); places: olay başına 'Yer' (varsayılan
+    # SENTETIK_YER_ADI); magnitudes: {'MD': dizi, ...} tür büyüklükleri (yoksa ML ve Mw = mag; NaN -> 0.0);
+    # kinds: olay başına 'Tip' (varsayılan 'Ke'). Dönen: katalog satırları (tek metin).
+    t = np.asarray(t, dtype=np.float64)
+    seconds = np.floor(t).astype(np.int64)
+    centis = np.round((t - seconds) * 100).astype(np.int64).clip(0, 99)
+    stamp = pd.to_datetime(seconds, unit='s')
+    year, month, day, hour, minute, second = (np.strings.zfill(getattr(stamp, name).to_numpy(dtype=np.int64).astype(str), 2)
+                                              for name in ('year', 'month', 'day', 'hour', 'minute', 'second'))
+    m = _fixed(mag, 1)
+    if magnitudes is None: by_type = {'MD': '0.0', 'ML': m, 'Mw': m, 'Ms': '0.0', 'Mb': '0.0'}
+    else: by_type = {k: _fixed(np.nan_to_num(np.asarray(magnitudes.get(k, np.zeros(len(t))), dtype=np.float64)), 1)
+                     for k in ('MD', 'ML', 'Mw', 'Ms', 'Mb')}
+    fields = [
+        np.strings.zfill(np.arange(first_no, first_no + len(t)).astype(str), 6),
+        np.strings.add(np.strings.add(np.strings.add(year, month), np.strings.add(day, hour)), np.strings.add(minute, second)),
+        np.strings.add(np.strings.add(np.strings.add(year, '.'), np.strings.add(month, '.')), day),
+        np.strings.add(np.strings.add(np.strings.add(hour, ':'), np.strings.add(minute, ':')),
+                       np.strings.add(np.strings.add(second, '.'), np.strings.zfill(centis.astype(str), 2))),
+        _fixed(lat, 4), _fixed(lon, 4), _fixed(depth, 1, width=5),
+        m, *by_type.values(), 'Ke' if kinds is None else np.asarray(kinds, dtype=str),
+        SENTETIK_YER_ADI if places is None else np.asarray(places, dtype=str),
+    ]
+    line = fields[0]
+    for field in fields[1:]: line = np.strings.add(np.strings.add(line, '\t'), field)
+    return '\r\n'.join(line.tolist()) + '\r\n' if len(line) else ''
+
+def write_catalog(path, chunks):
+    # chunks: (t, lat, lon, depth, mag[, places, magnitudes, kinds]) üreten yineleyici. Dönen: yazılan olay sayısı.
+    n = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(catalog_header())
+        for chunk in chunks:
+            f.write(format_events(n + 1, *chunk))
+            n += len(chunk[0])
+    return n
+
+def resampled_chunks(df, n_events, seed=SENTETIK_TOHUM, chunk_size=SENTETIK_PARCA_BOYUTU):
+    # Var olan kataloğun olayları yeniden örneklenir: konum ve büyüklük dağılımı korunur,
+    # zamanlar kataloğun süresine düzgün dağılır (parçalar birbirini izleyen zaman dilimleridir).
+    rng = np.random.default_rng(seed)
+    t0 = df['Tarih'].min().value // 10**9; t1 = df['Tarih'].max().value // 10**9
+    lat, lon, mag = df['Enlem'].to_numpy(), df['Boylam'].to_numpy(), df['Mag'].to_numpy()
+    depth = df['Derinlik'].to_numpy(dtype=np.float64)
+    for start in range(0, n_events, chunk_size):
+        size = min(chunk_size, n_events - start)
+        lo, hi = t0 + (t1 - t0) * start / n_events, t0 + (t1 - t0) * (start + size) / n_events
+        pick = rng.integers(0, len(df), size)
+        jitter = rng.normal(0, SENTETIK_KONUM_SAPMASI, (2, size))
+        yield (np.sort(rng.uniform(lo, hi, size)), lat[pick] + jitter[0], lon[pick] + jitter[1],
+               np.nan_to_num(depth[pick], nan=10.0), mag[pick])
+
+def gutenberg_richter(rng, size, b_value=SENTETIK_B_DEGERI, min_mag=SENTETIK_MIN_BUYUKLUK, max_mag=SENTETIK_MAX_BUYUKLUK):
+    # Kesik üstel dağılımın ters CDF'i; max_mag dizi olabilir (artçılar ana şoktan küçük).
+    span = 1 - 10 ** (-b_value * (np.asarray(max_mag) - min_mag))
+    return min_mag - np.log10(1 - rng.random(size) * span) / b_value
+
+def omori_delays(rng, size, max_days, c=SENTETIK_OMORI_C_GUN, p=SENTETIK_OMORI_P):
+    # Omori-Utsu yoğunluğu (t + c)^-p, [0, max_days] aralığında kesik; ters CDF ile gün cinsinden gecikme.
+    lo, hi = c ** (1 - p), (np.asarray(max_days) + c) ** (1 - p)
+    return (lo + rng.random(size) * (hi - lo)) ** (1 / (1 - p)) - c
+
+def _scatter(rng, lat, lon, sigma_km):
+    # Noktaların çevresine izotropik normal sapma (km cinsinden).
+    off = rng.normal(0, 1, (2, len(lat))) * sigma_km
+    return lat + off[0] / KM_PER_DERECE, lon + off[1] / (KM_PER_DERECE * np.cos(np.radians(lat)))
+
+def model_chunks(n_events, start=SENTETIK_BASLANGIC, end=SENTETIK_BITIS, seed=SENTETIK_TOHUM, b_value=SENTETIK_B_DEGERI,
+                 fault_fraction=SENTETIK_FAY_ORANI, faults=None, chunk_size=SENTETIK_PARCA_BOYUTU):
+    # Her parça ardışık bir zaman dilimidir: önce bağımsız (ana) olaylar, ardından artçıları
+    # üretilir; parça tam chunk_size olaya ulaşınca son dizinin kalan artçıları atılır.
+    # Artçılar bir sonraki dilime taşabilir; ayrıştırıcı kataloğu zaten zamana göre sıralar.
+    rng = np.random.default_rng(seed)
+    faults = faults or active_faults()
+    seg_km = haversine_vectorized(faults.seg_lat1, faults.seg_lon1, faults.seg_lat2, faults.seg_lon2)
+    seg_p = seg_km / seg_km.sum()
+    lat_min, lat_max, lon_min, lon_max = SENTETIK_KAPSAM
+    t0, t1 = to_epoch(start), to_epoch(end)
+    for first in range(0, n_events, chunk_size):
+        size = min(chunk_size, n_events - first)
+        lo, hi = t0 + (t1 - t0) * first / n_events, t0 + (t1 - t0) * (first + size) / n_events
+
+        # Ana olaylar: aday sayısı parça boyu kadar; artçılarla birlikte parçayı dolduranlar kullanılır.
+        mag = gutenberg_richter(rng, size, b_value)
+        n_after = np.where(mag >= SENTETIK_ARTCI_ESIGI,
+                           rng.poisson(SENTETIK_ARTCI_VERIMI * 10 ** (SENTETIK_ARTCI_ALFA * (mag - SENTETIK_MIN_BUYUKLUK))), 0)
+        total = np.cumsum(1 + n_after)
+        n_main = int(np.searchsorted(total, size)) + 1
+        mag, n_after = mag[:n_main], n_after[:n_main]
+        n_after[-1] -= int(total[n_main - 1] - size)
+        t = rng.uniform(lo, hi, n_main)
+
+        on_fault = rng.random(n_main) < fault_fraction
+        seg = rng.choice(len(seg_p), n_main, p=seg_p)
+        along = rng.random(n_main)
+        f_lat, f_lon = _scatter(rng, faults.seg_lat1[seg] + along * (faults.seg_lat2[seg] - faults.seg_lat1[seg]),
+                                faults.seg_lon1[seg] + along * (faults.seg_lon2[seg] - faults.seg_lon1[seg]), SENTETIK_FAY_SAPMASI_KM)
+        lat = np.where(on_fault, f_lat, rng.uniform(lat_min, lat_max, n_main))
+        lon = np.where(on_fault, f_lon, rng.uniform(lon_min, lon_max, n_main))
+        places = np.where(on_fault, faults.names[faults.seg_fault[seg]].astype(str), ARKA_PLAN_YER_ADI)
+
+        # Artçılar: kırık uzunluğu (Wells-Coppersmith, ~10^(0.5 M - 1.8) km) ölçeğinde saçılır.
+        parent = np.repeat(np.arange(n_main), n_after)
+        if len(parent):
+            a_days = omori_delays(rng, len(parent), np.minimum(SENTETIK_ARTCI_SURESI_GUN, (t1 - t[parent]) / 86400))
+            a_lat, a_lon = _scatter(rng, lat[parent], lon[parent], 0.5 * 10 ** (0.5 * mag[parent] - 1.8))
+            a_mag = gutenberg_richter(rng, len(parent), b_value, max_mag=mag[parent] - 0.1)
+            t = np.concatenate([t, t[parent] + a_days * 86400])
+            lat, lon, mag = np.concatenate([lat, a_lat]), np.concatenate([lon, a_lon]), np.concatenate([mag, a_mag])
+            places = np.concatenate([places, np.full(len(parent), ARTCI_YER_ADI)])
+        depth = np.clip(rng.gamma(2.0, 5.0, len(t)), 0, 150)
+        order = np.argsort(t, kind='stable')
+        yield t[order], lat[order], lon[order], depth[order], np.minimum(mag[order], SENTETIK_MAX_BUYUKLUK), places[order]
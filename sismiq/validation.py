@@ -0,0 +1,41 @@
+import datetime
+import numpy as np
+
+from .engine import calculate_risk_grid, grid_indicators
+from .spatial import to_epoch
+
+# -----------------------------------------------------------------------------
+# BİLİMSEL DOĞRULAMA (RECALL / PRECISION)
+# -----------------------------------------------------------------------------
+RECALL_GECIKMELERI = [7, 30, 90, 180, 365, 540]
+TAKIP_KUTU_DERECE = 1.5 # Netlik: doğrulayan depremin arandığı kutu (±derece)
+TAKIP_SURESI_GUN = 730  # Netlik: doğrulayan depremin beklendiği süre
+
+def recall_lag_flags(index, quakes):
+    # quakes: (enlem, boylam, tarih) listesi; her deprem x gecikme için uyarı verildi mi?
+    # Her depremin kendi gecikme tarihleri (deprem, gecikme) matrisi olarak tek motor çağrısında puanlanır.
+    if not len(quakes): return np.zeros((0, len(RECALL_GECIKMELERI)), dtype=bool)
+    lats, lons, tarihler = zip(*quakes)
+    dates = [[t - datetime.timedelta(days=d) for d in RECALL_GECIKMELERI] for t in tarihler]
+    scores = grid_indicators(index, lats, lons, dates)['scores']
+    return (scores >= 50) & (scores != 9999)
+
+def recall_hits(index, quakes):
+    # Her deprem için erken uyarı (herhangi bir gecikmede) verildi mi?
+    return recall_lag_flags(index, quakes).any(axis=1).tolist()
+
+def followup_hits_many(index, dates, lats, lons):
+    # Her hücrenin ±1.5° kutusunda her tarihten sonraki 2 yıl içinde M5.5+ deprem oldu mu?
+    # Büyük deprem indeksinden tarihten sonraki ilk olay bulunur; pencere sonuyla karşılaştırılır.
+    next_t = index.large_events().next_after(lats, lons, dates, TAKIP_KUTU_DERECE)
+    ends = [to_epoch(t + datetime.timedelta(days=TAKIP_SURESI_GUN), ceil=True) for t in dates]
+    return next_t < np.array(ends, dtype=np.int64)[None, :]
+
+def followup_hits(index, t, lats, lons):
+    return followup_hits_many(index, [t], lats, lons)[:, 0]
+
+def precision_counts(index, t, lats, lons):
+    scores, _, _ = calculate_risk_grid(index, lats, lons, [t])
+    flagged = (scores[:, 0] >= 50) & (scores[:, 0] != 9999)
+    confirmed = int(followup_hits(index, t, lats[flagged], lons[flagged]).sum())
+    return int(flagged.sum()), confirmed
@@ -0,0 +1,44 @@
+import os
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import instrument
+from .spatial import SpatialIndex
+
+# -----------------------------------------------------------------------------
+# HAVUZ İŞÇİLERİ
+# -----------------------------------------------------------------------------
+# EnginePool işçilerinin başlatıcısı ve görev sarmalayıcısı. Forkserver bu modülü
+# önceden yükler (bkz. parallel._mp_context); işçiler sunucudan çatallandığında
+# sismiq hazırdır. Modül app.py'yi ve Streamlit'i içe aktarmaz.
+_WORKER_INDEX = None
+_WORKER_BLOCKS = []
+
+def attach(spec, meta):
+    global _WORKER_INDEX
+    arrays = {}
+    for name, (shm_name, shape, dtype) in spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _WORKER_BLOCKS.append(shm)
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        arr.flags.writeable = False
+        arrays[name] = arr
+    _WORKER_INDEX = SpatialIndex.from_arrays(arrays, meta)
+
+def run_task(func, args, tracing=False):
+    # İzleme açıksa görevin aşama aralıkları sonuçla birlikte ana sürece döner.
+    instrument.enable(tracing)
+    if not tracing: return func(_WORKER_INDEX, *args), None
+    return instrument.capture(func, _WORKER_INDEX, *args)
+
+# Forkserver'ın her çocuğu, sunucunun __main__ modülü aynı dosya değilse üst sürecin ana
+# betiğini "__mp_main__" adıyla yeniden yürütür; Streamlit'te bu, arayüz betiğinin (app.py)
+# her işçide baştan çalışması demektir. Üst süreç betiğin yolunu ortam değişkeniyle bildirir;
+# sunucu (kendi betik dosyası olmayan "-c" süreci) bu modülü yüklerken yolu __main__'ine
+# yazar ve çocuklar betiği yüklenmiş sayar. İşçi görevleri yalnızca sismiq işlevleridir.
+ANA_BETIK_DEGISKENI = 'SISMIQ_ANA_BETIK'
+_main_path = os.environ.get(ANA_BETIK_DEGISKENI)
+if _main_path and getattr(sys.modules['__main__'], '__file__', None) is None:
+    sys.modules['__main__'].__file__ = _main_path
@@ -0,0 +1,26 @@
+import os
+import pytest
+
+from sismiq.catalog import parse_catalog, compile_index
+from . import reference
+
+KATALOG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'deprem.txt')
+
+@pytest.fixture(scope='session')
+def catalog_df():
+    return parse_catalog(KATALOG)
+
+@pytest.fixture(scope='session')
+def index(catalog_df):
+    return compile_index(catalog_df)
+
+@pytest.fixture(scope='session')
+def reference_df():
+    return reference.load_data(KATALOG)
+
+@pytest.fixture(scope='session')
+def catalog_lines():
+    # deprem.txt: (başlık satırları, veri satırları) bayt olarak; parça parça kataloglar bunlardan yazılır.
+    with open(KATALOG, 'rb') as f: lines = f.read().splitlines(keepends=True)
+    start = next(i for i, line in enumerate(lines) if b"Olus tarihi" in line or b"Enlem" in line) + 1
+    return lines[:start], [line for line in lines[start:] if line.strip()]
@@ -0,0 +1,219 @@
+import datetime
+import numpy as np
+import pandas as pd
+
+# -----------------------------------------------------------------------------
+# REFERANS MOTOR
+# -----------------------------------------------------------------------------
+# Hız çalışmalarından önceki app.py'deki yükleyici ve risk motorunun değiştirilmemiş
+# kopyası (satır satır ayrıştırma, tüm katalog üzerinde maskeler). Testler sismiq'in
+# sonuçlarını bu sürüme sabitler; buradaki kod yalnızca karşılaştırma içindir.
+
+# Analiz Parametreleri
+ANALIZ_YARICAP_KM = 150
+POST_SISMIK_YARICAP_KM = 50
+TETIKLENME_YARICAP_KM = 150
+BUYUKLUK_FILTRESI = 3.5
+FAY_TAMPON_BOLGESI_KM = 35
+MIN_DEPREM_SAYISI = 20
+RAPOR_ALT_LIMIT = 126
+
+# Fay Hatları
+ACTIVE_FAULTS = {
+    "KAF - Doğu": ((39.1, 40.9), (39.7, 39.5)), "KAF - Orta": ((39.7, 39.5), (40.7, 31.6)),
+    "KAF - Batı": ((40.7, 31.6), (40.7, 29.9)), "KAF - Marmara": ((40.7, 29.9), (40.8, 27.0)),
+    "KAF - Bursa": ((40.5, 30.2), (40.2, 28.0)), "DAF - Bingöl": ((39.0, 40.8), (38.3, 39.0)),
+    "DAF - Maraş": ((38.3, 39.0), (37.5, 37.0)), "DAF - Hatay": ((37.5, 37.0), (36.0, 36.0)),
+    "Ölüdeniz": ((36.0, 36.0), (34.0, 36.1)), "Ege Grabenleri": ((38.5, 28.5), (37.5, 27.0)),
+    "Tuz Gölü": ((39.0, 33.5), (37.5, 33.8)), "Ecemiş": ((38.5, 35.0), (37.0, 34.8)),
+    "Van Gölü": ((38.3, 42.8), (38.7, 44.0)), "Eskişehir": ((39.8, 30.5), (39.5, 32.5)),
+    "Malatya-Ovacık": ((39.5, 39.0), (38.3, 38.0))
+}
+
+def load_data(filepath):
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f: lines = f.readlines()
+    except:
+        try:
+            with open(filepath, 'r', encoding='cp1254') as f: lines = f.readlines()
+        except:
+            return pd.DataFrame()
+            
+    start_line = 0
+    for i, line in enumerate(lines):
+        if "Olus tarihi" in line or "Enlem" in line: start_line = i + 1; break
+    parsed_data = []
+    for line in lines[start_line:]:
+        parts = line.split()
+        if len(parts) < 10: continue
+        try:
+            date_str, time_str = parts[2], parts[3]
+            lat, lon, mag = float(parts[4]), float(parts[5]), float(parts[7])
+            if mag == 0.0: mag = float(parts[9])
+            parsed_data.append([f"{date_str} {time_str[:8]}", lat, lon, mag])
+        except: continue
+    df = pd.DataFrame(parsed_data, columns=['TarihStr', 'Enlem', 'Boylam', 'Mag'])
+    df['Tarih'] = pd.to_datetime(df['TarihStr'], format="%Y.%m.%d %H:%M:%S", errors='coerce')
+    df.drop(columns=['TarihStr'], inplace=True)
+    df.dropna(subset=['Tarih'], inplace=True)
+    
+    ref_new_moon = pd.Timestamp("1988-12-09 01:39:00")
+    days = (df['Tarih'] - ref_new_moon).dt.total_seconds() / 86400.0
+    current_phase_day = days % 29.53059
+    df['Dolunay'] = ((current_phase_day >= 13.5) & (current_phase_day <= 16.5)).astype(int)
+    return df
+
+def haversine_vectorized(lat1, lon1, lat2_array, lon2_array):
+    R = 6371
+    phi1, phi2 = np.radians(lat1), np.radians(lat2_array)
+    dphi = np.radians(lat2_array - lat1)
+    dlambda = np.radians(lon2_array - lon1)
+    a = np.sin(dphi/2)**2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return R * c
+
+def distance_point_to_segment_scalar(px, py, x1, y1, x2, y2):
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0: return math.sqrt((px-x1)**2 + (py-y1)**2) * 111 
+    t = ((px - x1) * dx + (py - y1) * dy) / (dx*dx + dy*dy)
+    if t < 0: closest_x, closest_y = x1, y1
+    elif t > 1: closest_x, closest_y = x2, y2
+    else: closest_x, closest_y = x1 + t * dx, y1 + t * dy
+    return haversine_vectorized(py, px, np.array([closest_y]), np.array([closest_x]))[0]
+
+def check_fault_proximity(user_lat, user_lon):
+    closest_dist = 9999
+    closest_fault_name = None
+    for name, coords in ACTIVE_FAULTS.items():
+        (lat1, lon1), (lat2, lon2) = coords
+        if abs(user_lat - (lat1+lat2)/2) > 2.5: continue
+        dist = distance_point_to_segment_scalar(user_lon, user_lat, lon1, lat1, lon2, lat2)
+        if dist < closest_dist:
+            closest_dist = dist
+            closest_fault_name = name
+    if closest_dist <= FAY_TAMPON_BOLGESI_KM: return True, closest_fault_name
+    return False, "Ana Faylara Uzak"
+
+def calculate_b_value(magnitudes):
+    if len(magnitudes) < 15: return None
+    mags_above = magnitudes[magnitudes >= BUYUKLUK_FILTRESI]
+    if len(mags_above) < 15: return None
+    mean_mag = np.mean(mags_above)
+    if mean_mag == BUYUKLUK_FILTRESI: return 1.0
+    return 0.4343 / (mean_mag - BUYUKLUK_FILTRESI)
+
+def calculate_risk_engine(df, lat, lon, simdi):
+    is_on_fault, fault_name = check_fault_proximity(lat, lon)
+    
+    lat_min, lat_max = lat - 2.0, lat + 2.0
+    lon_min, lon_max = lon - 2.0, lon + 2.0
+    subset = df[(df['Enlem'] >= lat_min) & (df['Enlem'] <= lat_max) &
+                (df['Boylam'] >= lon_min) & (df['Boylam'] <= lon_max) &
+                (df['Tarih'] <= simdi)]
+    
+    if len(subset) == 0: return 0, [], "Veri Yok"
+
+    dists = haversine_vectorized(lat, lon, subset['Enlem'].values, subset['Boylam'].values)
+    subset = subset.assign(Mesafe=dists)
+    
+    final_df = subset[(subset['Mesafe'] <= ANALIZ_YARICAP_KM) & (subset['Mag'] >= BUYUKLUK_FILTRESI)]
+    
+    if len(final_df) < MIN_DEPREM_SAYISI:
+        if is_on_fault: return 35, ["Yetersiz Veri / Sismik Boşluk (+35)"], fault_name
+        else: return 0, [], "Yetersiz Veri"
+
+    date_1y_ago = simdi - datetime.timedelta(days=365)
+    dead_zone = subset[(subset['Mesafe'] <= POST_SISMIK_YARICAP_KM) & (subset['Tarih'] >= date_1y_ago) & (subset['Mag'] >= 5.5)]
+    if not dead_zone.empty: return 9999, ["POST-SİSMİK"], fault_name
+
+    risk_score = 0; reasons = []
+    
+    date_3y_ago = simdi - datetime.timedelta(days=365*3)
+    trigger_zone = subset[(subset['Mesafe'] > POST_SISMIK_YARICAP_KM) & (subset['Mesafe'] <= TETIKLENME_YARICAP_KM) & (subset['Tarih'] >= date_3y_ago) & (subset['Mag'] >= 5.5)]
+    if not trigger_zone.empty:
+        pts = 35 if is_on_fault else 30
+        risk_score += pts; reasons.append(f"Stres Transferi (+{pts})")
+
+    b_val = calculate_b_value(final_df['Mag'].values)
+    if b_val and b_val < 0.85:
+        pts = 35 if is_on_fault else 25
+        risk_score += pts; reasons.append(f"Fiziksel Gerilme (b={b_val:.2f}) (+{pts})")
+
+    df_last_1y = final_df[final_df['Tarih'] >= date_1y_ago]
+    df_prev_2y = final_df[(final_df['Tarih'] < date_1y_ago) & (final_df['Tarih'] >= date_3y_ago)]
+    
+    ratio_last_1y = (df_last_1y['Dolunay'].sum() / len(df_last_1y) * 100) if len(df_last_1y) > 0 else 0
+    ratio_prev_2y = (df_prev_2y['Dolunay'].sum() / len(df_prev_2y) * 100) if len(df_prev_2y) > 0 else 0
+    
+    is_catirdama = (len(df_last_1y) >= 5 and ratio_last_1y > 15.0)
+    is_prev_silence = (len(df_prev_2y) >= 5 and ratio_prev_2y < 9.0)
+    is_current_silence = (len(df_last_1y) >= 5 and ratio_last_1y < 9.0)
+    is_ani_kilit = (len(df_prev_2y) >= 5 and ratio_prev_2y > 15.0 and len(df_last_1y) >= 5 and ratio_last_1y < 9.0)
+
+    moon_score = 0; moon_reason = ""
+    if is_catirdama:
+        base = 35; 
+        if is_on_fault: base += 15; 
+        if is_prev_silence: base += 25
+        moon_score = base; moon_reason = f"Çatırdama (+{base})"
+    elif is_ani_kilit:
+        pts = 75 if is_on_fault else 50
+        moon_score = pts; moon_reason = f"Ani Kilitlenme (+{pts})"
+    elif is_current_silence:
+        pts = 25 if is_on_fault else 10
+        moon_score = pts; moon_reason = f"Baskılanma/Sessizlik (+{pts})"
+
+    if moon_score > 0: risk_score += moon_score; reasons.append(moon_reason)
+    if risk_score > 150: risk_score = 150
+    return risk_score, reasons, fault_name
+
+# app.py "Bilimsel Doğrulama" döngüleri; Streamlit çıktısı yerine sayımlar döner.
+def recall_loop(df):
+    d_start = df['Tarih'].min(); d_safe = d_start + datetime.timedelta(days=365*3)
+    quakes = df[(df['Mag']>=6.0) & (df['Tarih']>d_safe)].sort_values('Tarih')
+    flags = []
+    for _, q in quakes.iterrows():
+        row = []
+        for d in [7, 30, 90, 180, 365, 540]:
+            s, _, _ = calculate_risk_engine(df, q['Enlem'], q['Boylam'], q['Tarih']-datetime.timedelta(days=d))
+            row.append(s>=50 and s!=9999)
+        flags.append(row)
+    return flags
+
+def precision_loop(df, dates, lats=np.arange(36,42,0.5), lons=np.arange(26,45,0.5)):
+    counts = []
+    for t in dates:
+        total=0; confirmed=0
+        for lat in lats:
+            for lon in lons:
+                curr, _, _ = calculate_risk_engine(df, lat, lon, t)
+                if curr>=50 and curr!=9999:
+                    total+=1
+                    if followup(df, lat, lon, t): confirmed+=1
+        counts.append((total, confirmed))
+    return counts
+
+def followup(df, lat, lon, t):
+    return not df[(np.abs(df['Enlem']-lat)<=1.5) & (np.abs(df['Boylam']-lon)<=1.5) & (df['Tarih']>t) & (df['Tarih']<t+datetime.timedelta(days=730)) & (df['Mag']>=5.5)].empty
+
+# calculate_risk_engine'in b-değeri ve Dolunay oranı adımları (puanlamadan bağımsız).
+def window_indicators(df, lat, lon, simdi):
+    subset = df[(df['Enlem'] >= lat - 2.0) & (df['Enlem'] <= lat + 2.0) &
+                (df['Boylam'] >= lon - 2.0) & (df['Boylam'] <= lon + 2.0) & (df['Tarih'] <= simdi)]
+    dists = haversine_vectorized(lat, lon, subset['Enlem'].values, subset['Boylam'].values)
+    final_df = subset[(dists <= ANALIZ_YARICAP_KM) & (subset['Mag'] >= BUYUKLUK_FILTRESI)]
+    date_1y_ago = simdi - datetime.timedelta(days=365); date_3y_ago = simdi - datetime.timedelta(days=365*3)
+    df_last_1y = final_df[final_df['Tarih'] >= date_1y_ago]
+    df_prev_2y = final_df[(final_df['Tarih'] < date_1y_ago) & (final_df['Tarih'] >= date_3y_ago)]
+    ratio_last_1y = (df_last_1y['Dolunay'].sum() / len(df_last_1y) * 100) if len(df_last_1y) > 0 else 0
+    ratio_prev_2y = (df_prev_2y['Dolunay'].sum() / len(df_prev_2y) * 100) if len(df_prev_2y) > 0 else 0
+    return len(final_df), calculate_b_value(final_df['Mag'].values), ratio_last_1y, ratio_prev_2y
+
+# app.py "Deprem Geçmişi" listesi.
+def nearby_quakes(df, lat, lon, date):
+    dists = haversine_vectorized(lat, lon, df['Enlem'].values, df['Boylam'].values)
+    display_df = df.copy()
+    display_df['Mesafe (km)'] = dists
+    nearby_quakes = display_df[(display_df['Mesafe (km)'] <= 100) & (display_df['Tarih'] <= date)].sort_values(by='Tarih', ascending=False)
+    nearby_quakes['Tarih'] = nearby_quakes['Tarih'].dt.strftime('%Y-%m-%d %H:%M')
+    return nearby_quakes[['Tarih', 'Enlem', 'Boylam', 'Mag', 'Mesafe (km)']]
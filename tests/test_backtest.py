@@ -0,0 +1,53 @@
+import math
+import datetime
+import numpy as np
+import pytest
+
+from sismiq.backtest import (DOGRULAMA_IZGARA_ENLEM, DOGRULAMA_IZGARA_BOYLAM, wilson_interval, backtest_dates,
+                             run_recall_backtest, run_precision_backtest)
+from sismiq.parallel import EnginePool
+from sismiq.validation import followup_hits_many
+from . import reference
+
+# Wilson aralığı için bilinen değerler (z = 1.96).
+@pytest.mark.parametrize('k, n, expected', [
+    (5, 10, (0.2366, 0.7634)),
+    (0, 10, (0.0, 0.2775)),
+    (10, 10, (0.7225, 1.0)),
+    (1, 20, (0.0089, 0.2361)),
+])
+def test_wilson_interval_known_values(k, n, expected):
+    assert wilson_interval(k, n) == pytest.approx(expected, abs=1e-4)
+
+def test_wilson_interval_empty():
+    assert all(math.isnan(v) for v in wilson_interval(0, 0))
+
+def test_recall_matches_reference(index, catalog_df, reference_df):
+    result = run_recall_backtest(EnginePool(index, 1), catalog_df, n_chunks=3)
+    expected = np.array(reference.recall_loop(reference_df), dtype=bool)
+    np.testing.assert_array_equal(result.lag_flags, expected)
+    np.testing.assert_array_equal(result.hits, expected.any(axis=1))
+    assert result.metrics['Recall']['k'] == expected.any(axis=1).sum()
+
+def test_followup_mask_matches_reference(index, catalog_df, reference_df):
+    # Büyük deprem indeksinin takip maskesi eski DataFrame maskesiyle her hücrede aynı olmalı; tarihler
+    # arasında M5.5+ depremlerin tam zamanları ve 730 gün öncesi de var (kesin '>' ve '<' sınırları).
+    large = catalog_df[catalog_df['Mag'] >= 5.5]['Tarih'].iloc[::15]
+    dates = backtest_dates(catalog_df, 3) + [t.to_pydatetime() for t in large] + \
+            [t.to_pydatetime() - datetime.timedelta(days=730) for t in large]
+    lats, lons = (a.ravel() for a in np.meshgrid(DOGRULAMA_IZGARA_ENLEM[::2], DOGRULAMA_IZGARA_BOYLAM, indexing='ij'))
+    hits = followup_hits_many(index, dates, lats, lons)
+    expected = np.array([[reference.followup(reference_df, lat, lon, t) for t in dates] for lat, lon in zip(lats, lons)])
+    np.testing.assert_array_equal(hits, expected)
+    assert expected.any() and not expected.all()
+
+def test_precision_matches_reference(index, catalog_df, reference_df):
+    # Eski döngü yalnızca işaretlenen ve doğrulanan hücreleri sayar: TP + FP ve TP karşılaştırılır.
+    lats, lons = DOGRULAMA_IZGARA_ENLEM[::2], DOGRULAMA_IZGARA_BOYLAM[::2]
+    result = run_precision_backtest(EnginePool(index, 1), catalog_df, n_dates=4, n_chunks=2, lats=lats, lons=lons)
+    assert result.dates == backtest_dates(catalog_df, 4)
+    expected = reference.precision_loop(reference_df, result.dates, lats, lons)
+    daily = result.daily
+    assert list(zip(daily['TP'] + daily['FP'], daily['TP'])) == expected
+    assert (daily[['TP', 'FP', 'FN', 'TN']].sum(axis=1) == len(lats) * len(lons)).all()
+    assert sum(total for total, _ in expected) > 0
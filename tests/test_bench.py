@@ -0,0 +1,25 @@
+import json
+
+from sismiq.bench import BENCH_ASAMALARI, run_benchmarks, compare_results, write_results
+
+RAPOR_ANAHTARLARI = {'catalog', 'events', 'stage', 'times_s', 'min_s', 'median_s', 'peak_mem_mb'}
+
+def test_bench_smoke(catalog_lines, tmp_path):
+    # Küçük paketli katalog ve küçük sentetik katalogla tüm aşamalar bir kez ölçülür.
+    header, rows = catalog_lines
+    path = tmp_path / 'deprem.txt'
+    path.write_bytes(b''.join(header + rows[:2000]))
+    report = run_benchmarks(str(path), synthetic_sizes=[3000], repeat=1, precision_dates=2, work_dir=str(tmp_path / 'bench'))
+    assert set(report) == {'format', 'meta', 'results'}
+    assert {'commit', 'python', 'numpy', 'workers', 'repeat', 'precision_dates', 'seed'} <= set(report['meta'])
+    results = report['results']
+    assert [(r['catalog'], r['stage']) for r in results] == \
+        [(name, stage) for name in ['deprem.txt', 'sentetik-3000'] for stage in BENCH_ASAMALARI]
+    for r in results:
+        assert set(r) == RAPOR_ANAHTARLARI
+        assert len(r['times_s']) == 1 and r['min_s'] > 0 and r['peak_mem_mb'] > 0, r['stage']
+    assert [r['events'] for r in results[::len(BENCH_ASAMALARI)]] == [2000, 3000]
+    out = tmp_path / 'sonuc.json'
+    write_results(report, str(out))
+    same = compare_results(report, json.loads(out.read_text(encoding='utf-8')))
+    assert len(same) == len(results) and (same['ratio'] == 1.0).all()
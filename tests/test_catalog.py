@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sismiq import catalog
+from sismiq.catalog import parse_catalog, compile_index, open_compiled_catalog
+from sismiq.engine import calculate_risk_grid
+from sismiq.report import snapshot_dates
+
+def by_time(rows):
+    # Veri satırları Deprem Kodu'na (yyyymmddHHMMSS) göre: canlı katalogda olduğu gibi yeni olaylar sona eklenir.
+    return sorted(rows, key=lambda line: line.split(b'\t')[1])
+
+def assert_same_catalog(catalog, path):
+    full = parse_catalog(path)
+    assert list(catalog.df.columns) == list(full.columns)
+    for column in full.columns:
+        # Kategori sırası eklemeyle değişebilir; karşılaştırma etiketler üzerinden yapılır.
+        a, b = catalog.df[column], full[column]
+        if isinstance(b.dtype, pd.CategoricalDtype): a, b = a.astype(str), b.astype(str)
+        np.testing.assert_array_equal(a.to_numpy(), b.to_numpy(), err_msg=column)
+    expected, _ = compile_index(full).to_arrays()
+    arrays, _ = catalog.index.to_arrays()
+    assert arrays.keys() == expected.keys()
+    for name in expected: np.testing.assert_array_equal(arrays[name], expected[name], err_msg=name)
+    return full
+
+@pytest.mark.parametrize('order', ['time', 'file'])
+def test_append_matches_full_parse(tmp_path, catalog_lines, order):
+    header, rows = catalog_lines
+    rows = by_time(rows) if order == 'time' else rows
+    path, cache = str(tmp_path / 'deprem.txt'), str(tmp_path / 'cache')
+    cut = len(rows) * 2 // 3
+    with open(path, 'wb') as f: f.write(b''.join(header + rows[:cut]))
+    first = open_compiled_catalog(path, cache)
+    assert first.version == 1 and first.appended_from is None
+
+    with open(path, 'ab') as f: f.write(b''.join(rows[cut:]))
+    appended = open_compiled_catalog(path, cache)
+    assert appended.version == 2 and appended.appended_from == 1
+    full = assert_same_catalog(appended, path)
+    new_rows = parse_catalog(path).iloc[len(first.df):] if order == 'time' else None
+    if new_rows is not None: assert appended.appended_since == new_rows['Tarih'].min().value // 10**9
+
+    lats, lons = np.array([37.5, 39.6, 40.7]), np.array([37.0, 38.5, 29.9])
+    dates = snapshot_dates(full['Tarih'].max().to_pydatetime())
+    for a, b in zip(calculate_risk_grid(appended.index, lats, lons, dates), calculate_risk_grid(compile_index(full), lats, lons, dates)):
+        assert np.array_equal(a, b) if isinstance(a, np.ndarray) else a == b
+
+def test_append_parses_only_tail_and_extends_in_place(tmp_path, catalog_lines, monkeypatch):
+    header, rows = catalog_lines
+    rows = by_time(rows)
+    path, cache = str(tmp_path / 'deprem.txt'), str(tmp_path / 'cache')
+    cut = len(rows) * 2 // 3
+    while rows[cut].split(b'\t')[1] == rows[cut - 1].split(b'\t')[1]: cut += 1 # aynı saniyedeki olaylar ayrılmasın
+    with open(path, 'wb') as f: f.write(b''.join(header + rows[:cut]))
+    first = open_compiled_catalog(path, cache)
+    column = tmp_path / 'cache' / f"deprem.txt-{first.fingerprint}" / 'df' / 'Enlem.bin'
+    before = column.stat()
+
+    tail = b''.join(rows[cut:])
+    parsed = []
+    parse = catalog.parse_catalog_bytes
+    monkeypatch.setattr(catalog, 'parse_catalog_bytes', lambda raw, **kw: parsed.append(len(raw)) or parse(raw, **kw))
+    def recompile(*args): raise AssertionError('eklemede katalog baştan derlenmemeli')
+    monkeypatch.setattr(catalog, 'compile_index', recompile)
+    monkeypatch.setattr(catalog, 'build_neighbour_table', recompile)
+    with open(path, 'ab') as f: f.write(tail)
+    appended = open_compiled_catalog(path, cache)
+
+    assert parsed == [len(tail)]
+    after = column.stat()
+    assert after.st_ino == before.st_ino
+    assert after.st_size == before.st_size + (len(appended.df) - len(first.df)) * first.df['Enlem'].dtype.itemsize
+    monkeypatch.undo()
+    assert_same_catalog(appended, path)
+    # Önceki sürüm hâlâ açık: kendi satırlarını görmeye devam eder.
+    assert len(first.df) == cut and first.df['Enlem'].to_numpy()[-1] == parse_catalog(path)['Enlem'].iloc[cut - 1]
+
+def test_partial_line_waits_for_newline(tmp_path, catalog_lines):
+    header, rows = catalog_lines
+    rows = by_time(rows)
+    path, cache = str(tmp_path / 'deprem.txt'), str(tmp_path / 'cache')
+    with open(path, 'wb') as f: f.write(b''.join(header + rows[:-2]))
+    first = open_compiled_catalog(path, cache)
+    last = rows[-2] + rows[-1]
+    with open(path, 'ab') as f: f.write(rows[-2] + rows[-1][:20])
+    partial = open_compiled_catalog(path, cache)
+    assert partial.version == 2 and len(partial.df) == len(first.df) + 1
+    with open(path, 'ab') as f: f.write(last[len(rows[-2]) + 20:])
+    complete = open_compiled_catalog(path, cache)
+    assert complete.version == 3 and complete.appended_from == 2
+    assert_same_catalog(complete, path)
+
+def test_rewrite_recompiles(tmp_path, catalog_lines):
+    header, rows = catalog_lines
+    path, cache = str(tmp_path / 'deprem.txt'), str(tmp_path / 'cache')
+    with open(path, 'wb') as f: f.write(b''.join(header + rows))
+    first = open_compiled_catalog(path, cache)
+    assert open_compiled_catalog(path, cache).version == first.version
+    # Ortadan satır silinen dosya ekleme sayılmaz: tam derleme, yeni sürüm.
+    with open(path, 'wb') as f: f.write(b''.join(header + rows[:100] + rows[200:]))
+    rewritten = open_compiled_catalog(path, cache)
+    assert rewritten.version == first.version + 1 and rewritten.appended_from is None
+    assert rewritten.fingerprint != first.fingerprint
+    assert_same_catalog(rewritten, path)
+
+# Hızlı (pyarrow) yolun satır başına kuralları: biçimi tutmayan tarih/saat pandas kuralıyla
+# çözülür, boş ve "NA" gibi değerler boş sayılır. Alan sayısı tutmayan satır veya sayı
+# olmayan değer varsa dosya pandas yoluna bırakılır.
+OZEL_SATIRLAR = [
+    b"900001\t20190105101010\t2019.1.05\t10:10:10.00\t38.1000\t38.2000\t005.0\t4.1\t0.0\t4.1\t4.0\t0.0\t0.0\tKe\tTEK HANELI AY\n",
+    b"900002\t20190230101010\t2019.02.30\t10:10:10.00\t38.1000\t38.2000\t005.0\t4.1\t0.0\t4.1\t4.0\t0.0\t0.0\tKe\tGECERSIZ GUN\n",
+    b"900003\t20190301010203\t2019.03.01\t1:2:3\t38.1000\t38.2000\t005.0\t4.1\t0.0\t4.1\t4.0\t0.0\t0.0\tKe\tKISA SAAT\n",
+    b"900004\t20190302101010\t2019.03.02\t10:10:60.00\t38.1000\t38.2000\t005.0\t4.1\t0.0\t4.1\t4.0\t0.0\t0.0\tKe\tARTIK SANIYE\n",
+    b"900005\t20190303101010\t2019.03.03\t10:10:10.00\t38.1000\t38.2000\t005.0\t0.0\t0.0\t3.8\t4.0\t0.0\t0.0\tKe\tNA\n",
+    b"900006\t20190304101010\t2019.03.04\t10:10:10.00\t38.1000\t38.2000\t005.0\t4.2\t0.0\t\t4.0\t0.0\t0.0\t\t\n",
+    b"900007\t\t2019.03.05\t10:10:10\t-38.1000\t38.2000\t\t4.2\t0.0\t4.0\t4.0\t0.0\t0.0\tKe\tBOS KOD\r\n",
+    b"900008\t20190306101010\t2019.03.06\t10:10:10.00\t38.1000\t38.2000\t005.0\t0.0\t0.0\tnan\t4.0\t0.0\t0.0\tKe\tML YOK\n",
+]
+DUZENSIZ_SATIRLAR = [
+    b"900009\t20190307101010\t2019.03.07\t10:10:10.00\tabc\t38.2000\t005.0\t4.1\t0.0\t4.1\t4.0\t0.0\t0.0\tKe\tSAYI DEGIL\n",
+    b"900010\t20190308101010\t2019.03.08\t10:10:10.00\t38.1000\t38.2000\t005.0\t4.1\t0.0\t4.1\n",
+    b"900011\t20190309101010\t2019.03.09\t10:10:10.00\t38.1000\t38.2000\t005.0\t4.1\t0.0\t4.1\t4.0\t0.0\t0.0\tKe\tFAZLA\tALAN\n",
+]
+
+# Ayırıcı içeren uzun yer adları atılmaz: taşan parçalar tek boşlukla 'Yer'e katılır.
+UZUN_YER = ' '.join(f"PARCA{i}" for i in range(40))
+
+@pytest.mark.parametrize('sep', [b'\t', b' '])
+@pytest.mark.parametrize('fast', [True, False])
+def test_long_place_name_is_kept(catalog_lines, monkeypatch, sep, fast):
+    header, rows = catalog_lines
+    fields = [b"900012", b"20190310101010", b"2019.03.10", b"10:10:10.00", b"38.1000", b"38.2000", b"005.0",
+              b"4.1", b"0.0", b"4.1", b"4.0", b"0.0", b"0.0", b"Ke", b"BASLANGIC\t" + UZUN_YER.encode()]
+    lines = rows[:200] + [b'\t'.join(fields) + b'\n'] + rows[200:400]
+    if sep == b' ': lines = [line.replace(b'\t', b' ') for line in lines]
+    if not fast: monkeypatch.setattr(catalog, 'pa_csv', None)
+    parsed = catalog.parse_catalog_bytes(b''.join(header + lines))
+    assert len(parsed) == 401 and parsed.attrs['reddedilen_satir'] == 0
+    assert parsed.loc[parsed['Deprem Kodu'] == 20190310101010, 'Yer'].astype(str).item() == f"BASLANGIC {UZUN_YER}"
+
+@pytest.mark.parametrize('extra, fast', [([], True), (OZEL_SATIRLAR, True)] + [([line], False) for line in DUZENSIZ_SATIRLAR])
+def test_fast_reader_matches_pandas_reader(catalog_lines, monkeypatch, extra, fast):
+    header, rows = catalog_lines
+    raw = b''.join(header + rows[:200] + extra + rows[200:400])
+    start = catalog._catalog_start(raw)
+    assert (catalog._read_columns_arrow(raw, start) is not None) == fast
+    parsed = catalog.parse_catalog_bytes(raw)
+    monkeypatch.setattr(catalog, 'pa_csv', None)
+    expected = catalog.parse_catalog_bytes(raw)
+    pd.testing.assert_frame_equal(parsed, expected)
+    assert parsed.attrs == expected.attrs
@@ -0,0 +1,62 @@
+import io
+import json
+import datetime
+import pandas as pd
+import pytest
+
+from sismiq import cli
+from sismiq.report import SKOR_SUTUNLARI, score_sites
+from .conftest import KATALOG
+
+# Satırlar farklı eş adlar kullanır; her parti (--batch-size 2) farklı anahtar kümesiyle başlar.
+KARISIK_SATIRLAR = [
+    {"id": 1, "lat": 38.0, "lon": 37.0, "date": "2023-02-10"},
+    {"id": 2, "enlem": 38.5, "boylam": 37.5},
+    {"id": 3, "latitude": 39.0, "lng": 40.0, "tarih": "2023-01-01", "not": "yeni anahtar"},
+    {"id": 4, "lat": None, "enlem": 37.0, "lon": 36.0},
+    {"id": 5, "lon": 36.0},
+    {"id": 6, "Enlem": 40.0, "Boylam": 30.0, "date": "2023-02-10"},
+]
+
+@pytest.mark.parametrize('out_fmt', ['jsonl', 'csv'])
+def test_score_mixed_alias_jsonl(index, tmp_path, capsys, out_fmt):
+    path = tmp_path / 'siteler.jsonl'
+    path.write_text(''.join(json.dumps(row) + "\n" for row in KARISIK_SATIRLAR), encoding='utf-8')
+    code = cli.main(['score', str(path), '--catalog', KATALOG, '--cache-dir', str(tmp_path), '--batch-size', '2',
+                     '--date', '2023-03-01', '--format', out_fmt])
+    captured = capsys.readouterr()
+    assert code == 0
+    assert "1 satır" in captured.err
+    if out_fmt == 'csv': scored = pd.read_csv(io.StringIO(captured.out))
+    else: scored = pd.DataFrame([json.loads(line) for line in captured.out.splitlines()])
+    # Aktarılan sütunlar ilk partiden gelir: sonradan görülen "not" yazılmaz, başlık bir kez yazılır.
+    assert list(scored.columns[:1]) == ['id'] and 'not' not in scored
+    assert scored['id'].tolist() == [1, 2, 3, 4, 6]
+    expected = score_sites(index, [38.0, 38.5, 39.0, 37.0, 40.0], [37.0, 37.5, 40.0, 36.0, 30.0],
+                           [datetime.datetime(*d) for d in [(2023, 2, 10), (2023, 3, 1), (2023, 1, 1), (2023, 3, 1), (2023, 2, 10)]])
+    assert scored['Puan'].tolist() == expected['Puan'].tolist()
+    assert scored['Tarih'].tolist() == expected['Tarih'].dt.strftime('%Y-%m-%d %H:%M:%S').tolist()
+
+def test_score_requires_coordinates(tmp_path, capsys):
+    path = tmp_path / 'siteler.jsonl'
+    path.write_text(json.dumps({"id": 1, "lon": 36.0}) + "\n", encoding='utf-8')
+    assert cli.main(['score', str(path), '--catalog', KATALOG, '--cache-dir', str(tmp_path)]) == 2
+    assert "enlem" in capsys.readouterr().err
+
+@pytest.mark.parametrize('batch_size', ['1', '5000'])
+def test_score_batch_of_only_invalid_rows(index, tmp_path, capsys, batch_size):
+    # Yalnızca geçersiz satırlardan oluşan parti çıktıya satır eklemez; CSV başlığı yine bir kez yazılır.
+    path = tmp_path / 'siteler.csv'
+    path.write_text("lat,lon,date\nabc,35,2020-01-01\n38.0,37.0,2023-02-10\n91,35,2020-01-01\n", encoding='utf-8')
+    code = cli.main(['score', str(path), '--catalog', KATALOG, '--cache-dir', str(tmp_path), '--batch-size', batch_size])
+    captured = capsys.readouterr()
+    assert code == 0 and "2 satır" in captured.err
+    scored = pd.read_csv(io.StringIO(captured.out))
+    assert list(scored.columns) == list(SKOR_SUTUNLARI)
+    assert scored[['Enlem', 'Boylam']].values.tolist() == [[38.0, 37.0]]
+
+def test_score_only_invalid_rows_writes_header(tmp_path, capsys):
+    path = tmp_path / 'siteler.csv'
+    path.write_text("lat,lon,date\nabc,35,2020-01-01\n", encoding='utf-8')
+    assert cli.main(['score', str(path), '--catalog', KATALOG, '--cache-dir', str(tmp_path)]) == 0
+    assert capsys.readouterr().out.splitlines() == [",".join(SKOR_SUTUNLARI)]
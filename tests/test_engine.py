@@ -0,0 +1,87 @@
+import datetime
+import numpy as np
+import pytest
+
+from sismiq.engine import (ULUSAL_IZGARA_ENLEM, ULUSAL_IZGARA_BOYLAM, calculate_risk_engine, calculate_risk_timeline, calculate_risk_grid,
+                           calculate_risk_series)
+from sismiq.report import snapshot_dates, timeline_frame
+from . import reference
+
+# Eski motorla karşılaştırılan tarihler: Van (2011), Maraş sonrası (2023) ve güncel katalog sonu.
+TARIHLER = [datetime.datetime(2011, 6, 15), datetime.datetime(2023, 3, 1), datetime.datetime(2024, 6, 1)]
+GECIKMELER = [7, 90, 540] # büyük depremlerden önceki gün sayıları
+
+def grid_points(step=1):
+    lats, lons = np.meshgrid(ULUSAL_IZGARA_ENLEM[::step], ULUSAL_IZGARA_BOYLAM[::step], indexing='ij')
+    return lats.ravel(), lons.ravel()
+
+def quake_points(reference_df):
+    # M>=6 depremlerin merkezleri, depremden önce ve sonra: Post-sismik ve stres transferi dalları da sınanır.
+    start = reference_df['Tarih'].min() + datetime.timedelta(days=365 * 3)
+    quakes = reference_df[(reference_df['Mag'] >= 6.0) & (reference_df['Tarih'] > start)]
+    return [(q.Enlem, q.Boylam, q.Tarih.to_pydatetime() + datetime.timedelta(days=sign * lag))
+            for q in quakes.itertuples() for lag in GECIKMELER for sign in (-1, 1)]
+
+def test_parse_matches_reference(catalog_df, reference_df):
+    expected = reference_df.sort_values('Tarih', kind='stable', ignore_index=True)
+    assert len(catalog_df) == len(expected)
+    for column in ['Tarih', 'Enlem', 'Boylam', 'Mag', 'Dolunay']:
+        np.testing.assert_array_equal(catalog_df[column].to_numpy(), expected[column].to_numpy(), err_msg=column)
+
+@pytest.mark.parametrize('date', TARIHLER)
+def test_point_engine_matches_reference(index, reference_df, date):
+    for lat, lon in zip(*grid_points(step=2)):
+        assert calculate_risk_engine(index, lat, lon, date) == reference.calculate_risk_engine(reference_df, lat, lon, date), (lat, lon)
+
+def test_point_engine_matches_reference_near_large_quakes(index, reference_df):
+    results = []
+    for lat, lon, date in quake_points(reference_df):
+        result = calculate_risk_engine(index, lat, lon, date)
+        assert result == reference.calculate_risk_engine(reference_df, lat, lon, date), (lat, lon, date)
+        results.append(result[0])
+    assert 9999 in results and any(0 < s < 9999 for s in results)
+
+@pytest.mark.parametrize('date', TARIHLER)
+def test_grid_matches_reference(index, reference_df, date):
+    lats, lons = grid_points(step=2)
+    dates = snapshot_dates(date)
+    scores, reasons, faults = calculate_risk_grid(index, lats, lons, dates)
+    for p, (lat, lon) in enumerate(zip(lats, lons)):
+        for j, d in enumerate(dates):
+            assert (scores[p, j], reasons[p][j], faults[p][j]) == reference.calculate_risk_engine(reference_df, lat, lon, d), (lat, lon, d)
+
+@pytest.mark.parametrize('date', TARIHLER)
+def test_grid_matches_timeline(index, date):
+    # Tam ulusal ızgara: toplu değerlendirme, nokta başına zaman serisiyle aynı sonucu verir.
+    lats, lons = grid_points()
+    dates = snapshot_dates(date)
+    scores, reasons, faults = calculate_risk_grid(index, lats, lons, dates)
+    for p, (lat, lon) in enumerate(zip(lats, lons)):
+        assert list(zip(scores[p].tolist(), reasons[p], faults[p])) == calculate_risk_timeline(index, lat, lon, dates), (lat, lon)
+
+# Günlük seri eski motorun gün gün döngüsüyle aynı olmalı: Maraş depremleri (2023-02-06) çevresinde
+# Post-sismik geçişi, Van'da (2011-10-23) stres birikimi, Marmara'da sakin bir nokta.
+SERI_NOKTALARI = [(37.25, 37.0, datetime.datetime(2023, 4, 1)), (38.75, 43.5, datetime.datetime(2011, 11, 15)),
+                  (40.5, 29.0, datetime.datetime(2020, 6, 1, 12))]
+
+@pytest.mark.parametrize('lat, lon, end', SERI_NOKTALARI)
+@pytest.mark.parametrize('step_days', [1, 7])
+def test_series_matches_reference_daily_loop(index, reference_df, lat, lon, end, step_days):
+    series = calculate_risk_series(index, lat, lon, end, days=120, step_days=step_days)
+    dates = [end - datetime.timedelta(days=d) for d in range(0, 121, step_days)][::-1]
+    assert series['dates'] == dates
+    assert series['scores'].tolist() == [reference.calculate_risk_engine(reference_df, lat, lon, d)[0] for d in dates]
+    for i, d in enumerate(dates):
+        n_final, b_val, ratio_last_1y, ratio_prev_2y = reference.window_indicators(reference_df, lat, lon, d)
+        assert series['n_final'][i] == n_final, d
+        if b_val is not None: assert series['b_value'][i] == pytest.approx(b_val), d
+        assert series['ratio_last_1y'][i] == pytest.approx(ratio_last_1y), d
+        assert series['ratio_prev_2y'][i] == pytest.approx(ratio_prev_2y), d
+    assert len(set(series['scores'].tolist())) > 1 or lat == 40.5
+
+def test_timeline_frame_ends_at_point_score(index, reference_df):
+    lat, lon, end = SERI_NOKTALARI[0]
+    frame = timeline_frame(index, lat + 1e-6, lon, end, days=60)
+    assert len(frame) == 61 and frame['Tarih'].iloc[-1] == end
+    assert frame['Puan'].tolist() == [reference.calculate_risk_engine(reference_df, lat, lon, d.to_pydatetime())[0] for d in frame['Tarih']]
+    assert frame['Puan'].iloc[-1] == calculate_risk_engine(index, lat, lon, end)[0]
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from sismiq import engine
+from sismiq.engine import ACTIVE_FAULTS, FAY_TAMPON_BOLGESI_KM, UZAK_FAY_ADI, fault_proximity
+from sismiq.faults import FaultSet, FaultRaster, FAY_ENLEM_PENCERESI, FAY_RASTER_KAPSAMI, RASTER_SINIR
+from . import reference
+
+@pytest.fixture(scope='module')
+def faults():
+    return FaultSet.from_segments(ACTIVE_FAULTS)
+
+@pytest.fixture(scope='module')
+def raster(faults):
+    return FaultRaster(faults, FAY_TAMPON_BOLGESI_KM)
+
+def exact_names(faults, lats, lons):
+    fault, _ = faults.nearest(lats, lons, max_km=FAY_TAMPON_BOLGESI_KM)
+    return np.where(fault >= 0, faults.names[np.maximum(fault, 0)], UZAK_FAY_ADI)
+
+def border_points(faults, n=400_000, seed=7):
+    # Raster için en zor noktalar: tampon sınırına 1 km'den yakın, en yakın iki fayın mesafesi
+    # neredeyse eşit veya 2.5° enlem penceresinin kenarında olanlar.
+    rng = np.random.default_rng(seed)
+    lat_min, lat_max, lon_min, lon_max = FAY_RASTER_KAPSAMI
+    lats, lons = rng.uniform(lat_min, lat_max, n), rng.uniform(lon_min, lon_max, n)
+    _, dist, second = faults.nearest(lats, lons, max_km=FAY_TAMPON_BOLGESI_KM + 5, with_second=True)
+    with np.errstate(invalid='ignore'):
+        hard = (np.abs(dist - FAY_TAMPON_BOLGESI_KM) <= 1.0) | ((dist <= FAY_TAMPON_BOLGESI_KM) & (second - dist <= 1.0))
+    edges = np.concatenate([faults.centre_lat - FAY_ENLEM_PENCERESI, faults.centre_lat + FAY_ENLEM_PENCERESI])
+    edge_lats = rng.choice(edges, 4000) + rng.uniform(-0.005, 0.005, 4000)
+    edge_lons = rng.uniform(lon_min, lon_max, 4000)
+    return np.concatenate([lats[hard], edge_lats]), np.concatenate([lons[hard], edge_lons])
+
+def test_certain_cells_hold_at_every_corner(faults, raster):
+    # Kesin kodlu hücrelerin sınır hücrelerine komşu olanları: dört köşenin (hücre içinden) tam sonucu kodla aynı olmalı.
+    codes = raster.codes
+    border = codes == RASTER_SINIR
+    near_border = np.zeros_like(border)
+    near_border[1:] |= border[:-1]; near_border[:-1] |= border[1:]; near_border[:, 1:] |= border[:, :-1]; near_border[:, :-1] |= border[:, 1:]
+    rows, cols = np.nonzero(near_border & ~border)
+    eps = raster.resolution * 1e-6
+    for dr, dc in ((eps, eps), (eps, 1 - eps), (1 - eps, eps), (1 - eps, 1 - eps)):
+        lats = raster.lat0 + (rows + dr) * raster.resolution
+        lons = raster.lon0 + (cols + dc) * raster.resolution
+        fault, _ = faults.nearest(lats, lons, max_km=FAY_TAMPON_BOLGESI_KM)
+        np.testing.assert_array_equal(np.where(fault >= 0, fault, -1), np.maximum(codes[rows, cols], -1))
+
+def test_raster_lookup_matches_exact_at_borders(faults, tmp_path, monkeypatch):
+    monkeypatch.setattr(engine, 'FAY_RASTERI_ACIK', True)
+    monkeypatch.setattr(engine, 'FAY_RASTER_KLASORU', str(tmp_path))
+    monkeypatch.setattr(engine, '_fault_rasters', {})
+    lats, lons = border_points(faults)
+    on_fault, names = fault_proximity(lats, lons, faults)
+    assert faults.fingerprint in engine._fault_rasters
+    np.testing.assert_array_equal(names, exact_names(faults, lats, lons))
+    np.testing.assert_array_equal(on_fault, names != UZAK_FAY_ADI)
+    # Eski skaler hesapla da aynı (raster diskten yeniden açıldığında da).
+    monkeypatch.setattr(engine, '_fault_rasters', {})
+    sample = np.random.default_rng(3).choice(len(lats), 1500, replace=False)
+    _, sample_names = fault_proximity(lats[sample], lons[sample], faults)
+    _, reloaded = fault_proximity(lats, lons, faults)
+    np.testing.assert_array_equal(reloaded, names)
+    for lat, lon, name in zip(lats[sample], lons[sample], sample_names):
+        assert reference.check_fault_proximity(lat, lon)[1] == name, (lat, lon)
+
+def test_single_point_builds_and_uses_raster(faults, tmp_path, monkeypatch):
+    # Raster sorgu boyutundan bağımsız kurulur: tek noktalı ilk sorgu da kurar ve sonrakiler kullanır.
+    monkeypatch.setattr(engine, 'FAY_RASTERI_ACIK', True)
+    monkeypatch.setattr(engine, 'FAY_RASTER_KLASORU', str(tmp_path))
+    monkeypatch.setattr(engine, '_fault_rasters', {})
+    on_fault, names = fault_proximity([37.5], [37.0], faults)
+    assert on_fault.tolist() == [True] and names.tolist() == ['DAF - Maraş']
+    raster = engine._fault_rasters[faults.fingerprint]
+    calls = []
+    monkeypatch.setattr(raster, 'lookup', lambda lats, lons: calls.append(len(lats)) or FaultRaster.lookup(raster, lats, lons))
+    for lat, lon in [(40.0, 33.0), (38.6, 43.5), (37.0, 44.9)]:
+        assert fault_proximity([lat], [lon], faults)[1][0] == reference.check_fault_proximity(lat, lon)[1]
+    assert calls == [1, 1, 1] and engine._fault_rasters[faults.fingerprint] is raster
@@ -0,0 +1,38 @@
+import threading
+
+from sismiq import instrument
+
+def test_tracing_flag_is_per_context():
+    # Bir iş parçacığında açılan izleme diğerlerini etkilemez; kapalı bağlamın aşamaları kaydedilmez.
+    instrument.reset()
+    seen = {}
+    on = threading.Event(); done = threading.Event()
+    def traced_session():
+        instrument.enable(True)
+        on.set()
+        with instrument.stage('test.acik'): pass
+        done.wait()
+        seen['acik'] = instrument.enabled()
+    def plain_session():
+        on.wait()
+        seen['kapali'] = instrument.enabled()
+        with instrument.stage('test.kapali'): pass
+        done.set()
+    threads = [threading.Thread(target=traced_session), threading.Thread(target=plain_session)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert seen == {'acik': True, 'kapali': False}
+    assert [row['Aşama'] for row in instrument.stats()] == ['test.acik']
+    instrument.reset()
+
+def test_capture_collects_only_its_own_spans():
+    instrument.enable(True)
+    try:
+        def work():
+            with instrument.stage('test.ic'): pass
+            return 1
+        with instrument.stage('test.dis'):
+            result, spans = instrument.capture(work)
+        assert result == 1 and [span[0] for span in spans] == ['test.ic']
+    finally:
+        instrument.disable(); instrument.reset()
@@ -0,0 +1,93 @@
+import datetime
+
+from sismiq import engine, memo
+from sismiq.catalog import open_compiled_catalog
+from sismiq.engine import ACTIVE_FAULTS, calculate_risk_timeline
+from sismiq.memo import ScoreCache
+from .test_catalog import by_time
+
+NOKTA = (37.5, 37.0)
+
+def write_catalog(path, header, rows, mode='wb'):
+    with open(path, mode) as f: f.write(b''.join((header if mode == 'wb' else []) + rows))
+    return path
+
+def test_timeline_matches_engine_and_hits(tmp_path, catalog_lines):
+    header, rows = catalog_lines
+    catalog = open_compiled_catalog(write_catalog(str(tmp_path / 'deprem.txt'), header, rows), str(tmp_path / 'cache'))
+    dates = [datetime.datetime(2023, 3, 1) - datetime.timedelta(days=d) for d in (365, 180, 90, 30, 0)]
+    cache = ScoreCache()
+    assert cache.timeline(catalog, *NOKTA, dates) == calculate_risk_timeline(catalog.index, *NOKTA, dates)
+    assert cache.timeline(catalog, *NOKTA, dates) == calculate_risk_timeline(catalog.index, *NOKTA, dates)
+    assert cache.stats()['misses'] == len(dates) and cache.stats()['hits'] == len(dates)
+
+def test_append_keeps_only_earlier_dates(tmp_path, catalog_lines):
+    header, rows = catalog_lines
+    rows = by_time(rows)
+    path, cache_dir = str(tmp_path / 'deprem.txt'), str(tmp_path / 'cache')
+    cut = len(rows) - 500
+    first = open_compiled_catalog(write_catalog(path, header, rows[:cut]), cache_dir)
+    cache = ScoreCache(db_path=str(tmp_path / 'skorlar.db'))
+    end = first.df['Tarih'].max().to_pydatetime()
+    before = [end - datetime.timedelta(days=d) for d in (365, 180, 90)]
+    after = [end + datetime.timedelta(days=d) for d in (30, 365)]
+    cache.timeline(first, *NOKTA, before + after)
+
+    appended = open_compiled_catalog(write_catalog(path, header, rows[cut:], mode='ab'), cache_dir)
+    assert appended.appended_from == first.version
+    stats = cache.stats()
+    # Eklenen olaylardan önceki tarihler önbellekten gelir; sonrakiler yeni katalogla yeniden hesaplanır.
+    assert cache.timeline(appended, *NOKTA, before + after) == calculate_risk_timeline(appended.index, *NOKTA, before + after)
+    assert cache.stats()['hits'] - stats['hits'] == len(before)
+    assert cache.stats()['misses'] - stats['misses'] == len(after)
+    # Kalıcı katman da yeni sürüme taşınmıştır: yeni bir önbellek eski tarihleri diskten okur.
+    fresh = ScoreCache(db_path=str(tmp_path / 'skorlar.db'))
+    fresh.timeline(appended, *NOKTA, before + after)
+    assert fresh.stats()['disk_hits'] == len(before + after)
+
+def test_rewrite_drops_all_entries(tmp_path, catalog_lines):
+    header, rows = catalog_lines
+    path, cache_dir, db_path = str(tmp_path / 'deprem.txt'), str(tmp_path / 'cache'), str(tmp_path / 'skorlar.db')
+    first = open_compiled_catalog(write_catalog(path, header, rows), cache_dir)
+    dates = [datetime.datetime(2023, 3, 1), datetime.datetime(2024, 6, 1)]
+    cache = ScoreCache(db_path=db_path)
+    cache.timeline(first, *NOKTA, dates)
+
+    # Maraş bölgesindeki olaylar silinen katalogda tüm tarihler yeniden hesaplanır.
+    kept = [line for line in rows if b'MARAS' not in line]
+    rewritten = open_compiled_catalog(write_catalog(path, header, kept), cache_dir)
+    assert rewritten.appended_from is None and rewritten.fingerprint != first.fingerprint
+    expected = calculate_risk_timeline(rewritten.index, *NOKTA, dates)
+    assert expected != calculate_risk_timeline(first.index, *NOKTA, dates)
+    stats = cache.stats()
+    assert cache.timeline(rewritten, *NOKTA, dates) == expected
+    assert cache.stats()['misses'] - stats['misses'] == len(dates)
+    assert ScoreCache(db_path=db_path)._db.execute("SELECT COUNT(*) FROM skorlar WHERE surum=?", (first.fingerprint,)).fetchone()[0] == 0
+
+def test_engine_version_change_ignores_stored_scores(tmp_path, catalog_lines, monkeypatch):
+    header, rows = catalog_lines
+    catalog = open_compiled_catalog(write_catalog(str(tmp_path / 'deprem.txt'), header, rows), str(tmp_path / 'cache'))
+    db_path, dates = str(tmp_path / 'skorlar.db'), [datetime.datetime(2023, 3, 1)]
+    ScoreCache(db_path=db_path).timeline(catalog, *NOKTA, dates)
+    stored = ScoreCache(db_path=db_path)
+    stored.timeline(catalog, *NOKTA, dates)
+    assert stored.stats()['disk_hits'] == len(dates)
+    monkeypatch.setattr(memo, 'SKOR_MOTORU_SURUMU', memo.SKOR_MOTORU_SURUMU + 1)
+    cache = ScoreCache(db_path=db_path)
+    cache.timeline(catalog, *NOKTA, dates)
+    assert cache.stats()['disk_hits'] == 0 and cache.stats()['misses'] == len(dates)
+
+def test_fault_change_recomputes_scores(tmp_path, catalog_lines, monkeypatch):
+    header, rows = catalog_lines
+    catalog = open_compiled_catalog(write_catalog(str(tmp_path / 'deprem.txt'), header, rows), str(tmp_path / 'cache'))
+    dates = [datetime.datetime(2023, 3, 1) - datetime.timedelta(days=d) for d in (365, 0)]
+    cache = ScoreCache(db_path=str(tmp_path / 'skorlar.db'))
+    before = cache.timeline(catalog, *NOKTA, dates)
+    monkeypatch.setattr(engine, '_active_faults', engine.active_faults())
+    engine.set_active_faults({name: segments for name, segments in ACTIVE_FAULTS.items() if 'Maraş' not in name})
+    # Fay seti değişince aynı önbellek eski skorları vermez; yeni setle yeniden hesaplar.
+    expected = calculate_risk_timeline(catalog.index, *NOKTA, dates)
+    assert expected != before
+    stats = cache.stats()
+    assert cache.timeline(catalog, *NOKTA, dates) == expected
+    assert cache.stats()['misses'] - stats['misses'] == len(dates) and cache.stats()['disk_hits'] == stats['disk_hits']
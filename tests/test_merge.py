@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sismiq.merge import TEKRAR_ZAMAN_S, TEKRAR_MESAFE_KM, TEKRAR_BUYUKLUK_FARKI, duplicate_mask, merge_catalogs, parse_source_spec
+from sismiq.spatial import expand_ranges, haversine_vectorized
+from .conftest import KATALOG
+
+def perturbed(df, rng, dt_s, km, dmag):
+    # Aynı olayların başka bir ağın ölçümü gibi kaydırılmış kopyası (zaman, konum, büyüklük).
+    n = len(df)
+    bearing, dist = rng.uniform(0, 2 * np.pi, n), rng.uniform(0, km, n)
+    lat = df['Enlem'].to_numpy() + dist * np.cos(bearing) / 111.2
+    lon = df['Boylam'].to_numpy() + dist * np.sin(bearing) / (111.2 * np.cos(np.radians(lat)))
+    return pd.DataFrame({'Tarih': df['Tarih'] + pd.to_timedelta(np.round(rng.uniform(-dt_s, dt_s, n)), unit='s'),
+                         'Enlem': lat, 'Boylam': lon, 'Mag': df['Mag'].to_numpy() + rng.uniform(-dmag, dmag, n)})
+
+def brute_force_candidates(base, new):
+    # Toleranslar içinde en az bir eşi olan yeni olaylar (karşılıklı en yakın eş koşulu olmadan).
+    t_b = base['Tarih'].to_numpy().astype('datetime64[s]').view(np.int64); order = np.argsort(t_b); t_b = t_b[order]
+    t_n = new['Tarih'].to_numpy().astype('datetime64[s]').view(np.int64)
+    lo, hi = np.searchsorted(t_b, t_n - TEKRAR_ZAMAN_S, 'left'), np.searchsorted(t_b, t_n + TEKRAR_ZAMAN_S, 'right')
+    k, pos = expand_ranges(lo, hi - lo)
+    j = order[pos]
+    dist = haversine_vectorized(new['Enlem'].to_numpy()[k], new['Boylam'].to_numpy()[k], base['Enlem'].to_numpy()[j], base['Boylam'].to_numpy()[j])
+    close = (dist <= TEKRAR_MESAFE_KM) & (np.abs(base['Mag'].to_numpy()[j] - new['Mag'].to_numpy()[k]) <= TEKRAR_BUYUKLUK_FARKI)
+    return np.bincount(k[close], minlength=len(new)) > 0
+
+def test_perturbed_copy_is_all_duplicates(catalog_df):
+    copy = perturbed(catalog_df, np.random.default_rng(1), dt_s=5, km=5.0, dmag=0.2)
+    assert duplicate_mask(catalog_df, copy).all()
+
+@pytest.mark.parametrize('dt_s, km, dmag', [(TEKRAR_ZAMAN_S / 2, TEKRAR_MESAFE_KM / 2, TEKRAR_BUYUKLUK_FARKI / 2),
+                                            (TEKRAR_ZAMAN_S, TEKRAR_MESAFE_KM, TEKRAR_BUYUKLUK_FARKI)])
+def test_matches_are_within_tolerance(catalog_df, dt_s, km, dmag):
+    # Bulunan her tekrarın toleranslar içinde bir eşi vardır; eşi olan olayların büyük çoğunluğu bulunur.
+    copy = perturbed(catalog_df, np.random.default_rng(2), dt_s, km, dmag)
+    mask, candidates = duplicate_mask(catalog_df, copy), brute_force_candidates(catalog_df, copy)
+    assert not (mask & ~candidates).any()
+    assert mask.sum() >= 0.99 * candidates.sum()
+
+def test_shifted_copy_is_not_duplicate(catalog_df):
+    # Yerel saatli kaynak (3 saat fark) düzeltilmeden verilirse yalnızca tesadüfi eşler bulunur.
+    copy = perturbed(catalog_df, np.random.default_rng(3), dt_s=5, km=5.0, dmag=0.2)
+    copy['Tarih'] += pd.Timedelta(hours=3)
+    mask, candidates = duplicate_mask(catalog_df, copy), brute_force_candidates(catalog_df, copy)
+    assert not (mask & ~candidates).any()
+    assert mask.sum() < 0.01 * len(copy)
+
+def test_aftershock_burst_pairs_one_to_one():
+    # Birbirine 8 s ve birkaç km uzaklıktaki iki olayın her kopyası kendi eşine gider; tek kopya yalnızca bir olayı siler.
+    t = pd.Timestamp('2023-02-06 01:17:00')
+    base = pd.DataFrame({'Tarih': [t, t + pd.Timedelta(seconds=8)], 'Enlem': [37.20, 37.23], 'Boylam': [37.00, 37.04], 'Mag': [4.1, 4.3]})
+    both = pd.DataFrame({'Tarih': [t + pd.Timedelta(seconds=1), t + pd.Timedelta(seconds=9)], 'Enlem': [37.21, 37.24],
+                         'Boylam': [37.01, 37.03], 'Mag': [4.0, 4.3]})
+    assert duplicate_mask(base, both).tolist() == [True, True]
+    extra = pd.DataFrame({'Tarih': [t + pd.Timedelta(seconds=4)], 'Enlem': [37.21], 'Boylam': [37.02], 'Mag': [4.2]})
+    assert duplicate_mask(base, pd.concat([both, extra], ignore_index=True)).tolist() == [True, True, False]
+
+def test_merge_with_shifted_afad_export(tmp_path, catalog_df):
+    rng = np.random.default_rng(4)
+    picked = np.sort(rng.choice(len(catalog_df), len(catalog_df) // 2, replace=False))
+    copy = perturbed(catalog_df.iloc[picked].reset_index(drop=True), rng, dt_s=5, km=5.0, dmag=0.2)
+    # Kataloğun olmadığı bir dönemden 50 özgün olay.
+    unique = perturbed(catalog_df.iloc[:50].reset_index(drop=True), rng, dt_s=5, km=5.0, dmag=0.2)
+    unique['Tarih'] = pd.Timestamp('1990-01-01') + pd.to_timedelta(np.arange(50), unit='D')
+    afad = pd.concat([copy, unique], ignore_index=True)
+    # AFAD dışa aktarımı yerel saatle (UTC+3).
+    path = tmp_path / 'afad.csv'
+    afad.assign(Tarih=(afad['Tarih'] + pd.Timedelta(hours=3)).dt.strftime('%Y-%m-%dT%H:%M:%S')).rename(
+        columns={'Tarih': 'Date', 'Enlem': 'Latitude', 'Boylam': 'Longitude', 'Mag': 'Magnitude'}).to_csv(path, index=False)
+
+    merged = merge_catalogs([KATALOG, parse_source_spec(f"{path}=-3")])
+    assert merged.attrs['tekrar_olay'] == len(copy)
+    assert len(merged) == len(catalog_df) + len(unique)
+    assert merged['Tarih'].is_monotonic_increasing
+    # Tekrarlarda önce verilen kaynağın kaydı kalır.
+    kept = merged[merged['Tarih'] >= catalog_df['Tarih'].min()].reset_index(drop=True)
+    np.testing.assert_array_equal(kept['Enlem'].to_numpy(), catalog_df['Enlem'].to_numpy())
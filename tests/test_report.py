@@ -0,0 +1,27 @@
+import datetime
+import pandas as pd
+import pytest
+
+from sismiq.report import GECMIS_SAYFA_BOYUTU, nearby_quakes
+from . import reference
+
+# İstanbul, Maraş depremlerinden hemen sonra Pazarcık ve Van; 100 km sınırındaki olaylar da dahil.
+GECMIS_NOKTALARI = [(41.0, 29.0, datetime.datetime(2024, 1, 1)), (37.29, 37.04, datetime.datetime(2023, 2, 6, 12)),
+                    (38.5, 43.4, datetime.datetime(2012, 1, 1))]
+
+@pytest.mark.parametrize('lat, lon, date', GECMIS_NOKTALARI)
+def test_nearby_quakes_match_reference_list(index, reference_df, lat, lon, date):
+    # Sayfalar birleşince eski geçmiş listesiyle aynı satırlar, aynı sırada ve aynı mesafelerle gelir.
+    expected = reference.nearby_quakes(reference_df, lat, lon, date).reset_index(drop=True)
+    nearby = nearby_quakes(index, lat, lon, date)
+    assert len(nearby) == len(expected) > GECMIS_SAYFA_BOYUTU
+    pages = list(nearby.pages())
+    assert len(pages) == nearby.n_pages() == -(-len(expected) // GECMIS_SAYFA_BOYUTU)
+    assert [len(p) for p in pages[:-1]] == [GECMIS_SAYFA_BOYUTU] * (len(pages) - 1) and 0 < len(pages[-1]) <= GECMIS_SAYFA_BOYUTU
+    listed = pd.concat(pages, ignore_index=True)
+    assert listed['Tarih'].tolist() == expected['Tarih'].tolist()
+    # Aynı dakikadaki olayların eski sırası (kararsız sıralama) tanımsızdır; satırlar dakika içinde karşılaştırılır.
+    key = ['Tarih', 'Enlem', 'Boylam', 'Mag']
+    pd.testing.assert_frame_equal(listed.sort_values(key, kind='stable', ignore_index=True),
+                                  expected.sort_values(key, kind='stable', ignore_index=True), check_exact=True)
+    assert nearby.page(nearby.n_pages()).empty
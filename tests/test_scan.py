@@ -0,0 +1,121 @@
+import os
+import sys
+import copy
+import datetime
+import textwrap
+import threading
+import subprocess
+import numpy as np
+import pandas as pd
+
+from sismiq import scan
+from sismiq.districts import district_table
+from sismiq.engine import RAPOR_ALT_LIMIT, ULUSAL_IZGARA_ENLEM, ULUSAL_IZGARA_BOYLAM, build_neighbour_table
+from sismiq.parallel import EnginePool, _mp_context
+from sismiq.report import score_sites
+from sismiq.scan import HUCRE_SUTUNU, score_batch, adaptive_scan, district_scan, province_summary
+from . import reference
+from .conftest import KATALOG
+
+def test_pool_scan_matches_serial(index):
+    # İşçi süreçleri paylaşımlı bellekteki indeksle, ana süreçteki tek çağrıyla aynı tabloyu üretir.
+    lats, lons = (a.ravel() for a in np.meshgrid(ULUSAL_IZGARA_ENLEM, ULUSAL_IZGARA_BOYLAM, indexing='ij'))
+    dates = [datetime.datetime(2023, 3, 1)] * len(lats)
+    pool = EnginePool(index, 2)
+    try: scanned = score_batch(pool, lats, lons, dates, 8)
+    finally: pool.close()
+    pd.testing.assert_frame_equal(scanned, score_sites(index, lats, lons, dates))
+
+def test_pool_from_thread_uses_forkserver(index):
+    # İş parçacığından kurulan havuz fork yerine forkserver işçileri kullanır ve aynı sonucu verir.
+    lats, lons = np.array([37.2, 38.0, 39.5, 40.8]), np.array([37.0, 38.5, 40.0, 30.0])
+    dates = [datetime.datetime(2023, 2, 10)] * len(lats)
+    result = {}
+    def run():
+        result['context'] = _mp_context().get_start_method()
+        pool = EnginePool(index, 2)
+        try: result['scanned'] = score_batch(pool, lats, lons, dates, 2)
+        finally: pool.close()
+    worker = threading.Thread(target=run); worker.start(); worker.join()
+    assert result['context'] == 'forkserver'
+    pd.testing.assert_frame_equal(result['scanned'], score_sites(index, lats, lons, dates))
+
+def test_forkserver_workers_do_not_rerun_main_script(tmp_path):
+    # Streamlit'te olduğu gibi ana betik her yürütmede üst düzey kodu çalıştırır; forkserver
+    # işçileri betiği "__mp_main__" olarak yeniden yürütmemelidir.
+    script, marker = tmp_path / 'app.py', tmp_path / 'calisan.txt'
+    script.write_text(textwrap.dedent(f"""
+        import threading
+        with open({str(marker)!r}, 'a') as f: f.write(__name__ + '\\n')
+        if __name__ == '__main__':
+            from sismiq.catalog import parse_catalog
+            from sismiq.parallel import EnginePool, _mp_context
+            from sismiq.spatial import SpatialIndex
+            def run():
+                assert _mp_context().get_start_method() == 'forkserver'
+                pool = EnginePool(SpatialIndex(parse_catalog({KATALOG!r})), 2)
+                try: assert set(pool.map(len, [()] * 4)) == {{len(pool.index)}}
+                finally: pool.close()
+            worker = threading.Thread(target=run); worker.start(); worker.join()
+    """))
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')]))}
+    completed = subprocess.run([sys.executable, str(script)], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120)
+    assert completed.returncode == 0, completed.stderr
+    assert marker.read_text().split() == ['__main__']
+
+def test_adaptive_refined_cells_match_full_grid_scan(index):
+    # İnceltilen her hücre, aynı çözünürlükteki tam ızgara taramasındaki hücreyle aynı sonucu verir.
+    date = datetime.datetime(2023, 3, 1)
+    scanned = adaptive_scan(EnginePool(index, 1), date, min_cell=0.125)
+    assert sorted(scanned[HUCRE_SUTUNU].unique()) == [0.125, 0.25, 0.5]
+    for step, cells in scanned.groupby(HUCRE_SUTUNU):
+        lats = np.arange(ULUSAL_IZGARA_ENLEM[0] - 0.25 + step / 2, ULUSAL_IZGARA_ENLEM[-1] + 0.25, step)
+        lons = np.arange(ULUSAL_IZGARA_BOYLAM[0] - 0.25 + step / 2, ULUSAL_IZGARA_BOYLAM[-1] + 0.25, step)
+        grid_lat, grid_lon = (a.ravel() for a in np.meshgrid(lats, lons, indexing='ij'))
+        full = score_sites(index, grid_lat, grid_lon, [date] * len(grid_lat))
+        expected = full.set_index(['Enlem', 'Boylam']).loc[list(zip(cells['Enlem'], cells['Boylam']))].reset_index()
+        pd.testing.assert_frame_equal(cells.drop(columns=HUCRE_SUTUNU).reset_index(drop=True), expected)
+
+def test_adaptive_first_level_hits_neighbour_table(index):
+    # 0.1°'lik ızgarada (rows + 0.5) * step merkezleri np.arange değerlerinden bir ULP sapar;
+    # ilk düzey girilen dizilerden kurulduğu için tablo yine de her hücrede kullanılır.
+    lats, lons = np.arange(37.0, 38.05, 0.1), np.arange(36.0, 37.05, 0.1)
+    fine = copy.copy(index); fine.neighbours = build_neighbour_table(index, lats, lons)
+    scanned = adaptive_scan(EnginePool(fine, 1), datetime.datetime(2023, 3, 1), min_cell=0.1, lats=lats, lons=lons)
+    grid_lat, grid_lon = (a.ravel() for a in np.meshgrid(lats, lons, indexing='ij'))
+    np.testing.assert_array_equal(scanned['Enlem'], grid_lat)
+    np.testing.assert_array_equal(scanned['Boylam'], grid_lon)
+    assert (fine.neighbours.lookup(scanned['Enlem'], scanned['Boylam']) >= 0).all()
+
+IL_ORNEKLERI = ['Kahramanmaraş', 'Hatay', 'Van', 'Bolu']
+
+def test_district_scan_and_province_summary(index, reference_df, monkeypatch):
+    # Birkaç ilin ilçeleriyle: ilçe puanları tek nokta motoruyla, il özeti ilçe tablosundan elle
+    # hesaplanan en yüksek / ortalama / en riskli ilçe ile aynı olmalı.
+    date = datetime.datetime(2023, 3, 1)
+    table = district_table()
+    table = table[table['İl'].isin(IL_ORNEKLERI)].reset_index(drop=True)
+    monkeypatch.setattr(scan, 'district_table', lambda: table)
+    ranked = district_scan(EnginePool(index, 1), date)
+    assert ranked['Sıra'].tolist() == list(range(1, len(table) + 1))
+    assert sorted(zip(ranked['İl'], ranked['İlçe'])) == sorted(zip(table['İl'], table['İlçe']))
+    assert (ranked['Puan'].diff().dropna() <= 0).all()
+    expected = score_sites(index, table['Enlem'].values, table['Boylam'].values, [date] * len(table))
+    got = ranked.set_index(['İl', 'İlçe']).loc[list(zip(table['İl'], table['İlçe']))]
+    assert got['Puan'].tolist() == expected['Puan'].tolist()
+    assert got['Anlık Puan'].tolist() == [reference.calculate_risk_engine(reference_df, lat, lon, date)[0]
+                                          for lat, lon in zip(table['Enlem'], table['Boylam'])]
+    assert (ranked['Anlık Puan'] == 9999).any() and (ranked['Puan'] > 0).any()
+
+    summary = province_summary(ranked)
+    assert sorted(summary['İl']) == sorted(IL_ORNEKLERI)
+    for row in summary.itertuples(index=False):
+        districts = ranked[ranked['İl'] == row[0]]
+        assert row[1] == len(districts)
+        assert row[2] == districts['Puan'].max()
+        assert row[3] == round(districts['Puan'].mean(), 1)
+        assert row[4] == sum(c != 9999 and (c >= 50 or h >= RAPOR_ALT_LIMIT) for c, h in zip(districts['Anlık Puan'], districts['Puan']))
+        assert row[5] == (districts['Anlık Puan'] == 9999).sum()
+        assert row[6] == districts.loc[districts['Puan'].idxmax(), 'İlçe']
+    assert summary['En Yüksek Puan'].is_monotonic_decreasing
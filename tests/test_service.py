@@ -0,0 +1,114 @@
+import json
+import asyncio
+import contextvars
+
+import pandas as pd
+
+from sismiq import instrument
+from sismiq.report import site_reports
+from sismiq.service import ScoringService
+
+def write_catalog(catalog_lines, tmp_path, n_rows=3000):
+    header, rows = catalog_lines
+    path = tmp_path / 'deprem.txt'
+    path.write_bytes(b''.join(header + rows[:n_rows]))
+    return str(path)
+
+async def request(address, method, target, payload=None):
+    reader, writer = await asyncio.open_connection(*address)
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(f"{method} {target} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    while (await reader.readline()) not in (b'\r\n', b''): pass
+    data = await reader.read()
+    writer.close()
+    return status, json.loads(data)
+
+def run_with_server(service, client):
+    # Servis rastgele bir portta açılır, client(address) bitince kapatılır.
+    async def main():
+        ready = asyncio.get_running_loop().create_future()
+        server = asyncio.create_task(service.serve('127.0.0.1', 0, ready.set_result))
+        try: return await client(await ready)
+        finally:
+            server.cancel(); await asyncio.gather(server, return_exceptions=True)
+    return asyncio.run(main())
+
+def expected_reports(service, points):
+    catalog = service.catalog.current()
+    lats, lons, dates = zip(*points)
+    reports = site_reports(catalog.index, list(lats), list(lons), [pd.Timestamp(d) for d in dates])
+    for report in reports: report['Katalog Sürümü'] = catalog.version
+    return json.loads(json.dumps(reports, ensure_ascii=False))
+
+def test_http_scores_match_site_reports(catalog_lines, tmp_path):
+    service = ScoringService(write_catalog(catalog_lines, tmp_path), cache_dir=str(tmp_path))
+    points = [(39.0, 35.0, '2023-03-01'), (38.5, 37.25, '2020-01-15'), (40.75, 29.5, '2021-06-30')]
+    async def client(address):
+        single = await request(address, 'GET', '/score?lat=39.0&lon=35.0&date=2023-03-01')
+        many = await request(address, 'POST', '/score', [{'lat': a, 'lon': b, 'date': d} for a, b, d in points])
+        errors = [(await request(address, 'GET', target))[0] for target in ['/score?lat=abc&lon=35', '/score?lon=35', '/yok']]
+        return single, many, errors
+    single, many, errors = run_with_server(service, client)
+    assert single == (200, expected_reports(service, points[:1])[0])
+    assert many == (200, expected_reports(service, points))
+    assert errors == [400, 400, 404]
+    assert service.counts['hatali_istek'] == 3
+
+def test_identical_points_are_coalesced(catalog_lines, tmp_path):
+    # Aynı nokta için uçuştaki istekler tek motor sonucunu paylaşır; geniş pencere iki isteği aynı partiye alır.
+    service = ScoringService(write_catalog(catalog_lines, tmp_path), cache_dir=str(tmp_path), batch_window_ms=500)
+    point = {'lat': 39.0, 'lon': 35.0, 'date': '2023-03-01'}
+    async def client(address):
+        return await asyncio.gather(request(address, 'POST', '/score', [point] * 4), request(address, 'GET', '/score?lat=39&lon=35&date=2023-03-01'))
+    (status, reports), (_, single) = run_with_server(service, client)
+    assert status == 200 and all(r == single for r in reports)
+    assert service.counts['birlestirilen'] == 4 and service.counts['nokta'] == 5
+    assert list(service.batch_sizes) == [1]
+
+def test_batches_respect_max_batch(catalog_lines, tmp_path):
+    service = ScoringService(write_catalog(catalog_lines, tmp_path), cache_dir=str(tmp_path), max_batch=4)
+    points = [{'lat': 36.0 + i * 0.25, 'lon': 30.0, 'date': '2022-01-01'} for i in range(10)]
+    async def client(address): return await request(address, 'POST', '/score', points)
+    status, reports = run_with_server(service, client)
+    assert status == 200 and [r['Enlem'] for r in reports] == [p['lat'] for p in points]
+    assert list(service.batch_sizes) == [4, 4, 2]
+
+def test_tracing_reaches_batch_threads(catalog_lines, tmp_path):
+    # İzleme bayrağı servisi başlatan bağlamdan ısıtma ve parti iş parçacıklarına taşınır.
+    service = ScoringService(write_catalog(catalog_lines, tmp_path), cache_dir=str(tmp_path))
+    async def client(address): return await request(address, 'GET', '/score?lat=39&lon=35&date=2023-03-01')
+    def traced_run():
+        instrument.enable(True)
+        return run_with_server(service, client)
+    instrument.reset()
+    try:
+        status, _ = contextvars.copy_context().run(traced_run)
+        calls = {row['Aşama']: row['Çağrı'] for row in instrument.stats()}
+    finally: instrument.reset()
+    assert status == 200 and not instrument.enabled()
+    assert calls['service.evaluate'] == 2 and 'engine.scoring' in calls
+
+
+def test_retired_pool_closes_after_last_batch(catalog_lines, tmp_path):
+    # Katalog sürümü değişince eski havuz, üzerindeki parti bitene kadar açık kalır; sonra kapanır.
+    header, rows = catalog_lines
+    path = tmp_path / 'deprem.txt'
+    path.write_bytes(b''.join(header + rows[:3000]))
+    service = ScoringService(str(path), cache_dir=str(tmp_path))
+    try:
+        catalog, old = service._acquire_pool()
+        with open(path, 'ab') as f: f.write(b''.join(rows[3000:3100]))
+        reports = service._evaluate([(39.0, 35.0, 1677628800 * 10**9)])
+        assert reports[0]['Katalog Sürümü'] == catalog.version + 1
+        assert service._pool is not old and old._finalizer.alive
+        service._release_pool(old)
+        assert not old._finalizer.alive and list(service._pool_users) == [service._pool]
+        # Kullanıcısı olmayan havuz, yeni sürüm kurulurken hemen kapanır.
+        current = service._pool
+        with open(path, 'ab') as f: f.write(b''.join(rows[3100:3200]))
+        service._evaluate([(39.0, 35.0, 1677628800 * 10**9)])
+        assert not current._finalizer.alive and service._pool_users == {service._pool: 0}
+    finally: service.close()
+    assert not service._pool_users
@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sismiq.catalog import parse_catalog
+from sismiq.synthetic import SENTETIK_YER_ADI, write_catalog, model_chunks, resampled_chunks
+
+def written_events(chunks):
+    # Yazılan olaylar, katalog ondalıklarına yuvarlanmış ve ayrıştırıcının (kararlı) zaman sırasıyla.
+    t, lat, lon, depth, mag, *rest = (np.concatenate(parts) for parts in zip(*chunks))
+    expected = pd.DataFrame({
+        'Tarih': pd.to_datetime(np.floor(t).astype(np.int64), unit='s'), 'Enlem': lat.round(4), 'Boylam': lon.round(4),
+        'Derinlik': depth.round(1), 'Mag': mag.round(1), 'Yer': rest[0] if rest else SENTETIK_YER_ADI,
+    })
+    return expected.sort_values('Tarih', kind='stable', ignore_index=True)
+
+@pytest.mark.parametrize('kind', ['model', 'resample'])
+def test_synthetic_catalog_round_trip(catalog_df, tmp_path, kind):
+    # Yazılan katalog parse_catalog ile okununca aynı olaylar geri gelir (parçalar arası sınırlar dahil).
+    if kind == 'model': make = lambda: model_chunks(3000, '2010-01-01', '2012-12-31', seed=3, chunk_size=1000)
+    else: make = lambda: resampled_chunks(catalog_df, 3000, seed=3, chunk_size=1000)
+    path = tmp_path / f'{kind}.txt'
+    assert write_catalog(str(path), make()) == 3000
+    parsed = parse_catalog(str(path))
+    expected = written_events(list(make()))
+    assert len(parsed) == 3000
+    pd.testing.assert_series_equal(parsed['Tarih'].astype('datetime64[s]'), expected['Tarih'].astype('datetime64[s]'))
+    for column in ['Enlem', 'Boylam', 'Mag']:
+        np.testing.assert_array_equal(parsed[column].to_numpy(), expected[column].to_numpy(), err_msg=column)
+    np.testing.assert_allclose(parsed['Derinlik'].to_numpy(dtype=np.float64), expected['Derinlik'], atol=1e-4)
+    assert parsed['Yer'].astype(str).tolist() == pd.Series(expected['Yer']).astype(str).tolist()
+    assert (parsed['Dolunay'].isin([0, 1])).all()